@@ -0,0 +1,84 @@
+"""
+Benchmark the lxml article extractor against the BeautifulSoup one.
+
+Usage (from the project root):
+    python -m backend.benchmarks.html_extraction saved_pages/*.html
+
+Each file is one saved page, read as raw bytes. Pages that fail to extract
+with either engine are counted but excluded from the comparison. Besides
+timing, the report shows how much shorter the lxml bodies are (nested content
+blocks are no longer duplicated) and how many bodies match exactly.
+Per-domain extraction templates are turned off, so the generic extractor is
+timed and no templates are written.
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from ..config.settings import settings
+from ..services.html_extractor import extract_article
+from ..services.web_scraper import parse_article_html
+
+
+def _extract_all(extract, pages: List[bytes]) -> List:
+    results = []
+    for page in pages:
+        try:
+            results.append(extract(page, "file://benchmark"))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+def run(pages: List[bytes], repeat: int = 3) -> Dict:
+    """Time both extractors over the pages and compare their output."""
+    engines = {"bs4": parse_article_html, "lxml": extract_article}
+    timings, outputs = {}, {}
+    templates_enabled = settings.EXTRACTION_TEMPLATES_ENABLED
+    settings.EXTRACTION_TEMPLATES_ENABLED = False  # Time the extractor, not the learned-template fast path
+    try:
+        for name, extract in engines.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                outputs[name] = _extract_all(extract, pages)
+            timings[name] = (time.perf_counter() - start) / repeat
+    finally:
+        settings.EXTRACTION_TEMPLATES_ENABLED = templates_enabled
+
+    pairs = [(a, b) for a, b in zip(outputs["bs4"], outputs["lxml"]) if a is not None and b is not None]
+    bs4_chars = sum(len(a.body) for a, _ in pairs)
+    lxml_chars = sum(len(b.body) for _, b in pairs)
+    return {
+        "pages": len(pages),
+        "failed": {name: sum(1 for r in results if r is None) for name, results in outputs.items()},
+        "seconds": {name: round(seconds, 4) for name, seconds in timings.items()},
+        "speedup": round(timings["bs4"] / timings["lxml"], 1) if timings["lxml"] else None,
+        "identical_bodies": sum(1 for a, b in pairs if a.body == b.body),
+        "identical_titles": sum(1 for a, b in pairs if a.title == b.title),
+        "body_chars": {"bs4": bs4_chars, "lxml": lxml_chars},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare lxml and BeautifulSoup article extraction.")
+    parser.add_argument("pages", nargs="+", help="Saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.pages:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+
+    report = run(pages, args.repeat)
+    print(f"{report['pages']} pages, {sum(len(p) for p in pages)} bytes")
+    for name in ("bs4", "lxml"):
+        print(f"{name:>5}: {report['seconds'][name]:.4f}s  failed={report['failed'][name]}  "
+              f"body chars={report['body_chars'][name]}")
+    print(f"identical bodies: {report['identical_bodies']}  identical titles: {report['identical_titles']}")
+    print(f"speedup: {report['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
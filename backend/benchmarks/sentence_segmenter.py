@@ -0,0 +1,117 @@
+"""
+Benchmark the regex sentence segmenter against NLTK punkt.
+
+Usage (from the project root):
+    python -m backend.benchmarks.sentence_segmenter corpus/*.txt
+    python -m backend.benchmarks.sentence_segmenter --gold sentences.txt
+
+Plain corpus files are treated as one document each, and boundary accuracy is
+measured against punkt's output. A --gold file holds one sentence per line
+with blank lines between documents, and both segmenters are scored against it.
+"""
+
+import argparse
+import time
+from typing import List, Set, Tuple
+
+from nltk.tokenize import sent_tokenize
+
+from ..services.sentence_splitter import sentence_spans
+
+
+def _boundaries_from_sentences(text: str, sentences: List[str]) -> Set[int]:
+    """End offsets of sentences located in text (segmenters may normalise whitespace)."""
+    boundaries, position = set(), 0
+    for sentence in sentences:
+        found = text.find(sentence, position)
+        if found < 0:
+            continue
+        position = found + len(sentence)
+        boundaries.add(position)
+    return boundaries
+
+
+def _load_gold(path: str) -> List[Tuple[str, Set[int]]]:
+    documents, current = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in list(f) + ['']:
+            if line.strip():
+                current.append(line.strip())
+            elif current:
+                text = ' '.join(current)
+                documents.append((text, _boundaries_from_sentences(text, current)))
+                current = []
+    return documents
+
+
+def _score(predicted: Set[int], reference: Set[int]) -> Tuple[int, int, int]:
+    return len(predicted & reference), len(predicted - reference), len(reference - predicted)
+
+
+def _f1(true_positive: int, false_positive: int, false_negative: int) -> dict:
+    precision = true_positive / (true_positive + false_positive) if true_positive + false_positive else 1.0
+    recall = true_positive / (true_positive + false_negative) if true_positive + false_negative else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def run(texts: List[str], gold: List[Set[int]] = None, repeat: int = 3) -> dict:
+    """Time both segmenters over the texts and score their boundaries."""
+    timings = {}
+    outputs = {}
+    segmenters = {
+        "regex": lambda text: {end for _, end in sentence_spans(text)},
+        "punkt": lambda text: _boundaries_from_sentences(text, sent_tokenize(text)),
+    }
+    for name, segment in segmenters.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs[name] = [segment(text) for text in texts]
+        timings[name] = (time.perf_counter() - start) / repeat
+
+    # Without gold labels, punkt is the reference
+    references = gold if gold is not None else outputs["punkt"]
+    report = {}
+    for name in segmenters:
+        if gold is None and name == "punkt":
+            accuracy = {"precision": 1.0, "recall": 1.0, "f1": 1.0}
+        else:
+            totals = [sum(x) for x in zip(*(_score(p, r) for p, r in zip(outputs[name], references)))] or [0, 0, 0]
+            accuracy = _f1(*totals)
+        report[name] = {"seconds": round(timings[name], 4), **accuracy}
+    report["speedup"] = round(timings["punkt"] / timings["regex"], 1) if timings["regex"] else None
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare regex and punkt sentence segmentation.")
+    parser.add_argument("corpus", nargs="*", help="Text files, one document each")
+    parser.add_argument("--gold", help="One sentence per line, blank line between documents")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args()
+
+    if args.gold:
+        documents = _load_gold(args.gold)
+        texts, gold = [text for text, _ in documents], [b for _, b in documents]
+    else:
+        texts, gold = [], None
+        for path in args.corpus:
+            with open(path, 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+    if not texts:
+        parser.error("Provide corpus files or --gold")
+
+    try:
+        report = run(texts, gold, args.repeat)
+    except LookupError as e:
+        raise SystemExit(f"NLTK punkt data is required for this benchmark: {e}")
+
+    print(f"{len(texts)} documents, {sum(len(t) for t in texts)} characters")
+    for name in ("regex", "punkt"):
+        r = report[name]
+        print(f"{name:>6}: {r['seconds']:.4f}s  precision={r['precision']}  recall={r['recall']}  f1={r['f1']}")
+    print(f"speedup: {report['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Configuration settings for the application."""
 
+from typing import List
 from pydantic_settings import BaseSettings
 
 
@@ -8,10 +9,127 @@ class Settings(BaseSettings):
     
     # Web Scraper Settings
     SCRAPER_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    HTML_EXTRACTOR: str = "lxml"  # Article extraction engine: "lxml" (fast, header charset) or "bs4" (BeautifulSoup)
+    SCRAPER_MAX_BYTES: int = 5_000_000  # Most bytes read from one page; larger declared sizes are rejected
+    SCRAPER_CHUNK_BYTES: int = 65536    # Download chunk size fed to the incremental parser
+    SCRAPER_TEXT_TARGET_CHARS: int = 100_000  # Stop downloading once this much paragraph text has arrived
+    SCRAPER_ALLOWED_CONTENT_TYPES: List[str] = ["text/html", "application/xhtml+xml"]  # Accepted page types
+    SCRAPE_CACHE_ENABLED: bool = True   # Keep scraped pages on disk and revalidate them with conditional GETs
+    SCRAPE_CACHE_PATH: str = ""         # SQLite cache file (default: data/scrape_cache.sqlite3)
+    SCRAPE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # Compressed bytes kept before least recently used pages are evicted
+    SCRAPE_CACHE_TTL_SECONDS: float = 300.0  # Freshness for pages without Cache-Control max-age or Expires
+    SCRAPE_CACHE_COMPRESSION_LEVEL: int = 6  # zlib level for stored bodies
+
+    # Extraction Template Settings
+    EXTRACTION_TEMPLATES_ENABLED: bool = True  # Learn per-domain article body selectors and reuse them
+    EXTRACTION_TEMPLATES_PATH: str = ""        # JSON template file (default: data/extraction_templates.json)
+    EXTRACTION_TEMPLATE_MIN_CHARS: int = 200   # Shortest body a template may learn from or produce
+    EXTRACTION_TEMPLATE_QUALITY_RATIO: float = 0.3  # A body below this fraction of the template's average is a failure
+    EXTRACTION_TEMPLATE_MAX_FAILURES: int = 3  # Consecutive failures before a domain's template is re-learned
+    EXTRACTION_TEMPLATES_MAX_DOMAINS: int = 5000  # Domains remembered before least recently used ones are dropped
+    EXTRACTION_TEMPLATES_SAVE_EVERY: int = 20  # Template changes between writes to disk
+
+    # Crawler Settings
+    CRAWLER_CONCURRENCY: int = 8               # Articles fetched and analyzed at once across all domains
+    CRAWLER_DOMAIN_INTERVAL_SECONDS: float = 1.0  # Minimum gap between requests to one domain (robots.txt Crawl-delay may raise it)
+    CRAWLER_ROBOTS_TTL_SECONDS: float = 3600.0  # How long a domain's robots.txt is reused
+    CRAWLER_MAX_DOMAINS: int = 10000           # Domains whose robots.txt and request spacing are kept (LRU)
+    CRAWLER_MAX_FEED_BYTES: int = 10_000_000   # Most bytes read from one feed or sitemap
+    CRAWLER_MAX_SITEMAP_DEPTH: int = 2         # Nested sitemap index levels followed
+    CRAWLER_MAX_ARTICLES: int = 500            # Default cap on new articles analyzed per crawl job
+    CRAWLER_MAX_JOBS: int = 50                 # Finished crawl jobs kept for status queries
+    CRAWLER_HISTORY_PATH: str = ""             # SQLite file of crawled URLs (default: data/crawl_history.sqlite3)
+
+    # Shared HTTP Client Settings
+    HTTP_MAX_CONNECTIONS: int = 100            # Total pooled connections per client
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20   # Idle connections kept alive for reuse
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 4     # Concurrent requests to a single host
+    HTTP_HOST_LIMITER_MAX_HOSTS: int = 1024    # Idle per-host limiters kept before least recently used ones are dropped
+    HTTP_TIMEOUT_SECONDS: float = 10.0         # Default per-request timeout (applies to writes)
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0  # Time allowed to open a connection
+    HTTP_READ_TIMEOUT_SECONDS: float = 10.0    # Time allowed between received chunks
+    HTTP_POOL_TIMEOUT_SECONDS: float = 5.0     # Time allowed to wait for a free pooled connection
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0  # Idle time before a kept-alive connection is closed
+    HTTP2_ENABLED: bool = True                 # Negotiate HTTP/2 when the h2 package is installed
+    DNS_CACHE_TTL_SECONDS: float = 300.0       # How long resolved addresses are reused; 0 uses the system resolver per connection
+    DNS_CACHE_MAX_ENTRIES: int = 1024          # Hosts kept in the DNS cache before least recently used ones are dropped
+    HTTP_VERIFY_TLS: bool = True               # Verify server certificates
+    HTTP_CLIENT_CERT: str = ""                 # Client certificate (PEM with key) for mutual TLS; empty for none
+    HTTP_TRUST_ENV: bool = True                # Honor SSL_CERT_FILE and HTTP(S)_PROXY environment variables
+
+    # Evidence Retrieval Settings
+    EVIDENCE_PROVIDERS: List[str] = [          # Providers queried in parallel, in priority order
+        "factcheck_index", "cached_results", "search_api", "web_pages",
+    ]
+    EVIDENCE_SEARCH_API_URL: str = ""          # JSON search API URL with {query}; empty disables the provider
+    EVIDENCE_SEARCH_API_KEY: str = ""          # Bearer token for the search API
+    EVIDENCE_CACHED_RESULTS_PATH: str = ""     # JSON file of precomputed results keyed by normalized query
+    FACTCHECK_INDEX_PATH: str = ""             # Local BM25 fact-check index directory (default: data/factcheck_index)
+    FACTCHECK_MIN_SCORE: float = 5.0           # Minimum BM25 score for a local fact-check to count as a hit
+    EVIDENCE_LOCAL_SUFFICIENT_HITS: int = 1    # Local hits (index, cached results) that make network providers unnecessary
+    EVIDENCE_PROVIDER_DEADLINE_FRACTION: float = 0.9  # Share of the deadline a provider may use before returning partial results
+    EVIDENCE_HEDGE_ENABLED: bool = True        # Send a duplicate request when a provider exceeds its p95 latency
+    EVIDENCE_HEDGE_MIN_SAMPLES: int = 20       # Latency samples needed before hedging a provider
+    EVIDENCE_LATENCY_WINDOW: int = 200         # Recent latencies kept per provider for the p95
+    EVIDENCE_BREAKER_FAILURES: int = 3         # Consecutive failures that open a provider's circuit
+    EVIDENCE_BREAKER_COOLDOWN_SECONDS: float = 30.0  # How long an open circuit skips the provider
+    EVIDENCE_SOURCE_URLS: List[str] = []       # Opt-in candidate evidence pages; {query} is the URL-encoded title
+                                               # (e.g. "https://www.snopes.com/search/?q={query}")
+    EVIDENCE_DEADLINE_SECONDS: float = 4.0     # Global deadline for all evidence fetches of one request
+    EVIDENCE_MAX_PAGE_BYTES: int = 65536       # Only this much of each evidence page is read
+    EVIDENCE_SNIPPET_CHARS: int = 300          # Maximum snippet length per evidence source
+    EVIDENCE_CACHE_ENABLED: bool = True        # Reuse evidence for repeated claims
+    EVIDENCE_CACHE_SIZE: int = 2048            # Max cached claims kept in memory (LRU)
+    EVIDENCE_CACHE_TTL_SECONDS: float = 900.0  # Age up to which cached evidence is served as fresh
+    EVIDENCE_CACHE_STALE_SECONDS: float = 3600.0  # Extra age served while a background refresh runs
+    EVIDENCE_CACHE_BODY_WORDS: int = 20        # Leading body words included in the cache key
+    EVIDENCE_CACHE_DIR: str = ""               # Directory for the on-disk tier; empty keeps the cache in memory
+    EVIDENCE_CACHE_DISK_MAX_ENTRIES: int = 20000  # Max files kept in the on-disk tier (oldest pruned first)
     
+    # Text Normalization Settings
+    LANGDETECT_SAMPLE_WORDS: int = 200  # Words passed to language detection (from the start of the text)
+    LANGDETECT_SEED: int = 0            # Fixed seed so language detection is deterministic
+
     # TF-IDF Extractive Summarizer Settings
+    SENTENCE_SEGMENTER: str = "regex"  # "regex" (compiled rules + abbreviation table) or "punkt" (NLTK)
     NUM_SUMMARY_SENTENCES: int = 5  # The target number of sentences for the summary
     MAX_BODY_WORDS: int = 500       # The absolute maximum word count for the final body text
+    SUMMARIZER_STREAMING_MIN_CHARS: int = 20000  # Bodies longer than this use the constant-memory streaming summarizer
+    IDF_TABLE_PATH: str = ""                 # Corpus IDF table (default: data/idf_table.npz)
+    IDF_TABLE_FEATURES: int = 2 ** 18        # Hash buckets in a newly created IDF table
+    IDF_MIN_DOCUMENTS: int = 50              # Documents needed before the table replaces per-document IDF
+    IDF_UPDATE_FROM_ANALYSES: bool = False   # Opt-in: add every summarized article (including arbitrary user text) to the IDF table
+    IDF_SAVE_EVERY: int = 100                # Persist the IDF table after this many new documents
+
+    # Model Registry Settings
+    MODEL_RELOAD_CHECK_INTERVAL: float = 30.0  # Seconds between model file change checks (0 disables hot reload)
+    MODEL_ARTIFACT_PATH: str = ""              # Memory-mappable model artifact (default: model/artifacts/model.joblib)
+    MODEL_MMAP: bool = True                    # Load the artifact with read-only memory-mapped arrays when it exists
+    MODEL_PRELOAD: bool = False                # Load the model at import so pre-forked workers share it (gunicorn --preload)
+    MODEL_FORMAT: str = "pickle"               # "pickle" (sklearn pipeline) or "hashed" (compact hashed linear model)
+    HASHED_MODEL_PATH: str = ""                # Hashed model file (default: model/artifacts/model.fnhm)
+
+    # Inference Batching Settings
+    INFERENCE_MAX_BATCH_SIZE: int = 32   # Maximum number of texts scored in one predict_proba call
+    INFERENCE_MAX_WAIT_MS: float = 5.0   # How long a batch waits for more requests before running
+
+    # Request Deduplication Settings
+    SINGLE_FLIGHT_ENABLED: bool = True     # Concurrent identical URL/text/image analyses share one execution
+
+    # Latency Budget Settings
+    LATENCY_BUDGET_MS: float = 8000.0      # Default per-request budget (override with the X-Latency-Budget-Ms header)
+    LATENCY_BUDGET_MAX_MS: float = 60000.0  # Upper bound accepted from the header
+    LATENCY_RESERVE_SECONDS: float = 0.2   # Kept back for the final stages and response
+    EVIDENCE_SKIP_CONFIDENCE: float = 0.9  # Model confidence above which the evidence search is skipped
+    EVIDENCE_MIN_SECONDS: float = 0.3      # Evidence is skipped when less time than this is left
+    INFERENCE_SATURATION_PENDING: int = 128  # Queued predictions beyond which requests use heuristics instead
+    SUMMARY_CAP_REMAINING_SECONDS: float = 2.0  # Below this much remaining time summarization input is capped
+    SUMMARY_CAP_SENTENCES: int = 40        # Sentences summarized when capped
+
+    # CPU Stage Executor Settings
+    CPU_EXECUTOR_KIND: str = "thread"    # "thread" or "process" (stateless stages only, see executor.PROCESS_SAFE_STAGES)
+    CPU_EXECUTOR_WORKERS: int = 0        # Pool size (0 = number of CPU cores)
+    CPU_EXECUTOR_MAX_QUEUE: int = 64     # Maximum stages queued or running before callers wait
 
     class Config:
         env_file = ".env"
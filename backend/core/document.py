@@ -0,0 +1,56 @@
+"""Shared, lazily tokenized representation of the text under analysis."""
+
+from functools import cached_property
+from typing import List, Optional
+
+from ..config.settings import settings
+from ..services.feature_hashing import tokenize
+from ..services.sentence_splitter import split_sentences
+from .lexicon import ANALYSIS_LEXICON, LexiconMatch
+
+
+class Document:
+    """
+    A title/body pair whose derived forms are computed at most once.
+
+    Pipeline stages (inference, heuristics, explainability, summarization) read
+    the lowercased text, tokens, sentences and word count from here instead of
+    re-lowercasing and re-splitting the same strings. Every attribute is
+    computed on first access and cached on the instance.
+    """
+
+    def __init__(self, title: str, body: str, sentences: Optional[List[str]] = None):
+        self.title = title
+        self.body = body
+        if sentences is not None:
+            # Sentences already produced upstream (e.g. while extracting the title)
+            self.__dict__["sentences"] = sentences
+
+    @cached_property
+    def text(self) -> str:
+        """Title and body joined the way the model and heuristics expect."""
+        return f"{self.title} {self.body}"
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercased word tokens of title and body."""
+        return tokenize(self.lower, lowercase=False)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Sentences of the body, split with settings.SENTENCE_SEGMENTER."""
+        return split_sentences(self.body, settings.SENTENCE_SEGMENTER)
+
+    @cached_property
+    def lexicon(self) -> LexiconMatch:
+        """Indicator, domain and topic terms found by one scan of the lowercased text."""
+        return ANALYSIS_LEXICON.scan(self.lower)
+
+    @cached_property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words in the body."""
+        return len(self.body.split())
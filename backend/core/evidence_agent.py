@@ -1,68 +1,305 @@
 """Manages the LLM-based web evidence search for uncertain results."""
 
-import httpx
-from typing import List, Dict
-from bs4 import BeautifulSoup
 import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 
-async def search_web_evidence(title: str, body: str, max_sources: int = 5) -> List[Dict]:
+import numpy as np
+
+from ..config.settings import settings
+from ..services.executor import run_cpu_stage
+from ..services.similarity import claim_evidence_similarity
+from .evidence_providers import evidence_fanout, normalize_query
+
+# Cosine similarity thresholds for the High / Medium labels
+HIGH_SIMILARITY = 0.3
+MEDIUM_SIMILARITY = 0.1
+
+
+def similarity_label(score: float) -> str:
+    """Map a claim-to-evidence cosine similarity to High / Medium / Low."""
+    if score >= HIGH_SIMILARITY:
+        return "High"
+    return "Medium" if score >= MEDIUM_SIMILARITY else "Low"
+
+
+def score_evidence(title: str, body: str, evidence: List[Dict]) -> List[float]:
+    """
+    Similarity of the claim (title and body) to each source's title and snippet.
+
+    All sources are compared in one batched sparse product; see
+    services.similarity. The sources are not modified, so this can run in a
+    process pool; apply the result with apply_similarity_scores.
+
+    Returns:
+        One score per source, rounded to 4 decimals
+    """
+    scores = claim_evidence_similarity(
+        f"{title} {body}",
+        [f"{source['title']} {source['snippet']}" for source in evidence],
+    )
+    return [round(float(score), 4) for score in scores]
+
+
+def apply_similarity_scores(evidence: List[Dict], scores: List[float]):
+    """Set `similarity_score` and `similarity` on each source, in place."""
+    for source, score in zip(evidence, scores):
+        source["similarity_score"] = score
+        source["similarity"] = similarity_label(score)
+
+
+def _similarity_scores(evidence: List[Dict]) -> np.ndarray:
+    """Numeric similarities of the sources; label-only sources map to the label's threshold."""
+    by_label = {"High": HIGH_SIMILARITY, "Medium": MEDIUM_SIMILARITY}
+    return np.array([
+        e["similarity_score"] if e.get("similarity_score") is not None else by_label.get(e.get("similarity"), 0.0)
+        for e in evidence
+    ])
+
+
+def evidence_relevance(evidence: List[Dict]) -> float:
+    """
+    Mean relevance of the evidence in [0, 1]: each similarity relative to the
+    High threshold, capped at 1. Used to scale the evidence confidence boost.
+    """
+    if not evidence:
+        return 0.0
+    return float(np.minimum(_similarity_scores(evidence) / HIGH_SIMILARITY, 1.0).mean())
+
+
+def evidence_cache_key(title: str, body: str, max_sources: int) -> str:
+    """
+    Cache key for a claim: the normalized title plus the first
+    settings.EVIDENCE_CACHE_BODY_WORDS normalized words of the body, so
+    resubmissions that differ only in case, punctuation or trailing text share
+    one entry.
+    """
+    body_words = normalize_query(body[:1000]).split()[:settings.EVIDENCE_CACHE_BODY_WORDS]
+    return f"{normalize_query(title[:100])}|{' '.join(body_words)}|{max_sources}"
+
+
+class EvidenceCache:
+    """
+    Size-bounded LRU cache of evidence search results with per-entry TTL.
+
+    - Entries younger than `ttl` are served as fresh hits.
+    - Entries past `ttl` but within `ttl + stale` are served immediately while
+      one background refresh replaces them (stale-while-revalidate).
+    - Older entries are misses. Empty results are not cached.
+    - When `directory` is set, entries are also written there as JSON files
+      and read back on a memory miss, so the cache survives restarts. Every
+      `disk_max_entries // 10` writes the directory is pruned: expired files
+      are deleted, then the oldest ones beyond `disk_max_entries`.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, stale: float, directory: str = "",
+                 disk_max_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale = stale
+        self.directory = directory
+        self.disk_max_entries = disk_max_entries or settings.EVIDENCE_CACHE_DISK_MAX_ENTRIES
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._refreshing = {}
+        self._disk_writes = 0
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "disk_hits": 0, "refreshes": 0,
+                         "evictions": 0, "disk_evictions": 0}
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + ".json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, List[Dict]]]:
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry["stored_at"], entry["sources"]
+
+    def _write_disk(self, key: str, stored_at: float, sources: List[Dict]):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"key": key, "stored_at": stored_at, "sources": sources}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing evidence cache: {e}")
+
+    def _prune_disk(self) -> int:
+        """Delete expired files, then the oldest beyond disk_max_entries; returns the number removed."""
+        try:
+            files = [(entry.stat().st_mtime, entry.path) for entry in os.scandir(self.directory)
+                     if entry.name.endswith(".json")]
+        except OSError as e:
+            print(f"Error pruning evidence cache: {e}")
+            return 0
+        files.sort()
+        cutoff = time.time() - self.ttl - self.stale
+        expired = sum(1 for mtime, _ in files if mtime < cutoff)
+        removed = 0
+        for _, path in files[:max(expired, len(files) - self.disk_max_entries)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass  # Already pruned by another worker
+        return removed
+
+    def _remember(self, key: str, stored_at: float, sources: List[Dict]):
+        self._entries[key] = (stored_at, sources)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def put(self, key: str, sources: List[Dict]):
+        if not sources:
+            return
+        stored_at = time.time()
+        sources = [dict(source) for source in sources]
+        self._remember(key, stored_at, sources)
+        if self.directory:
+            await asyncio.to_thread(self._write_disk, key, stored_at, sources)
+            self._disk_writes += 1
+            if self._disk_writes >= max(1, self.disk_max_entries // 10):
+                self._disk_writes = 0
+                self.counters["disk_evictions"] += await asyncio.to_thread(self._prune_disk)
+
+    async def get_or_search(self, key: str, search, full_search=None) -> List[Dict]:
+        """
+        Return cached sources for `key`, calling `search()` on a miss.
+
+        Args:
+            key: Cache key from evidence_cache_key()
+            search: Coroutine function producing fresh sources
+            full_search: Set when `search` runs under a shortened deadline. Its
+                partial results are returned but not cached; instead this
+                coroutine function, running under the full deadline, fills the
+                cache and performs stale refreshes in the background.
+
+        Returns:
+            List of evidence dictionaries (copies, safe to modify)
+        """
+        entry = self._entries.get(key)
+        if entry is None and self.directory:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                self.counters["disk_hits"] += 1
+                self._remember(key, *entry)
+
+        if entry is not None:
+            stored_at, sources = entry
+            age = time.time() - stored_at
+            if age <= self.ttl + self.stale:
+                self._entries.move_to_end(key)
+                if age <= self.ttl:
+                    self.counters["hits"] += 1
+                else:
+                    self.counters["stale_hits"] += 1
+                    self._schedule_refresh(key, full_search or search)
+                return [dict(source) for source in sources]
+            del self._entries[key]
+
+        self.counters["misses"] += 1
+        sources = await search()
+        if full_search is None:
+            await self.put(key, sources)
+        else:
+            self._schedule_refresh(key, full_search)
+        return sources
+
+    def _schedule_refresh(self, key: str, search):
+        if key in self._refreshing:
+            return
+        self.counters["refreshes"] += 1
+
+        async def refresh():
+            try:
+                await self.put(key, await search())
+            except Exception as e:
+                print(f"Error refreshing cached evidence: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.counters["hits"] + self.counters["stale_hits"] + self.counters["misses"]
+        hit_rate = (lookups - self.counters["misses"]) / lookups if lookups else 0.0
+        return {"entries": len(self._entries), "max_entries": self.max_entries,
+                "disk_max_entries": self.disk_max_entries,
+                "hit_rate": round(hit_rate, 3), **self.counters}
+
+
+evidence_cache = EvidenceCache(
+    max_entries=settings.EVIDENCE_CACHE_SIZE,
+    ttl=settings.EVIDENCE_CACHE_TTL_SECONDS,
+    stale=settings.EVIDENCE_CACHE_STALE_SECONDS,
+    directory=settings.EVIDENCE_CACHE_DIR,
+)
+
+
+async def _search_providers(search_query: str, body: str, max_sources: int, timeout: Optional[float] = None) -> List[Dict]:
+    try:
+        return await evidence_fanout.search(search_query, body[:200], max_sources, timeout)
+    except Exception as e:
+        print(f"Error searching for evidence: {e}")
+        return []
+
+
+async def search_web_evidence(title: str, body: str, max_sources: int = 5, timeout: Optional[float] = None) -> List[Dict]:
     """
     Search the web for evidence about the claim.
     
+    The configured providers (settings.EVIDENCE_PROVIDERS: local BM25 fact-check
+    index, cached results, search API, candidate web pages) are queried with
+    hedging and circuit breakers, local ones first so a known fact-check avoids
+    network calls entirely; see evidence_providers.EvidenceFanout.
+    The search returns as soon as max_sources good hits exist. Results are
+    cached per normalized claim in `evidence_cache` when settings.EVIDENCE_CACHE_ENABLED.
+    
     Args:
         title: Article title
         body: Article body (first 200 chars used for search)
         max_sources: Maximum number of sources to return
+        timeout: Seconds allowed for the search (default settings.EVIDENCE_DEADLINE_SECONDS)
         
     Returns:
         List of evidence dictionaries with url, title, snippet
     """
-    # Mock implementation - in production, integrate with Google Custom Search API or similar
-    evidence_sources = []
-    
     # Extract key terms for search
     search_query = title[:100]  # Use title as search query
+    deadline = settings.EVIDENCE_DEADLINE_SECONDS
     
-    try:
-        # Simulate web search (in production, use actual search API)
-        # For now, return mock credible sources
-        mock_sources = [
-            {
-                "url": "https://www.snopes.com",
-                "title": "Fact Check: " + title[:50],
-                "snippet": "According to fact-checkers, this claim has been verified through multiple sources...",
-                "similarity": "High"
-            },
-            {
-                "url": "https://www.factcheck.org",
-                "title": "Analysis: " + title[:50],
-                "snippet": "Our investigation found evidence supporting/refuting these claims...",
-                "similarity": "Medium"
-            },
-            {
-                "url": "https://apnews.com",
-                "title": "AP News Coverage",
-                "snippet": "Associated Press reporting indicates...",
-                "similarity": "Medium"
-            },
-            {
-                "url": "https://www.reuters.com",
-                "title": "Reuters Fact Check",
-                "snippet": "Reuters fact-checking team examined this story...",
-                "similarity": "High"
-            },
-            {
-                "url": "https://www.bbc.com/news",
-                "title": "BBC Verification",
-                "snippet": "BBC News verification unit reviewed the available evidence...",
-                "similarity": "Medium"
-            }
-        ]
-        
-        evidence_sources = mock_sources[:max_sources]
-        
-    except Exception as e:
-        print(f"Error searching for evidence: {e}")
+    async def search():
+        return await _search_providers(search_query, body, max_sources, timeout)
+    
+    async def full_search():
+        return await _search_providers(search_query, body, max_sources, deadline)
+    
+    if settings.EVIDENCE_CACHE_ENABLED:
+        # A budget-shortened search may miss slow providers, so the cache is filled by a full one
+        shortened = timeout is not None and timeout < deadline
+        evidence_sources = await evidence_cache.get_or_search(
+            evidence_cache_key(title, body, max_sources), search, full_search if shortened else None
+        )
+    else:
+        evidence_sources = await search()
+    
+    if evidence_sources:
+        scores = await run_cpu_stage("evidence_similarity", score_evidence, title, body, evidence_sources)
+        apply_similarity_scores(evidence_sources, scores)
     
     return evidence_sources
 
@@ -80,17 +317,19 @@ def calculate_evidence_agreement(evidence: List[Dict], predicted_verdict: str) -
     if not evidence:
         return 0.5  # Neutral when no evidence
     
-    # Analyze evidence snippets and similarity scores
-    high_similarity_count = sum(1 for e in evidence if e.get('similarity') == 'High')
-    total_count = len(evidence)
+    # Analyze evidence similarity scores
+    scores = _similarity_scores(evidence)
+    high_similarity_count = int((scores >= HIGH_SIMILARITY).sum())
+    # Share of strongly matching evidence, graded rather than counted
+    support = float(np.minimum(scores / HIGH_SIMILARITY, 1.0).mean())
     
     # Calculate agreement based on similarity and verdict
     if predicted_verdict == "FAKE":
         # If predicting fake, high similarity means contradicting sources
-        agreement = 0.3 + (high_similarity_count / total_count) * 0.5
+        agreement = 0.3 + support * 0.5
     elif predicted_verdict == "REAL":
         # If predicting real, high similarity means supporting sources
-        agreement = 0.5 + (high_similarity_count / total_count) * 0.4
+        agreement = 0.5 + support * 0.4
     else:  # UNCERTAIN
         # Mixed evidence for uncertain
         agreement = 0.5 + ((high_similarity_count % 2) * 0.1)
@@ -0,0 +1,441 @@
+"""Pluggable evidence providers and the hedged fan-out that queries them."""
+
+import asyncio
+import json
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+import httpx
+from bs4 import BeautifulSoup
+
+from ..config.settings import settings
+from ..services.executor import run_cpu_stage
+from ..services.factcheck_index import FACTCHECK_INDEX_PATH, FactCheckIndex, get_factcheck_index
+from ..services.http_client import get_async_client, fetch_prefix
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]{3,}")
+
+
+def normalize_query(title: str) -> str:
+    """Canonical form of a search query: lowercased words in their original order."""
+    return ' '.join(_WORD_PATTERN.findall(title.lower()))
+
+
+class EvidenceProvider(ABC):
+    """
+    Base class for a source of evidence.
+
+    Subclasses implement `search()` and return evidence dictionaries with
+    url, title and snippet. Providers that are not configured report
+    `available` as False and are skipped.
+    """
+
+    name = "provider"
+    # Local providers answer without network access and are queried first
+    local = False
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def search(self, title: str, body: str, limit: int, timeout: float) -> List[Dict]:
+        """
+        Args:
+            title: Search query (the article title)
+            body: Start of the article body
+            limit: Maximum number of results wanted
+            timeout: Seconds the provider may spend; providers that gather
+                results incrementally should return what they have by then
+
+        Returns:
+            List of evidence dictionaries with url, title, snippet
+        """
+
+
+def extract_page_summary(content: bytes, encoding: Optional[str], url: str) -> Optional[Dict]:
+    """
+    Pull a title and snippet out of the start of an HTML page.
+
+    The snippet is the page's meta/OpenGraph description when present, else its
+    leading paragraph text, limited to settings.EVIDENCE_SNIPPET_CHARS.
+    """
+    html = content.decode(encoding or 'utf-8', errors='replace')
+    soup = BeautifulSoup(html, 'html.parser')
+
+    title_tag = soup.find('title')
+    title = title_tag.get_text(strip=True) if title_tag else ""
+
+    snippet = ""
+    for attrs in ({'name': 'description'}, {'property': 'og:description'}):
+        meta = soup.find('meta', attrs=attrs)
+        if meta and meta.get('content'):
+            snippet = meta['content'].strip()
+            break
+    if not snippet:
+        snippet = ' '.join(p.get_text(' ', strip=True) for p in soup.find_all('p', limit=5))
+
+    snippet = ' '.join(snippet.split())[:settings.EVIDENCE_SNIPPET_CHARS]
+    if not title and not snippet:
+        return None
+    return {"url": url, "title": title or url, "snippet": snippet}
+
+
+class WebPageProvider(EvidenceProvider):
+    """
+    Fetches the configured candidate pages (settings.EVIDENCE_SOURCE_URLS, opt-in)
+    concurrently through the shared pooled client, reading only a bounded
+    prefix of each. Fetches still running when the timeout expires are
+    cancelled and their pages skipped.
+    """
+
+    name = "web_pages"
+
+    @property
+    def available(self) -> bool:
+        return bool(settings.EVIDENCE_SOURCE_URLS)
+
+    @staticmethod
+    def build_urls(title: str) -> List[str]:
+        """Fill the URL templates with the search query."""
+        query = quote_plus(title[:100])  # Use title as search query
+        return [template.format(query=query) for template in settings.EVIDENCE_SOURCE_URLS]
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Optional[Dict]:
+        """Fetch a bounded prefix of one page and summarize it off the event loop."""
+        response, content = await fetch_prefix(client, url, settings.EVIDENCE_MAX_PAGE_BYTES)
+        return await run_cpu_stage("evidence_extract", extract_page_summary, content, response.charset_encoding, url)
+
+    async def search(self, title: str, body: str, limit: int, timeout: float) -> List[Dict]:
+        deadline = time.monotonic() + timeout
+        client = get_async_client("evidence")
+        tasks = [asyncio.create_task(self._fetch(client, url)) for url in self.build_urls(title)]
+        if not tasks:
+            return []
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=max(deadline - time.monotonic(), 0.0))
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is not None:
+                    print(f"Error fetching evidence: {task.exception()}")
+
+        # Keep candidate order so results are stable
+        sources = []
+        for task in tasks:
+            if task not in done or task.cancelled() or task.exception() is not None:
+                continue
+            if task.result():
+                sources.append(task.result())
+        return sources[:limit]
+
+
+class SearchAPIProvider(EvidenceProvider):
+    """
+    Queries a JSON web search API (settings.EVIDENCE_SEARCH_API_URL, with {query}).
+
+    The response is expected in the common `{"items": [{"link", "title",
+    "snippet"}]}` shape used by Google Custom Search and compatible services.
+    """
+
+    name = "search_api"
+
+    @property
+    def available(self) -> bool:
+        return bool(settings.EVIDENCE_SEARCH_API_URL)
+
+    async def search(self, title: str, body: str, limit: int, timeout: float) -> List[Dict]:
+        url = settings.EVIDENCE_SEARCH_API_URL.format(query=quote_plus(title[:100]))
+        headers = {}
+        if settings.EVIDENCE_SEARCH_API_KEY:
+            headers["Authorization"] = f"Bearer {settings.EVIDENCE_SEARCH_API_KEY}"
+        response = await get_async_client("evidence").get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        items = response.json().get("items", [])
+        return [
+            {"url": item["link"], "title": item.get("title", item["link"]), "snippet": item.get("snippet", "")}
+            for item in items[:limit]
+            if item.get("link")
+        ]
+
+
+def _search_factcheck_index(path: str, title: str, limit: int) -> List[Dict]:
+    return get_factcheck_index(path).search(title, limit, settings.FACTCHECK_MIN_SCORE)
+
+
+class FactCheckIndexProvider(EvidenceProvider):
+    """
+    Ranks a local corpus of fact-check and news articles with BM25
+    (services.factcheck_index, built with its CLI). Answers in milliseconds
+    without network access.
+    """
+
+    name = "factcheck_index"
+    local = True
+
+    @property
+    def available(self) -> bool:
+        return os.path.exists(FactCheckIndex.manifest_path(self.path))
+
+    @property
+    def path(self) -> str:
+        return settings.FACTCHECK_INDEX_PATH or FACTCHECK_INDEX_PATH
+
+    async def search(self, title: str, body: str, limit: int, timeout: float) -> List[Dict]:
+        return await run_cpu_stage("factcheck_index", _search_factcheck_index, self.path, title, limit)
+
+
+class CachedResultsProvider(EvidenceProvider):
+    """
+    Serves precomputed results (settings.EVIDENCE_CACHED_RESULTS_PATH): a JSON
+    object mapping normalized queries (see normalize_query) to evidence lists,
+    typically produced offline for known stories. The file is loaded once and
+    reloaded when it changes, in a worker thread so the event loop never
+    blocks on it.
+    """
+
+    name = "cached_results"
+    local = True
+
+    def __init__(self):
+        self._data = None
+        self._mtime = None
+
+    @property
+    def path(self) -> str:
+        return settings.EVIDENCE_CACHED_RESULTS_PATH
+
+    @property
+    def available(self) -> bool:
+        return bool(self.path) and os.path.exists(self.path)
+
+    def _read(self) -> Dict:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    async def _load(self) -> Dict:
+        mtime = await asyncio.to_thread(os.path.getmtime, self.path)
+        if self._data is None or mtime != self._mtime:
+            self._data = await asyncio.to_thread(self._read)
+            self._mtime = mtime
+        return self._data
+
+    async def search(self, title: str, body: str, limit: int, timeout: float) -> List[Dict]:
+        data = await self._load()
+        return [dict(source) for source in data.get(normalize_query(title), [])[:limit]]
+
+
+class ProviderHealth:
+    """
+    Latency history and circuit breaker state for one provider.
+
+    The breaker opens after settings.EVIDENCE_BREAKER_FAILURES consecutive
+    failures. Once settings.EVIDENCE_BREAKER_COOLDOWN_SECONDS have passed it is
+    half-open: a single trial call goes through while others are still
+    skipped, and the breaker closes only when that trial succeeds.
+    """
+
+    def __init__(self):
+        self.latencies = deque(maxlen=settings.EVIDENCE_LATENCY_WINDOW)
+        self.calls = 0
+        self.failures = 0
+        self.hedges = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def p95(self) -> Optional[float]:
+        """95th percentile latency in seconds, once enough samples exist."""
+        if len(self.latencies) < settings.EVIDENCE_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def allow(self) -> bool:
+        """Closed breakers let calls through, half-open ones only while no trial is running, open ones none."""
+        if time.monotonic() < self.open_until:
+            return False
+        return not (self.open_until and self.probing)
+
+    def start_call(self) -> bool:
+        """Claim a call; on a half-open breaker this makes it the single trial call."""
+        if not self.allow():
+            return False
+        self.probing = bool(self.open_until)
+        self.calls += 1
+        return True
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def record_failure(self):
+        self.probing = False
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= settings.EVIDENCE_BREAKER_FAILURES:
+            # Open (or re-open after a failed half-open trial)
+            self.open_until = time.monotonic() + settings.EVIDENCE_BREAKER_COOLDOWN_SECONDS
+
+    def stats(self) -> Dict:
+        p95 = self.p95()
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "circuit_open": not self.allow(),
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+def _good_hits(results: List[Dict]) -> int:
+    """Hits with a snippet to show."""
+    return sum(1 for result in results if result.get("snippet"))
+
+
+class EvidenceFanout:
+    """
+    Queries several providers in parallel and returns as soon as enough good hits exist.
+
+    - Each provider call is hedged: if it runs longer than that provider's
+      recent p95 latency, a duplicate call is started and the first to succeed wins.
+    - Local providers are tried before network ones, which are skipped when the
+      local tier already answered.
+    - Results are collected as providers finish; once `max_sources` hits with a
+      snippet are in hand, the remaining calls are cancelled.
+    - A provider that fails settings.EVIDENCE_BREAKER_FAILURES times in a row is
+      skipped for settings.EVIDENCE_BREAKER_COOLDOWN_SECONDS, then gets one trial
+      call at a time until a call succeeds (circuit breaker, see ProviderHealth).
+    """
+
+    def __init__(self, providers: List[EvidenceProvider]):
+        self.providers = providers
+        self.health = {provider.name: ProviderHealth() for provider in providers}
+
+    async def _hedged_search(self, provider: EvidenceProvider, health: ProviderHealth,
+                             title: str, body: str, limit: int, timeout: float) -> List[Dict]:
+        primary = asyncio.create_task(provider.search(title, body, limit, timeout))
+        p95 = health.p95()
+        if p95 is None or not settings.EVIDENCE_HEDGE_ENABLED:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=p95)
+            if not done:
+                health.hedges += 1
+                tasks.add(asyncio.create_task(provider.search(title, body, limit, max(timeout - p95, 0.0))))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _call(self, provider: EvidenceProvider, title: str, body: str, limit: int, timeout: float) -> List[Dict]:
+        health = self.health[provider.name]
+        if not health.start_call():
+            return []  # Another call is already the half-open trial
+        start = time.monotonic()
+        try:
+            results = await self._hedged_search(provider, health, title, body, limit, timeout)
+        except asyncio.CancelledError:
+            health.probing = False  # No verdict; let the next call try
+            raise
+        except Exception as e:
+            health.record_failure()
+            print(f"Evidence provider {provider.name} failed: {e}")
+            return []
+        health.record_success(time.monotonic() - start)
+        return results
+
+    async def _gather(self, providers: List[EvidenceProvider], title: str, body: str, max_sources: int,
+                      deadline: float, results: List[Dict], seen_urls: set):
+        """Run one tier of providers, merging hits into `results` until enough are in or time runs out."""
+        provider_timeout = (deadline - time.monotonic()) * settings.EVIDENCE_PROVIDER_DEADLINE_FRACTION
+        order = {}
+        for index, provider in enumerate(providers):
+            call = self._call(provider, title, body, max_sources, provider_timeout)
+            order[asyncio.create_task(call)] = index
+
+        pending = set(order)
+        try:
+            while pending and _good_hits(results) < max_sources:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=order.get):
+                    for source in task.result():
+                        if source["url"] not in seen_urls:
+                            seen_urls.add(source["url"])
+                            results.append(source)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def search(self, title: str, body: str, max_sources: int, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Query every available provider whose circuit is closed.
+
+        Local providers (no network access) run first. When they return at
+        least settings.EVIDENCE_LOCAL_SUFFICIENT_HITS good hits, the network
+        providers are not called at all; otherwise those run in parallel for
+        the rest of the deadline.
+
+        Returns:
+            Up to max_sources evidence dictionaries, de-duplicated by URL, in
+            arrival order (providers finishing together keep their configured order)
+        """
+        timeout = settings.EVIDENCE_DEADLINE_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        usable = [p for p in self.providers if p.available and self.health[p.name].allow()]
+        local = [p for p in usable if p.local]
+        remote = [p for p in usable if not p.local]
+
+        results, seen_urls = [], set()
+        if local:
+            await self._gather(local, title, body, max_sources, deadline, results, seen_urls)
+        if remote and _good_hits(results) < min(max_sources, settings.EVIDENCE_LOCAL_SUFFICIENT_HITS):
+            await self._gather(remote, title, body, max_sources, deadline, results, seen_urls)
+
+        # Prefer hits that carry a snippet
+        results.sort(key=lambda source: not source.get("snippet"))
+        return results[:max_sources]
+
+    def stats(self) -> Dict:
+        return {
+            provider.name: {"available": provider.available, **self.health[provider.name].stats()}
+            for provider in self.providers
+        }
+
+
+PROVIDER_TYPES = {
+    provider.name: provider
+    for provider in (FactCheckIndexProvider, CachedResultsProvider, SearchAPIProvider, WebPageProvider)
+}
+
+
+def build_providers(names: Optional[List[str]] = None) -> List[EvidenceProvider]:
+    """Instantiate providers by name, in priority order (settings.EVIDENCE_PROVIDERS)."""
+    names = names if names is not None else settings.EVIDENCE_PROVIDERS
+    unknown = [name for name in names if name not in PROVIDER_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown evidence providers: {', '.join(unknown)}")
+    return [PROVIDER_TYPES[name]() for name in names]
+
+
+evidence_fanout = EvidenceFanout(build_providers())
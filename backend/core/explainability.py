@@ -1,6 +1,8 @@
 """Generates explanations for the model's verdict."""
 
-from typing import List, Dict
+from typing import List, Dict, Optional
+from .document import Document
+from .lexicon import TOPIC_KEYWORDS, TOPIC_PREFIX
 
 def generate_explanation(verdict: str, confidence: int, evidence: List[Dict], content_analysis: Dict = None) -> str:
     """
@@ -60,25 +62,22 @@ def generate_explanation(verdict: str, confidence: int, evidence: List[Dict], co
     
     return "\n".join(explanations)
 
-def analyze_content_features(title: str, body: str) -> Dict:
+def analyze_content_features(title: str, body: str, document: Optional[Document] = None) -> Dict:
     """
     Analyze content for common fake news indicators.
     
     Returns dict with boolean flags for different features.
     """
-    text = f"{title} {body}".lower()
+    matches = (document or Document(title, body)).lexicon
     
     # Sensational language
-    sensational_words = ['shocking', 'unbelievable', 'exposed', 'revealed', 'breaking', 'urgent']
-    sensational_count = sum(1 for word in sensational_words if word in text)
+    sensational_count = matches.count("sensational")
     
     # Source citations
-    source_indicators = ['according to', 'study', 'research', 'published', 'reported']
-    has_sources = any(indicator in text for indicator in source_indicators)
+    has_sources = matches.has("source")
     
     # Professional tone
-    professional_indicators = ['however', 'therefore', 'analysis', 'data']
-    professional_count = sum(1 for word in professional_indicators if word in text)
+    professional_count = matches.count("professional")
     
     return {
         'sensational_language': sensational_count >= 2,
@@ -141,38 +140,24 @@ def extract_warning_signals(verdict: str, confidence: int, content_analysis: Dic
     return signals
 
 
-def extract_topics(title: str, body: str) -> List[str]:
+def extract_topics(title: str, body: str, document: Optional[Document] = None) -> List[str]:
     """
     Extract main topics/categories from the content.
     
     Args:
         title: Article title
         body: Article body text
+        document: Shared Document for title/body, if the caller already has one
         
     Returns:
         List of identified topics
     """
-    text = f"{title} {body}".lower()
+    matches = (document or Document(title, body)).lexicon
     topics = []
     
-    # Define topic keywords
-    topic_keywords = {
-        'Politics': ['election', 'government', 'president', 'minister', 'parliament', 'senate', 'congress', 'vote', 'policy', 'democrat', 'republican', 'politician'],
-        'Health': ['health', 'medical', 'doctor', 'hospital', 'disease', 'virus', 'vaccine', 'treatment', 'patient', 'covid', 'pandemic', 'medicine'],
-        'Technology': ['technology', 'tech', 'ai', 'artificial intelligence', 'software', 'computer', 'internet', 'digital', 'app', 'smartphone', 'cyber'],
-        'Science': ['science', 'research', 'study', 'scientist', 'discovery', 'experiment', 'climate', 'space', 'nasa', 'laboratory', 'scientific'],
-        'Economy': ['economy', 'economic', 'finance', 'financial', 'market', 'stock', 'business', 'trade', 'gdp', 'inflation', 'recession'],
-        'Sports': ['sports', 'game', 'player', 'team', 'football', 'cricket', 'basketball', 'match', 'championship', 'olympic', 'tournament'],
-        'Entertainment': ['celebrity', 'movie', 'film', 'actor', 'music', 'singer', 'hollywood', 'entertainment', 'award', 'tv show'],
-        'Environment': ['environment', 'climate change', 'pollution', 'green', 'sustainability', 'renewable', 'carbon', 'emissions', 'conservation'],
-        'Education': ['education', 'school', 'university', 'student', 'teacher', 'college', 'academic', 'learning', 'exam'],
-        'Crime': ['crime', 'criminal', 'police', 'arrest', 'investigation', 'murder', 'theft', 'fraud', 'court', 'lawsuit']
-    }
-    
-    # Check for each topic
-    for topic, keywords in topic_keywords.items():
-        matches = sum(1 for keyword in keywords if keyword in text)
-        if matches >= 2:  # Require at least 2 keyword matches
+    # Check for each topic (keywords are defined in core.lexicon)
+    for topic in TOPIC_KEYWORDS:
+        if matches.count(f"{TOPIC_PREFIX}{topic}") >= 2:  # Require at least 2 keyword matches
             topics.append(topic)
     
     # If no topics found, return default
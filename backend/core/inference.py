@@ -1,96 +1,551 @@
 """Performs inference using the pre-trained fake news detection model."""
 
+import argparse
+import asyncio
+import gc
 import joblib
 import os
+import hashlib
+import struct
+import threading
+import time
 import numpy as np
-from typing import Tuple
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from ..config.settings import settings
+from ..services.executor import run_cpu_stage
+from .document import Document
+from ..services.feature_hashing import TOKEN_PATTERN, tokenize, word_ngrams, hash_term, bucket_counts
 
 # Path to the model file
 MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "model", "model.pkl")
 
-def load_model():
-    """Load the pre-trained model."""
-    if os.path.exists(MODEL_PATH):
+# Uncompressed joblib copy of the model whose numpy arrays can be memory-mapped
+MODEL_ARTIFACT_PATH = settings.MODEL_ARTIFACT_PATH or os.path.join(
+    os.path.dirname(MODEL_PATH), "artifacts", "model.joblib"
+)
+
+# Compact hashed-feature linear model (see HashedLinearModel)
+HASHED_MODEL_PATH = settings.HASHED_MODEL_PATH or os.path.join(
+    os.path.dirname(MODEL_PATH), "artifacts", "model.fnhm"
+)
+
+
+class HashedLinearModel:
+    """
+    Binary linear classifier over hashed TF-IDF features.
+
+    This is a compact runtime form of a TfidfVectorizer + linear classifier
+    pipeline: every vocabulary term is folded into one of `n_features` buckets
+    by a stable hash, and the model stores only two dense float32 arrays
+    (per-bucket IDF and per-bucket coefficient). Scoring a document is a sparse
+    dot product over the buckets it touches - no vocabulary dict, no pickle.
+
+    File layout (little endian): the HEADER struct below followed by
+    idf[n_features] and coef[n_features] as float32.
+    """
+
+    MAGIC = b"FNHM"
+    FORMAT_VERSION = 1
+    # magic, version, n_features, ngram_min, ngram_max, lowercase, sublinear_tf, norm, intercept, negative class, positive class
+    HEADER = struct.Struct("<4sHIBBBBBxfqq")
+    NORMS = {None: 0, "l2": 1, "l1": 2}
+
+    def __init__(self, idf: np.ndarray, coef: np.ndarray, intercept: float, classes=(0, 1),
+                 ngram_range: Tuple[int, int] = (1, 1), lowercase: bool = True,
+                 sublinear_tf: bool = False, norm: Optional[str] = "l2"):
+        self.idf = idf
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.classes_ = np.asarray(classes)
+        self.n_features = len(coef)
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+    @classmethod
+    def from_pipeline(cls, model, n_features: int = 2 ** 18) -> "HashedLinearModel":
+        """
+        Export a fitted sklearn pipeline (TfidfVectorizer -> binary linear classifier).
+
+        When several vocabulary terms land in the same bucket, the bucket IDF is
+        their mean and the coefficient is chosen so that idf * coef equals the
+        sum of their contributions.
+
+        Raises:
+            ValueError: If the pipeline shape is not supported or its class
+                labels are not integers.
+        """
+        steps = getattr(model, "steps", None)
+        if not steps or len(steps) != 2:
+            raise ValueError("Expected a two-step pipeline: TfidfVectorizer -> linear classifier.")
+        vectorizer, classifier = steps[0][1], steps[1][1]
+
+        if not hasattr(vectorizer, "vocabulary_") or getattr(vectorizer, "analyzer", None) != "word":
+            raise ValueError("The first pipeline step must be a fitted word-level TF-IDF vectorizer.")
+        if (vectorizer.token_pattern != TOKEN_PATTERN.pattern or vectorizer.tokenizer
+                or vectorizer.preprocessor or vectorizer.strip_accents):
+            raise ValueError("Only the default token pattern and preprocessing are supported by the hashed runtime.")
+        if vectorizer.stop_words and vectorizer.ngram_range[1] > 1:
+            raise ValueError("Stop word removal combined with n-grams is not supported by the hashed runtime.")
+        coef = np.asarray(getattr(classifier, "coef_", None))
+        if coef.ndim != 2 or coef.shape[0] != 1:
+            raise ValueError("The classifier must be a fitted binary linear model with coef_.")
+        classes = np.asarray(classifier.classes_)
+        if not np.issubdtype(classes.dtype, np.integer):
+            raise ValueError(
+                f"The hashed format stores integer class labels (0 = FAKE, 1 = REAL); got {classes.tolist()!r}. "
+                "Retrain with integer labels."
+            )
+
+        terms = sorted(vectorizer.vocabulary_.items(), key=lambda item: item[1])
+        term_coef = coef[0][[index for _, index in terms]]
+        if getattr(vectorizer, "use_idf", False):
+            term_idf = np.asarray(vectorizer.idf_)[[index for _, index in terms]]
+        else:
+            term_idf = np.ones(len(terms))
+
+        buckets = np.fromiter((hash_term(term, n_features) for term, _ in terms), dtype=np.int64, count=len(terms))
+        idf_sum = np.bincount(buckets, weights=term_idf, minlength=n_features)
+        term_count = np.bincount(buckets, minlength=n_features)
+        weight_sum = np.bincount(buckets, weights=term_idf * term_coef, minlength=n_features)
+
+        idf = np.zeros(n_features, dtype=np.float32)
+        bucket_coef = np.zeros(n_features, dtype=np.float32)
+        used = term_count > 0
+        idf[used] = idf_sum[used] / term_count[used]
+        bucket_coef[used] = weight_sum[used] / idf[used]
+
+        return cls(
+            idf=idf,
+            coef=bucket_coef,
+            intercept=float(np.ravel(classifier.intercept_)[0]),
+            classes=classes,
+            ngram_range=vectorizer.ngram_range,
+            lowercase=vectorizer.lowercase,
+            sublinear_tf=getattr(vectorizer, "sublinear_tf", False),
+            norm=getattr(vectorizer, "norm", None),
+        )
+
+    def save(self, path: str):
+        """Write the model to a single binary file (atomically)."""
+        header = self.HEADER.pack(
+            self.MAGIC, self.FORMAT_VERSION, self.n_features,
+            self.ngram_range[0], self.ngram_range[1],
+            int(self.lowercase), int(self.sublinear_tf), self.NORMS[self.norm],
+            self.intercept, int(self.classes_[0]), int(self.classes_[1]),
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(self.idf.astype('<f4').tobytes())
+            f.write(self.coef.astype('<f4').tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "HashedLinearModel":
+        """Memory-map a model file written by save()."""
+        with open(path, 'rb') as f:
+            fields = cls.HEADER.unpack(f.read(cls.HEADER.size))
+        magic, version, n_features, ngram_min, ngram_max, lowercase, sublinear_tf, norm, intercept, neg, pos = fields
+        if magic != cls.MAGIC or version != cls.FORMAT_VERSION:
+            raise ValueError(f"{path} is not a hashed linear model file (version {cls.FORMAT_VERSION}).")
+
+        arrays = np.memmap(path, dtype='<f4', mode='r', offset=cls.HEADER.size, shape=(2, n_features))
+        norms = {code: name for name, code in cls.NORMS.items()}
+        return cls(
+            idf=arrays[0], coef=arrays[1], intercept=intercept, classes=(neg, pos),
+            ngram_range=(ngram_min, ngram_max), lowercase=bool(lowercase),
+            sublinear_tf=bool(sublinear_tf), norm=norms[norm],
+        )
+
+    def decision_function(self, texts: List[str]) -> np.ndarray:
+        """Linear score per text; positive values favour classes_[1]."""
+        scores = np.empty(len(texts), dtype=np.float64)
+        for i, text in enumerate(texts):
+            terms = word_ngrams(tokenize(text, self.lowercase), self.ngram_range)
+            buckets, counts = bucket_counts(terms, self.n_features)
+            tf = counts.astype(np.float64)
+            if self.sublinear_tf:
+                tf = 1.0 + np.log(tf)
+            weights = tf * self.idf[buckets]
+            if self.norm == "l2":
+                length = np.sqrt(np.dot(weights, weights))
+            elif self.norm == "l1":
+                length = np.abs(weights).sum()
+            else:
+                length = 1.0
+            dot = float(np.dot(weights, self.coef[buckets]))
+            scores[i] = (dot / length if length else 0.0) + self.intercept
+        return scores
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """Logistic class probabilities, columns ordered like classes_."""
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, texts: List[str]) -> np.ndarray:
+        return self.classes_[(self.decision_function(texts) > 0).astype(int)]
+
+
+def verify_hashed_model(source_model, hashed_model: HashedLinearModel, texts: List[str]) -> dict:
+    """
+    Compare a hashed model against the pipeline it was exported from.
+
+    Returns:
+        Dict with the label agreement ratio and the largest probability difference
+    """
+    expected = np.asarray(source_model.predict_proba(texts))
+    actual = hashed_model.predict_proba(texts)
+    same_label = expected.argmax(axis=1) == actual.argmax(axis=1)
+    return {
+        "samples": len(texts),
+        "label_agreement": float(same_label.mean()) if len(texts) else 1.0,
+        "max_proba_diff": float(np.abs(expected - actual).max()) if len(texts) else 0.0,
+    }
+
+
+class ModelRegistry:
+    """
+    Process-wide holder for the fake news model.
+
+    The model is loaded once (normally at startup) and kept in memory. When the
+    file on disk changes, or when `reload()` is called, the new model is loaded
+    next to the old one and swapped in with a single reference assignment, so
+    in-flight requests keep using the model they already fetched.
+    """
+
+    def __init__(self, path: str = MODEL_PATH, artifact_path: str = MODEL_ARTIFACT_PATH,
+                 use_mmap: Optional[bool] = None, hashed_path: str = HASHED_MODEL_PATH,
+                 model_format: Optional[str] = None):
+        self.path = path
+        self.artifact_path = artifact_path
+        self.hashed_path = hashed_path
+        self.use_mmap = settings.MODEL_MMAP if use_mmap is None else use_mmap
+        self.model_format = (model_format or settings.MODEL_FORMAT).lower()
+        self._model = None
+        self._source: Optional[str] = None
+        self._format: Optional[str] = None
+        self._version: Optional[str] = None
+        self._loaded_at: Optional[datetime] = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+
+    def _resolve_source(self) -> Tuple[str, str]:
+        """
+        Pick the file to load and how to load it ("hashed", "mmap" or "pickle").
+
+        The compact hashed model is used when settings.MODEL_FORMAT is "hashed"
+        and its file exists. Otherwise a memory-mapped artifact is preferred when
+        enabled and present: its numpy arrays (coefficients, IDF vectors) are
+        mapped read-only, so every worker process shares the same physical pages
+        through the OS page cache.
+        """
+        if self.model_format == "hashed" and os.path.exists(self.hashed_path):
+            return self.hashed_path, "hashed"
+        if self.use_mmap and os.path.exists(self.artifact_path):
+            return self.artifact_path, "mmap"
+        return self.path, "pickle"
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the model file, or None if it is missing."""
         try:
-            return joblib.load(MODEL_PATH)
-        except Exception as e:
-            print(f"Error loading model: {e}")
+            stat = os.stat(self._resolve_source()[0])
+        except OSError:
             return None
-    return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _file_version(path: str) -> str:
+        """Short content hash used as the model version."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:12]
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Load the model from disk and swap it in.
+
+        Args:
+            force: Reload even if the file has not changed since the last load
+
+        Returns:
+            True if a new model was swapped in, False otherwise
+        """
+        with self._reload_lock:
+            stamp = self._stat()
+            self._last_check = time.monotonic()
+            if stamp is None:
+                return False
+            if not force and stamp == self._file_stamp and self._model is not None:
+                return False
+            source, model_format = self._resolve_source()
+            try:
+                if model_format == "hashed":
+                    model = HashedLinearModel.load(source)
+                else:
+                    model = joblib.load(source, mmap_mode='r' if model_format == "mmap" else None)
+                version = self._file_version(source)
+            except Exception as e:
+                print(f"Error loading model: {e}")
+                return False
+
+            # Requests only read self._model, so rebinding it is the atomic swap
+            self._version, self._file_stamp = version, stamp
+            self._source, self._format = source, model_format
+            self._loaded_at = datetime.now()
+            self._model = model
+            print(f"Loaded model version {version} from {source}")
+            return True
+
+    def _reload_in_background(self):
+        """Reload without blocking the caller; skipped if a reload is already running."""
+        if self._reload_lock.locked():
+            return
+        threading.Thread(target=self.reload, name="model-reload", daemon=True).start()
+
+    def get(self):
+        """
+        Return the current model, or None if no model is available.
+
+        Checks the file for changes at most once every
+        settings.MODEL_RELOAD_CHECK_INTERVAL seconds; a changed file is reloaded
+        in the background while the current model keeps serving.
+        """
+        interval = settings.MODEL_RELOAD_CHECK_INTERVAL
+        if self._model is None and self._file_stamp is None and self._last_check == 0.0:
+            # First use without a startup load
+            self.reload()
+        elif interval > 0 and time.monotonic() - self._last_check >= interval:
+            self._last_check = time.monotonic()
+            stamp = self._stat()
+            if stamp is not None and stamp != self._file_stamp:
+                self._reload_in_background()
+        return self._model
+
+    def info(self) -> dict:
+        """Describe the currently loaded model."""
+        return {
+            "path": self._source or self.path,
+            "format": self._format,
+            "memory_mapped": self._format in ("mmap", "hashed"),
+            "loaded": self._model is not None,
+            "version": self._version,
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+        }
+
+
+model_registry = ModelRegistry()
+
+
+def export_model_artifact(source_path: str = MODEL_PATH, artifact_path: str = MODEL_ARTIFACT_PATH) -> str:
+    """
+    Write an uncompressed joblib copy of the model that can be memory-mapped.
+
+    joblib stores each numpy array of an uncompressed dump as a raw buffer, so
+    loading it with mmap_mode='r' maps coefficients and IDF vectors straight
+    from the file instead of copying them into every worker's heap. Python
+    objects such as the vectorizer vocabulary dict are still unpickled per
+    process; see preload_for_fork() for sharing those.
+
+    Returns:
+        The path of the written artifact
+    """
+    model = joblib.load(source_path)
+    os.makedirs(os.path.dirname(artifact_path) or ".", exist_ok=True)
+    tmp_path = f"{artifact_path}.tmp"
+    joblib.dump(model, tmp_path, compress=0)
+    os.replace(tmp_path, artifact_path)  # Atomic, so running workers pick up a complete file
+    return artifact_path
+
 
-def predict_fake_news(title: str, body: str) -> Tuple[float, str]:
+def preload_for_fork():
+    """
+    Load the model in the parent process before workers are forked.
+
+    Intended for `gunicorn --preload` (see settings.MODEL_PRELOAD). After loading,
+    gc.freeze() moves the model's objects out of the collector's generations so
+    garbage collection in the workers does not touch (and copy) their pages.
+    A later hot reload in a worker loads a private copy for that worker.
+    """
+    model_registry.reload()
+    gc.freeze()
+
+
+def load_model():
+    """Return the registry's current model (loaded once, reloaded on change)."""
+    return model_registry.get()
+
+def _results_from_proba(model, proba) -> List[Tuple[float, str]]:
+    """
+    Turn a predict_proba matrix into (confidence, label) pairs.
+
+    The label is the class with the highest probability, so predict() does not
+    need to run the pipeline a second time.
+    """
+    classes = list(getattr(model, "classes_", [0, 1]))
+    proba = np.asarray(proba)
+    best = proba.argmax(axis=1)
+    return [
+        (float(row[i]), "REAL" if classes[i] == 1 else "FAKE")
+        for row, i in zip(proba, best)
+    ]
+
+
+def predict_batch(texts: List[str]) -> Optional[List[Tuple[float, str]]]:
+    """
+    Score several combined "title body" texts with one vectorized predict_proba.
+
+    Returns:
+        List of (confidence_score, prediction) in input order, or None when no
+        model is loaded
+    """
+    model = load_model()
+    if model is None:
+        return None
+    return _results_from_proba(model, model.predict_proba(texts))
+
+
+def predict_fake_news(title: str, body: str, document: Optional[Document] = None) -> Tuple[float, str]:
     """
     Predict if the news is fake or real.
     
     Args:
         title: Article title
         body: Article body text
+        document: Shared Document for title/body, if the caller already has one
         
     Returns:
         Tuple of (confidence_score, prediction)
         confidence_score: 0.0-1.0 reliability score (higher = more reliable)
         prediction: "REAL" or "FAKE"
     """
-    model = load_model()
-    
-    # If model doesn't exist, use heuristic analysis
-    if model is None:
-        return heuristic_analysis(title, body)
-    
+    document = document or Document(title, body)
     try:
-        # Prepare input for model
-        combined_text = f"{title} {body}"
-        
-        # Model prediction (assuming it returns probability)
-        # You may need to adjust based on your actual model structure
-        prediction = model.predict([combined_text])[0]
-        proba = model.predict_proba([combined_text])[0]
-        
-        # Get confidence (probability of predicted class)
-        confidence = float(max(proba))
-        
-        # Map prediction to label
-        result = "REAL" if prediction == 1 else "FAKE"
-        
-        return confidence, result
-        
+        results = predict_batch([document.text])
     except Exception as e:
         print(f"Model prediction error: {e}")
-        return heuristic_analysis(title, body)
+        results = None
 
-def heuristic_analysis(title: str, body: str) -> Tuple[float, str]:
+    # If model doesn't exist or failed, use heuristic analysis
+    if results is None:
+        return heuristic_analysis(title, body, document)
+    return results[0]
+
+
+class InferenceBatcher:
+    """
+    Coalesces concurrent predictions into micro-batches.
+
+    Callers await `predict()`. The first queued request opens a batch window of
+    settings.INFERENCE_MAX_WAIT_MS; everything that arrives before the window
+    closes (up to settings.INFERENCE_MAX_BATCH_SIZE) is scored by a single
+    predict_proba call and the results are handed back to each caller.
+    """
+
+    def __init__(self, max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        self.max_batch_size = max_batch_size or settings.INFERENCE_MAX_BATCH_SIZE
+        self.max_wait_ms = settings.INFERENCE_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop = None
+
+    @property
+    def pending(self) -> int:
+        """Number of requests waiting to be batched."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_worker(self):
+        """Start the batching task on the running loop if it is not running yet."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            if self._loop is not loop:
+                self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+
+    async def predict(self, title: str, body: str, document: Optional[Document] = None) -> Tuple[float, str]:
+        """Batched equivalent of predict_fake_news()."""
+        document = document or Document(title, body)
+        if load_model() is None:
+            return heuristic_analysis(title, body, document)
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((document, future))
+        return await future
+
+    async def _collect_batch(self) -> list:
+        """Wait for one request, then gather more until the batch is full or the window closes."""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _score(self, batch: list):
+        """Score one batch and resolve its futures."""
+        texts = [document.text for document, _ in batch]
+        try:
+            results = await run_cpu_stage("inference", predict_batch, texts)
+        except Exception as e:
+            print(f"Model prediction error: {e}")
+            results = None
+
+        for i, (document, future) in enumerate(batch):
+            if future.done():  # Caller went away
+                continue
+            if results is None:
+                future.set_result(heuristic_analysis(document.title, document.body, document))
+            else:
+                future.set_result(results[i])
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            try:
+                await self._score(batch)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                # Fail this batch's callers but keep serving later requests
+                print(f"Inference batch error: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+inference_batcher = InferenceBatcher()
+
+def heuristic_analysis(title: str, body: str, document: Optional[Document] = None) -> Tuple[float, str]:
     """
     Fallback heuristic analysis when model is unavailable.
     Uses enhanced text analysis patterns.
     """
-    text = f"{title} {body}".lower()
-    title_lower = title.lower()
-    
-    # Enhanced fake news indicators
-    fake_indicators = [
-        'breaking', 'shocking', 'unbelievable', 'you won\'t believe',
-        'must see', 'urgent', 'warning', 'exposed', 'revealed',
-        'doctors hate', 'they don\'t want you to know', 'miracle',
-        'secret', 'banned', 'censored', 'conspiracy', 'coverup',
-        'explosive', 'bombshell', 'leaked', 'insider'
-    ]
-    
-    # Enhanced credibility indicators
-    credible_indicators = [
-        'study', 'research', 'university', 'according to',
-        'expert', 'professor', 'data shows', 'published',
-        'journal', 'institute', 'analysis', 'report',
-        'official', 'government', 'agency', 'department'
-    ]
+    document = document or Document(title, body)
+    text = document.lower
     
-    # Check for URL patterns (trusted sources)
-    trusted_domains = ['bbc', 'reuters', 'apnews', 'nytimes', 'theguardian', 
-                      'washingtonpost', 'economist', 'npr', 'pbs']
-    has_trusted_source = any(domain in text for domain in trusted_domains)
+    # Fake/credible indicators and trusted domains (see core.lexicon) come from one scan
+    matches = document.lexicon
+    has_trusted_source = matches.has("trusted_domain")
     
     # Calculate scores
-    fake_score = sum(1 for indicator in fake_indicators if indicator in text)
-    credible_score = sum(1 for indicator in credible_indicators if indicator in text)
+    fake_score = matches.count("fake")
+    credible_score = matches.count("credible")
     
     # Check for excessive punctuation (!!!, ???)
     excessive_punctuation = text.count('!!!') + text.count('???')
@@ -124,3 +579,36 @@ def heuristic_analysis(title: str, body: str) -> Tuple[float, str]:
         prediction = "UNCERTAIN"
     
     return confidence, prediction
+
+
+def main():
+    """Command-line entry point for model artifact maintenance."""
+    parser = argparse.ArgumentParser(description="Fake news model artifact tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export-mmap", help="Write a memory-mappable copy of model.pkl")
+    export_parser.add_argument("--source", default=MODEL_PATH, help="Pickled model to export")
+    export_parser.add_argument("--dest", default=MODEL_ARTIFACT_PATH, help="Artifact file to write")
+
+    hashed_parser = subparsers.add_parser("export-hashed", help="Export model.pkl to the compact hashed linear format")
+    hashed_parser.add_argument("--source", default=MODEL_PATH, help="Pickled TF-IDF + linear classifier pipeline")
+    hashed_parser.add_argument("--dest", default=HASHED_MODEL_PATH, help="Hashed model file to write")
+    hashed_parser.add_argument("--n-features", type=int, default=2 ** 18, help="Number of hash buckets")
+    hashed_parser.add_argument("--verify", help="Text file (one document per line) to compare verdicts against the source model")
+
+    args = parser.parse_args()
+    if args.command == "export-mmap":
+        print(f"Wrote memory-mappable model artifact to {export_model_artifact(args.source, args.dest)}")
+    elif args.command == "export-hashed":
+        source_model = joblib.load(args.source)
+        hashed_model = HashedLinearModel.from_pipeline(source_model, args.n_features)
+        hashed_model.save(args.dest)
+        print(f"Wrote hashed linear model ({os.path.getsize(args.dest)} bytes) to {args.dest}")
+        if args.verify:
+            with open(args.verify, 'r', encoding='utf-8') as f:
+                texts = [line.strip() for line in f if line.strip()]
+            print(verify_hashed_model(source_model, hashed_model, texts))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Handles and sanitizes user input before processing."""
 
+import asyncio
 from pydantic import BaseModel
 from fastapi import UploadFile
 import validators
@@ -8,20 +9,56 @@ from ..services.web_scraper import scrape_article_content
 from ..services.utils import clean_and_validate_text, clean_and_validate_article
 from ..services.ocr_service import extract_text_from_image
 from ..services.text_processor import extract_key_sentences_and_truncate
+from ..services.executor import run_cpu_stage
+from ..config.settings import settings
+from .document import Document
+from .pipeline import LatencyBudget
+from typing import Optional
 
 
-async def process_url_for_analysis(url_input: URLInput) -> ModelInput:
+def _split_title_and_body(cleaned_text: str, default_title: str) -> Document:
+    """
+    Use a short first sentence as the title and the remaining sentences as the body.
+
+    Returns:
+        A Document whose body sentences are the ones already split here
+    """
+    sentences = Document("", cleaned_text).sentences
+    if len(sentences) > 1 and len(sentences[0]) < 100:
+        return Document(sentences[0].rstrip('.!?'), ' '.join(sentences[1:]), sentences=sentences[1:])
+    return Document(default_title, cleaned_text, sentences=sentences)
+
+
+async def _summarize(document: Document, budget: Optional[LatencyBudget] = None) -> dict:
+    """
+    Run the extractive summarizer off the event loop.
+
+    When little of the latency budget is left, only the first
+    settings.SUMMARY_CAP_SENTENCES sentences are summarized.
+    """
+    if (budget is not None and budget.remaining() < settings.SUMMARY_CAP_REMAINING_SECONDS
+            and len(document.sentences) > settings.SUMMARY_CAP_SENTENCES):
+        sentences = document.sentences[:settings.SUMMARY_CAP_SENTENCES]
+        document = Document(document.title, ' '.join(sentences), sentences=sentences)
+        budget.degrade("summarize", f"summarized the first {settings.SUMMARY_CAP_SENTENCES} sentences only")
+    return await run_cpu_stage("summarize", extract_key_sentences_and_truncate, document.title, document.body, document=document)
+
+
+async def process_url_for_analysis(url_input: URLInput, budget: Optional[LatencyBudget] = None) -> ModelInput:
     """
     Process and validate a URL input for analysis.
     
     Args:
         url_input: URLInput containing the URL to process
+        budget: Latency budget of the request; the scrape may use what is
+            left of it minus settings.LATENCY_RESERVE_SECONDS
         
     Returns:
         ModelInput ready for analysis
         
     Raises:
-        ValueError: If URL is invalid or content cannot be extracted
+        ValueError: If URL is invalid, content cannot be extracted, or the
+            page does not arrive within the latency budget
     """
     url = url_input.url.strip()
     
@@ -29,22 +66,30 @@ async def process_url_for_analysis(url_input: URLInput) -> ModelInput:
     if not url.startswith(('http://', 'https://')):
         raise ValueError("URL must start with http:// or https://")
     
-    # Scrape article content
-    scraped = scrape_article_content(url)
+    # Scrape article content (async fetch, HTML parsing in the executor)
+    if budget is None:
+        scraped = await scrape_article_content(url)
+    else:
+        scrape_seconds = max(budget.remaining() - settings.LATENCY_RESERVE_SECONDS, 0.0)
+        try:
+            scraped = await asyncio.wait_for(scrape_article_content(url), scrape_seconds)
+        except asyncio.TimeoutError:
+            budget.degrade("scrape", f"no page within {scrape_seconds:.2f}s")
+            raise ValueError(f"The article could not be fetched within the latency budget ({budget.total:.1f}s)")
     
     # Clean and process the text
-    cleaned = clean_and_validate_article(scraped)
-    
-    # Append source URL domain to body for analysis (helps with domain reputation)
-    body_with_source = f"{cleaned.body} Source: {url}"
+    cleaned = await run_cpu_stage("clean", clean_and_validate_article, scraped)
     
-    # Calculate word count
-    word_count = len(cleaned.body.split())
+    # Word count was computed while cleaning
+    word_count = cleaned.word_count
     
     # Validate minimum length
     if word_count < 50:
         raise ValueError("Article content is too short (minimum 50 characters)")
     
+    # Append source URL domain to body for analysis (helps with domain reputation)
+    body_with_source = f"{cleaned.body} Source: {url}"
+    
     return ModelInput(
         title=cleaned.title,
         body=body_with_source,
@@ -53,26 +98,24 @@ async def process_url_for_analysis(url_input: URLInput) -> ModelInput:
     )
 
 
-async def process_text_for_analysis(payload: TextInput) -> ModelInput:
+async def process_text_for_analysis(payload: TextInput, budget: Optional[LatencyBudget] = None) -> ModelInput:
     """
     Orchestrates the pipeline for direct text:
     Clean -> Extract Key Sentences -> Prepare for Model
     """
     original_text = payload.text
-    cleaned_text = clean_and_validate_text(original_text)
+    cleaned_text = await run_cpu_stage("clean", clean_and_validate_text, original_text)
 
     # Extract title from first sentence if possible
-    sentences = cleaned_text.split('.')
-    title = sentences[0] if len(sentences) > 1 and len(sentences[0]) < 100 else "User Submitted Text"
-    body = '.'.join(sentences[1:]) if len(sentences) > 1 else cleaned_text
+    document = _split_title_and_body(cleaned_text, "User Submitted Text")
 
     # Call the TF-IDF processor
-    processed_data = extract_key_sentences_and_truncate(title, body)
+    processed_data = await _summarize(document, budget)
     
     return ModelInput(**processed_data)
 
 
-async def process_image_for_analysis(file: UploadFile) -> ModelInput:
+async def process_image_for_analysis(file: UploadFile, budget: Optional[LatencyBudget] = None) -> ModelInput:
     """
     Orchestrates the full pipeline for an image:
     OCR -> Clean -> Extract Key Sentences -> Prepare for Model
@@ -84,15 +127,13 @@ async def process_image_for_analysis(file: UploadFile) -> ModelInput:
     if not image_bytes:
         raise ValueError("Image file is empty.")
 
-    extracted_text = extract_text_from_image(image_bytes)
-    cleaned_text = clean_and_validate_text(extracted_text)
+    extracted_text = await run_cpu_stage("ocr", extract_text_from_image, image_bytes)
+    cleaned_text = await run_cpu_stage("clean", clean_and_validate_text, extracted_text)
     
     # Extract title from first sentence if possible
-    sentences = cleaned_text.split('.')
-    title = sentences[0] if len(sentences) > 1 and len(sentences[0]) < 100 else "Text from Image"
-    body = '.'.join(sentences[1:]) if len(sentences) > 1 else cleaned_text
+    document = _split_title_and_body(cleaned_text, "Text from Image")
 
     # Call the TF-IDF processor
-    processed_data = extract_key_sentences_and_truncate(title, body)
+    processed_data = await _summarize(document, budget)
 
     return ModelInput(**processed_data)
@@ -0,0 +1,117 @@
+"""Compiled multi-pattern lexicon shared by heuristics, content analysis and topic extraction."""
+
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List
+
+# Heuristic fake news indicators (see inference.heuristic_analysis)
+FAKE_INDICATORS = [
+    'breaking', 'shocking', 'unbelievable', 'you won\'t believe',
+    'must see', 'urgent', 'warning', 'exposed', 'revealed',
+    'doctors hate', 'they don\'t want you to know', 'miracle',
+    'secret', 'banned', 'censored', 'conspiracy', 'coverup',
+    'explosive', 'bombshell', 'leaked', 'insider'
+]
+
+# Heuristic credibility indicators
+CREDIBLE_INDICATORS = [
+    'study', 'research', 'university', 'according to',
+    'expert', 'professor', 'data shows', 'published',
+    'journal', 'institute', 'analysis', 'report',
+    'official', 'government', 'agency', 'department'
+]
+
+# Trusted news domains mentioned in the text or source URL
+TRUSTED_DOMAINS = ['bbc', 'reuters', 'apnews', 'nytimes', 'theguardian',
+                   'washingtonpost', 'economist', 'npr', 'pbs']
+
+# Content feature indicators (see explainability.analyze_content_features)
+SENSATIONAL_WORDS = ['shocking', 'unbelievable', 'exposed', 'revealed', 'breaking', 'urgent']
+SOURCE_INDICATORS = ['according to', 'study', 'research', 'published', 'reported']
+PROFESSIONAL_INDICATORS = ['however', 'therefore', 'analysis', 'data']
+
+# Topic keywords (see explainability.extract_topics)
+TOPIC_KEYWORDS = {
+    'Politics': ['election', 'government', 'president', 'minister', 'parliament', 'senate', 'congress', 'vote', 'policy', 'democrat', 'republican', 'politician'],
+    'Health': ['health', 'medical', 'doctor', 'hospital', 'disease', 'virus', 'vaccine', 'treatment', 'patient', 'covid', 'pandemic', 'medicine'],
+    'Technology': ['technology', 'tech', 'ai', 'artificial intelligence', 'software', 'computer', 'internet', 'digital', 'app', 'smartphone', 'cyber'],
+    'Science': ['science', 'research', 'study', 'scientist', 'discovery', 'experiment', 'climate', 'space', 'nasa', 'laboratory', 'scientific'],
+    'Economy': ['economy', 'economic', 'finance', 'financial', 'market', 'stock', 'business', 'trade', 'gdp', 'inflation', 'recession'],
+    'Sports': ['sports', 'game', 'player', 'team', 'football', 'cricket', 'basketball', 'match', 'championship', 'olympic', 'tournament'],
+    'Entertainment': ['celebrity', 'movie', 'film', 'actor', 'music', 'singer', 'hollywood', 'entertainment', 'award', 'tv show'],
+    'Environment': ['environment', 'climate change', 'pollution', 'green', 'sustainability', 'renewable', 'carbon', 'emissions', 'conservation'],
+    'Education': ['education', 'school', 'university', 'student', 'teacher', 'college', 'academic', 'learning', 'exam'],
+    'Crime': ['crime', 'criminal', 'police', 'arrest', 'investigation', 'murder', 'theft', 'fraud', 'court', 'lawsuit']
+}
+
+TOPIC_PREFIX = "topic:"
+
+
+def _term_pattern(term: str) -> str:
+    """Regex for one term: literal words, optional apostrophes, optional plural 's'."""
+    pattern = re.escape(term).replace("'", "'?")
+    return pattern if term.endswith('s') else pattern + "s?"
+
+
+class LexiconMatch:
+    """Distinct lexicon terms found in a text, grouped by category."""
+
+    def __init__(self, terms: FrozenSet[str], counts: Counter):
+        self.terms = terms
+        self._counts = counts
+
+    def count(self, category: str) -> int:
+        """Number of distinct terms of the category present in the text."""
+        return self._counts.get(category, 0)
+
+    def has(self, category: str) -> bool:
+        return self._counts.get(category, 0) > 0
+
+
+class Lexicon:
+    """
+    Matches many word-boundary-aware terms in one pass over the text.
+
+    All terms are compiled into a single regex of zero-width lookaheads, one
+    alternative per term (longest first), anchored at word boundaries. Each
+    word start is tried once; a phrase that matches also credits the shorter
+    terms it contains ("climate change" counts "climate" too), so results equal
+    checking every term separately - without partial-word hits such as 'ai' in
+    'said'.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self._categories_by_term: Dict[str, List[str]] = {}
+        for category, terms in categories.items():
+            for term in terms:
+                self._categories_by_term.setdefault(term.lower(), []).append(category)
+
+        self._terms = sorted(self._categories_by_term, key=len, reverse=True)
+        alternatives = "|".join(f"({_term_pattern(term)})" for term in self._terms)
+        self._pattern = re.compile(rf"\b(?=(?:{alternatives})\b)")
+
+        # Terms implied by a longer match starting at the same position
+        self._implied = {
+            term: frozenset(other for other in self._terms if re.search(rf"\b{_term_pattern(other)}\b", term))
+            for term in self._terms
+        }
+
+    def scan(self, text: str) -> LexiconMatch:
+        """Find all lexicon terms in (already lowercased) text."""
+        found = set()
+        for match in self._pattern.finditer(text):
+            found |= self._implied[self._terms[match.lastindex - 1]]
+        counts = Counter(category for term in found for category in self._categories_by_term[term])
+        return LexiconMatch(frozenset(found), counts)
+
+
+# Built once at import; serves heuristics, content features and topics from one scan
+ANALYSIS_LEXICON = Lexicon({
+    "fake": FAKE_INDICATORS,
+    "credible": CREDIBLE_INDICATORS,
+    "trusted_domain": TRUSTED_DOMAINS,
+    "sensational": SENSATIONAL_WORDS,
+    "source": SOURCE_INDICATORS,
+    "professional": PROFESSIONAL_INDICATORS,
+    **{f"{TOPIC_PREFIX}{topic}": keywords for topic, keywords in TOPIC_KEYWORDS.items()},
+})
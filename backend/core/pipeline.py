@@ -0,0 +1,114 @@
+"""Runs analysis stages as a dependency graph, concurrently where possible."""
+
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from ..config.settings import settings
+
+
+class Stage(NamedTuple):
+    """One named step of the pipeline and the stages whose results it needs."""
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...]
+
+
+class StageGraph:
+    """
+    A small DAG of pipeline stages.
+
+    Each stage function receives a dict of its dependencies' results (keyed by
+    stage name) and may be sync or async; CPU-heavy stages should dispatch to
+    the executor themselves (see services.executor.run_cpu_stage). Stages start
+    as soon as their dependencies finish, so independent stages overlap and the
+    total latency follows the critical path rather than the sum of stages.
+
+    Dependencies must be added before the stages that use them, which keeps
+    the graph acyclic by construction.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+
+    def add(self, name: str, fn: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()) -> "StageGraph":
+        deps = tuple(deps)
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(missing)}")
+        self.stages[name] = Stage(name, fn, deps)
+        return self
+
+    async def run(self) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Run every stage.
+
+        If a stage raises, the stages still running are cancelled and the
+        exception propagates.
+
+        Returns:
+            Tuple of (results by stage name, stage durations in milliseconds)
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        timings: Dict[str, float] = {}
+
+        async def run_stage(stage: Stage):
+            inputs = {}
+            for dep in stage.deps:
+                inputs[dep] = await tasks[dep]
+            start = time.perf_counter()
+            result = stage.fn(inputs)
+            if inspect.isawaitable(result):
+                result = await result
+            timings[stage.name] = round((time.perf_counter() - start) * 1000, 2)
+            return result
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Mark secondary failures as retrieved
+        return {name: task.result() for name, task in tasks.items()}, timings
+
+
+class LatencyBudget:
+    """
+    Time allowed for one request, started when the request arrives.
+
+    Stages consult `remaining()` to decide how much work to do, and record
+    any shortcut they take with `degrade()` so the response can report it.
+    """
+
+    def __init__(self, budget_ms: Optional[float] = None):
+        budget_ms = settings.LATENCY_BUDGET_MS if budget_ms is None else budget_ms
+        self.total = min(max(budget_ms, 0.0), settings.LATENCY_BUDGET_MAX_MS) / 1000.0
+        self.start = time.monotonic()
+        self.degraded: Dict[str, str] = {}
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> "LatencyBudget":
+        """Budget from an X-Latency-Budget-Ms header value; missing or invalid values use the default."""
+        try:
+            budget_ms = float(value) if value else None
+        except ValueError:
+            budget_ms = None
+        return cls(budget_ms if budget_ms is None or budget_ms > 0 else None)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(self.total - self.elapsed(), 0.0)
+
+    def degrade(self, stage: str, reason: str):
+        """Record that a stage did less than its full work."""
+        self.degraded[stage] = reason
@@ -0,0 +1,70 @@
+"""Coalesces concurrent identical calls into one in-progress execution."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the same
+    key wait for that call and all receive its result or exception.
+
+    The shared call runs in its own task and each caller awaits it through
+    asyncio.shield, so one caller being cancelled does not cancel the work the
+    others are waiting for. The task is only cancelled when every caller has
+    gone away. Once the call finishes the key is released, so later calls run
+    afresh (this is deduplication, not caching).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.counters = {"executions": 0, "shared": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for the key, or join the call already in progress.
+
+        Args:
+            key: Identity of the work (e.g. canonical URL or content hash)
+            fn: Coroutine function performing the work
+
+        Returns:
+            The call's result (the same object for every caller)
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, key)  # Tasks cannot be shared across event loops
+        task = self._calls.get(key)
+        if task is None:
+            task = loop.create_task(fn())
+            self._calls[key] = task
+            self._waiters[task] = 0
+            self.counters["executions"] += 1
+            task.add_done_callback(lambda _: self._release(key, task))
+        else:
+            self.counters["shared"] += 1
+
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(task) == 1:
+                task.cancel()  # Last interested caller left
+            raise
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        self._waiters.pop(task, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved by the callers; avoid "never retrieved" warnings if none remain
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict:
+        return {"in_flight": self.in_flight, **self.counters}
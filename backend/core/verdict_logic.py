@@ -24,7 +24,8 @@ def determine_verdict(confidence: float, prediction: str) -> Tuple[str, int]:
     else:
         return "REAL", confidence_pct
 
-def adjust_confidence_with_evidence(base_confidence: int, evidence_count: int, evidence_agreement: float) -> int:
+def adjust_confidence_with_evidence(base_confidence: int, evidence_count: int, evidence_agreement: float,
+                                    evidence_relevance: float = 1.0) -> int:
     """
     Adjust confidence based on external evidence.
     
@@ -32,6 +33,7 @@ def adjust_confidence_with_evidence(base_confidence: int, evidence_count: int, e
         base_confidence: Base confidence percentage (0-100)
         evidence_count: Number of evidence sources found
         evidence_agreement: 0.0-1.0 how much evidence agrees with verdict
+        evidence_relevance: 0.0-1.0 how closely the evidence matches the claim
         
     Returns:
         Adjusted confidence percentage
@@ -40,7 +42,7 @@ def adjust_confidence_with_evidence(base_confidence: int, evidence_count: int, e
         return base_confidence
     
     # Boost or reduce confidence based on evidence
-    evidence_boost = int(evidence_agreement * 10)  # Up to 10% adjustment
+    evidence_boost = int(evidence_agreement * evidence_relevance * 10)  # Up to 10% adjustment
     adjusted = base_confidence + evidence_boost
     
     # Cap between 50-95%
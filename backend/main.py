@@ -1,14 +1,44 @@
 """Main application file for the FastAPI backend."""
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # Use relative imports when running as a package
-from .routes import detect, feedback, sources
+from .routes import detect, feedback, sources, admin, crawl
+from .config.settings import settings
+from .core.inference import model_registry, preload_for_fork
+from .services.crawler import stop_crawls
+from .services.executor import cpu_executor
+from .services.http_client import close_async_clients, start_async_clients
+from .services.extraction_templates import template_store
+from .services.scrape_cache import scrape_cache
+
+# In pre-fork mode the model is loaded once here, in the parent process, so
+# every forked worker shares the same pages instead of loading its own copy.
+if settings.MODEL_PRELOAD:
+    preload_for_fork()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load shared resources once at startup and release them on shutdown."""
+    if not settings.MODEL_PRELOAD:
+        model_registry.reload()
+    # Application-lifetime HTTP clients for scraping and evidence fetches
+    await start_async_clients("scraper", "evidence")
+    yield
+    await stop_crawls()
+    await close_async_clients()
+    scrape_cache.close()
+    template_store.save()
+    cpu_executor.shutdown()
+
 
 app = FastAPI(
     title="Multi-Agent Fake-News Detection Platform",
     description="A backend system to detect fake news from various sources with URL, text, and image processing capabilities.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS Middleware - configured to allow all origins for API access
@@ -25,6 +55,8 @@ app.add_middleware(
 app.include_router(detect.router, prefix="/api/v1", tags=["Detection"])
 app.include_router(feedback.router, prefix="/api/v1", tags=["Feedback"])
 app.include_router(sources.router, prefix="/api/v1", tags=["Sources"])
+app.include_router(admin.router, prefix="/api/v1", tags=["Admin"])
+app.include_router(crawl.router, prefix="/api/v1", tags=["Crawler"])
 
 @app.get("/", tags=["Root"])
 async def read_root():
@@ -36,6 +68,8 @@ async def read_root():
             "process_text": "/api/v1/process-text",
             "process_image": "/api/v1/process-image",
             "feedback": "/api/v1/feedback",
-            "sources": "/api/v1/sources"
+            "sources": "/api/v1/sources",
+            "crawl": "/api/v1/crawl",
+            "model_info": "/api/v1/admin/model"
         }
     }
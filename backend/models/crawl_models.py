@@ -0,0 +1,32 @@
+"""Pydantic models for crawl-related data structures."""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+
+# Pydantic model for a crawl request
+class CrawlInput(BaseModel):
+    sources: List[str] = Field(..., min_length=1, description="RSS/Atom feed or sitemap URLs to discover articles from.")
+    max_articles: Optional[int] = Field(None, gt=0, description="Most new articles to analyze (default: settings.CRAWLER_MAX_ARTICLES).")
+
+
+# Outcome for one crawled article
+class CrawlResult(BaseModel):
+    url: str
+    verdict: Optional[str] = None
+    confidence: Optional[float] = None
+    error: Optional[str] = None
+
+
+# Progress and results of a crawl job
+class CrawlJob(BaseModel):
+    job_id: str
+    status: str = "pending"  # pending, discovering, crawling, done, failed, cancelled
+    sources: List[str]
+    counts: Dict[str, int] = Field(default_factory=lambda: {
+        "discovered": 0, "already_seen": 0, "disallowed": 0, "queued": 0, "analyzed": 0, "failed": 0,
+    })
+    errors: List[str] = Field(default_factory=list)  # Sources that could not be read
+    results: List[CrawlResult] = Field(default_factory=list)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
@@ -1,7 +1,8 @@
 """Pydantic models for detection-related data structures."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional
+from ..core.document import Document
 
 
 # Pydantic model for URL input
@@ -16,6 +17,7 @@ class ScrapedArticle(BaseModel):
     body: str  # Changed from 'content' to 'body' for consistency
     author: Optional[str] = None
     publish_date: Optional[str] = None
+    word_count: Optional[int] = None  # Set once the body has been cleaned
 
 
 # NEW: Pydantic model for direct text input
@@ -40,3 +42,12 @@ class ModelInput(BaseModel):
     body: str = Field(..., description="The summarized and truncated article body (max 500 words).")
     source_url: Optional[str] = Field(None, description="The source URL if available.")
     word_count: int = Field(..., description="The number of words in the processed body text.")
+
+    _document: Optional[Document] = PrivateAttr(default=None)
+
+    @property
+    def document(self) -> Document:
+        """The shared Document for this input, built on first use."""
+        if self._document is None or self._document.title != self.title or self._document.body != self.body:
+            self._document = Document(self.title, self.body)
+        return self._document
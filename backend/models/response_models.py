@@ -1,7 +1,7 @@
 """Response models for API endpoints."""
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class EvidenceSource(BaseModel):
     """Single evidence source."""
@@ -9,6 +9,7 @@ class EvidenceSource(BaseModel):
     title: str
     snippet: str
     similarity: Optional[str] = None
+    similarity_score: Optional[float] = None  # Cosine similarity to the claim (0-1)
 
 class Evidence(BaseModel):
     """Collection of evidence sources."""
@@ -35,3 +36,5 @@ class CompleteAnalysisResponse(BaseModel):
     """Complete response with processed input and analysis."""
     processed_input: ProcessedInput
     evidence_analysis: EvidenceAnalysis
+    stage_timings: Dict[str, float] = {}  # Milliseconds spent in each pipeline stage
+    degraded_stages: Dict[str, str] = {}  # Stages that did reduced work to meet the latency budget, with the reason
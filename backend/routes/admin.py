@@ -0,0 +1,65 @@
+"""API endpoints for operational and administrative tasks."""
+
+import asyncio
+from fastapi import APIRouter, HTTPException
+# Use relative imports when running as a package
+from ..core.inference import model_registry
+from ..core.evidence_agent import evidence_cache
+from ..core.evidence_providers import evidence_fanout
+from .detect import analysis_flights
+from ..services.executor import cpu_executor
+from ..services.extraction_templates import template_store
+from ..services.scrape_cache import scrape_cache
+
+router = APIRouter()
+
+
+@router.get("/admin/model")
+async def get_model_info():
+    """Return the version and load time of the currently served model."""
+    return model_registry.info()
+
+
+@router.post("/admin/model/reload")
+async def reload_model():
+    """Force a reload of the model file and swap it in without dropping requests."""
+    reloaded = await asyncio.to_thread(model_registry.reload, True)
+    if not reloaded and not model_registry.info()["loaded"]:
+        raise HTTPException(status_code=404, detail=f"No loadable model found at {model_registry.path}")
+    return {"reloaded": reloaded, **model_registry.info()}
+
+
+@router.get("/admin/executor")
+async def get_executor_stats():
+    """Return CPU stage pool configuration and per-stage statistics."""
+    return cpu_executor.stats()
+
+
+@router.get("/admin/evidence")
+async def get_evidence_provider_stats():
+    """Return per-provider call counts, hedges, p95 latency and circuit state."""
+    return evidence_fanout.stats()
+
+
+@router.get("/admin/evidence/cache")
+async def get_evidence_cache_stats():
+    """Return evidence cache size, hit/miss counters and hit rate."""
+    return evidence_cache.stats()
+
+
+@router.get("/admin/scrape-cache")
+async def get_scrape_cache_stats():
+    """Return scrape cache entries, stored bytes, hit/revalidation/miss counters and hit ratio."""
+    return await asyncio.to_thread(scrape_cache.stats)
+
+
+@router.get("/admin/extraction-templates")
+async def get_extraction_template_stats():
+    """Return learned per-domain article selectors and hit/failure/re-learn counters."""
+    return template_store.stats()
+
+
+@router.get("/admin/singleflight")
+async def get_single_flight_stats():
+    """Return analyses in flight and how many requests joined an existing one."""
+    return analysis_flights.stats()
@@ -0,0 +1,62 @@
+"""API endpoints for crawling feeds and sitemaps."""
+
+from fastapi import APIRouter, HTTPException, Body
+# Use relative imports when running as a package
+from ..core.input_handler import process_url_for_analysis
+from ..core.pipeline import LatencyBudget
+from ..models.crawl_models import CrawlInput, CrawlJob, CrawlResult
+from ..models.detection_models import URLInput
+from ..services.crawler import crawl_jobs, start_crawl
+from .detect import analyze_once, perform_complete_analysis
+
+router = APIRouter()
+
+
+async def analyze_crawled_url(url: str) -> CrawlResult:
+    """
+    Run one crawled article through the normal URL analysis pipeline.
+
+    Shares the single-flight key of /process-url, so a crawl and a user
+    request for the same article run one analysis.
+    """
+    budget = LatencyBudget()
+
+    async def analyze():
+        processed_input = await process_url_for_analysis(URLInput(url=url), budget)
+        return await perform_complete_analysis(processed_input, budget)
+
+    response = await analyze_once(f"url:{url}", analyze)
+    return CrawlResult(
+        url=url,
+        verdict=response.evidence_analysis.verdict,
+        confidence=response.evidence_analysis.confidence_value,
+    )
+
+
+@router.post(
+    "/crawl",
+    response_model=CrawlJob,
+    status_code=202,
+    summary="Crawl Feeds and Sitemaps",
+    description="Discovers articles from RSS/Atom feeds or sitemaps and analyzes the new ones in the background."
+)
+async def crawl(payload: CrawlInput = Body(...)):
+    """
+    Start a crawl job:
+    - Reads the feeds/sitemaps (following sitemap indexes)
+    - Skips articles already crawled and those disallowed by robots.txt
+    - Analyzes the rest with per-domain rate limits and a global concurrency cap
+    """
+    invalid = [source for source in payload.sources if not source.startswith(('http://', 'https://'))]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Source URLs must start with http:// or https://: {', '.join(invalid)}")
+    return start_crawl(payload.sources, analyze_crawled_url, payload.max_articles)
+
+
+@router.get("/crawl/{job_id}", response_model=CrawlJob, summary="Crawl Job Status")
+async def get_crawl_job(job_id: str):
+    """Return a crawl job's progress counters and per-article results."""
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    return job
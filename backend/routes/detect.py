@@ -1,6 +1,6 @@
 """API endpoints for news content detection."""
 
-from fastapi import APIRouter, HTTPException, Body, File, UploadFile
+from fastapi import APIRouter, HTTPException, Body, File, UploadFile, Header
 # Use relative imports when running as a package
 from ..core.input_handler import (
     process_url_for_analysis, 
@@ -9,56 +9,141 @@ from ..core.input_handler import (
 )
 from ..models.detection_models import URLInput, ModelInput, TextInput
 from ..models.response_models import CompleteAnalysisResponse, ProcessedInput, EvidenceAnalysis, Evidence, EvidenceSource
-from ..core.inference import predict_fake_news
+from ..core.inference import inference_batcher, heuristic_analysis
 from ..core.verdict_logic import determine_verdict, adjust_confidence_with_evidence
 from ..core.explainability import generate_explanation, analyze_content_features, extract_warning_signals, extract_topics
-from ..core.evidence_agent import search_web_evidence, calculate_evidence_agreement
+from ..core.evidence_agent import search_web_evidence, calculate_evidence_agreement, evidence_relevance
+from ..core.pipeline import StageGraph, LatencyBudget
+from ..core.singleflight import SingleFlight
+from ..services.scrape_cache import canonical_url
+from ..config.settings import settings
+from ..services.executor import run_cpu_stage, cpu_executor
+from typing import Optional
+import asyncio
+import hashlib
 import json
 import os
 from datetime import datetime
 
 router = APIRouter()
 
-async def perform_complete_analysis(model_input: ModelInput) -> CompleteAnalysisResponse:
+# Concurrent identical analyses share one execution
+analysis_flights = SingleFlight()
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def analyze_once(key: str, analyze) -> CompleteAnalysisResponse:
+    """
+    Run an analysis, or wait for an identical one already in progress.
+
+    Each caller gets its own copy of the shared response, so per-request
+    changes do not leak between callers. The in-progress analysis runs under
+    the latency budget of the request that started it.
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return await analyze()
+    result = await analysis_flights.do(key, analyze)
+    return result.model_copy(deep=True)
+
+async def perform_complete_analysis(model_input: ModelInput, budget: Optional[LatencyBudget] = None) -> CompleteAnalysisResponse:
     """
     Perform complete fake news analysis including ML inference and evidence gathering.
     
+    Work adapts to the latency budget: the evidence search is shortened to the
+    time left (or skipped once the model is highly confident), and inference
+    falls back to heuristics when its queue is saturated. Any such shortcut is
+    listed in the response's degraded_stages.
+    
     Args:
         model_input: Processed and cleaned input ready for analysis
+        budget: Latency budget for the request (default settings.LATENCY_BUDGET_MS from now)
         
     Returns:
         Complete analysis with verdict, confidence, explanation, and evidence
     """
-    # Step 1: ML Model Prediction
-    confidence_score, prediction = predict_fake_news(model_input.title, model_input.body)
+    budget = budget or LatencyBudget()
     
-    # Step 2: Determine base verdict
-    verdict, confidence_pct = determine_verdict(confidence_score, prediction)
+    # Shared tokenized view of the input, reused by every stage below
+    document = model_input.document
+    title, body = model_input.title, model_input.body
+    model_confidence = asyncio.get_running_loop().create_future()
     
-    # Step 3: Gather web evidence
-    evidence_sources = await search_web_evidence(model_input.title, model_input.body)
+    async def model_verdict(_):
+        # ML Model Prediction (coalesced with concurrent requests), then base verdict
+        if (inference_batcher.pending >= settings.INFERENCE_SATURATION_PENDING
+                or cpu_executor.in_flight >= cpu_executor.max_queue):
+            budget.degrade("inference", "inference queue saturated; used heuristic analysis")
+            confidence_score, prediction = heuristic_analysis(title, body, document)
+        else:
+            confidence_score, prediction = await inference_batcher.predict(title, body, document)
+        model_confidence.set_result(confidence_score)
+        return determine_verdict(confidence_score, prediction)
     
-    # Step 4: Adjust confidence based on evidence
-    evidence_agreement = calculate_evidence_agreement(evidence_sources, verdict)
-    final_confidence = adjust_confidence_with_evidence(confidence_pct, len(evidence_sources), evidence_agreement)
+    async def evidence(_):
+        # Gather web evidence within what is left of the budget
+        timeout = min(settings.EVIDENCE_DEADLINE_SECONDS, budget.remaining() - settings.LATENCY_RESERVE_SECONDS)
+        if timeout < settings.EVIDENCE_MIN_SECONDS:
+            budget.degrade("evidence", "skipped: latency budget exhausted")
+            return []
+        if timeout < settings.EVIDENCE_DEADLINE_SECONDS:
+            budget.degrade("evidence", f"search shortened to {int(timeout * 1000)} ms")
+        
+        search = asyncio.create_task(search_web_evidence(title, body, timeout=timeout))
+        try:
+            # A highly confident model makes the evidence search unnecessary
+            await asyncio.wait([search, model_confidence], return_when=asyncio.FIRST_COMPLETED)
+            if not search.done() and model_confidence.result() >= settings.EVIDENCE_SKIP_CONFIDENCE:
+                budget.degrade("evidence", "skipped: model confidence above threshold")
+                return []
+            return await search
+        finally:
+            search.cancel()
     
-    # Step 5: Analyze content features
-    content_analysis = analyze_content_features(model_input.title, model_input.body)
+    def adjusted_confidence(results):
+        # Adjust confidence based on evidence
+        verdict, confidence_pct = results["inference"]
+        evidence_sources = results["evidence"]
+        evidence_agreement = calculate_evidence_agreement(evidence_sources, verdict)
+        return adjust_confidence_with_evidence(
+            confidence_pct, len(evidence_sources), evidence_agreement, evidence_relevance(evidence_sources)
+        )
     
-    # Step 6: Extract warning signals and topics
-    warning_signals = extract_warning_signals(verdict, final_confidence, content_analysis, len(evidence_sources))
-    extracted_topics = extract_topics(model_input.title, model_input.body)
+    # Evidence, content features and topics depend only on the input, so they
+    # run alongside inference; only the final steps wait for the verdict.
+    graph = (
+        StageGraph()
+        .add("inference", model_verdict)
+        .add("evidence", evidence)
+        .add("content_analysis", lambda _: run_cpu_stage("content_analysis", analyze_content_features, title, body, document))
+        .add("topics", lambda _: run_cpu_stage("topics", extract_topics, title, body, document))
+        .add("confidence", adjusted_confidence, deps=["inference", "evidence"])
+        .add("warning_signals", lambda r: extract_warning_signals(
+            r["inference"][0], r["confidence"], r["content_analysis"], len(r["evidence"])
+        ), deps=["inference", "confidence", "content_analysis", "evidence"])
+        .add("explanation", lambda r: generate_explanation(
+            r["inference"][0], r["confidence"], r["evidence"], r["content_analysis"]
+        ), deps=["inference", "confidence", "evidence", "content_analysis"])
+    )
+    results, stage_timings = await graph.run()
     
-    # Step 7: Generate explanation
-    explanation = generate_explanation(verdict, final_confidence, evidence_sources, content_analysis)
+    verdict = results["inference"][0]
+    final_confidence = results["confidence"]
+    evidence_sources = results["evidence"]
+    warning_signals = results["warning_signals"]
+    extracted_topics = results["topics"]
+    explanation = results["explanation"]
     
-    # Step 8: Build response
+    # Build response
     evidence_list = [
         EvidenceSource(
             url=src["url"],
             title=src["title"],
             snippet=src["snippet"],
-            similarity=src.get("similarity")
+            similarity=src.get("similarity"),
+            similarity_score=src.get("similarity_score")
         )
         for src in evidence_sources
     ]
@@ -77,10 +162,12 @@ async def perform_complete_analysis(model_input: ModelInput) -> CompleteAnalysis
             evidence=Evidence(sources=evidence_list),
             warning_signals=warning_signals,
             extracted_topics=extracted_topics
-        )
+        ),
+        stage_timings=stage_timings,
+        degraded_stages=budget.degraded
     )
     
-    # Step 9: Save to history JSON file
+    # Save to history JSON file
     save_analysis_to_history(response)
     
     return response
@@ -140,7 +227,7 @@ def save_analysis_to_history(response: CompleteAnalysisResponse):
     summary="Process and Analyze a News Article URL",
     description="Scrapes URL, analyzes content with ML model, gathers evidence, and returns complete verdict."
 )
-async def process_url(payload: URLInput = Body(...)):
+async def process_url(payload: URLInput = Body(...), x_latency_budget_ms: Optional[str] = Header(None)):
     """
     Complete pipeline for URL analysis:
     - Scrapes and cleans content
@@ -148,14 +235,17 @@ async def process_url(payload: URLInput = Body(...)):
     - Gathers web evidence
     - Returns verdict with confidence and explanation
     """
-    try:
+    budget = LatencyBudget.from_header(x_latency_budget_ms)
+    
+    async def analyze():
         # Process input
-        processed_input = await process_url_for_analysis(payload)
+        processed_input = await process_url_for_analysis(payload, budget)
         
         # Perform complete analysis
-        result = await perform_complete_analysis(processed_input)
-        
-        return result
+        return await perform_complete_analysis(processed_input, budget)
+    
+    try:
+        return await analyze_once(f"url:{canonical_url(payload.url)}", analyze)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -167,7 +257,7 @@ async def process_url(payload: URLInput = Body(...)):
     summary="Process and Analyze Raw Text",
     description="Analyzes text with ML model, gathers evidence, and returns complete verdict."
 )
-async def process_text(payload: TextInput = Body(...)):
+async def process_text(payload: TextInput = Body(...), x_latency_budget_ms: Optional[str] = Header(None)):
     """
     Complete pipeline for text analysis:
     - Cleans and processes text
@@ -175,14 +265,17 @@ async def process_text(payload: TextInput = Body(...)):
     - Gathers web evidence
     - Returns verdict with confidence and explanation
     """
-    try:
+    budget = LatencyBudget.from_header(x_latency_budget_ms)
+    
+    async def analyze():
         # Process input
-        processed_input = await process_text_for_analysis(payload)
+        processed_input = await process_text_for_analysis(payload, budget)
         
         # Perform complete analysis
-        result = await perform_complete_analysis(processed_input)
-        
-        return result
+        return await perform_complete_analysis(processed_input, budget)
+    
+    try:
+        return await analyze_once(f"text:{_content_hash(payload.text.encode('utf-8'))}", analyze)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -194,7 +287,7 @@ async def process_text(payload: TextInput = Body(...)):
     summary="Process and Analyze Image (OCR)",
     description="Extracts text from image, analyzes with ML model, gathers evidence, and returns complete verdict."
 )
-async def process_image(file: UploadFile = File(...)):
+async def process_image(file: UploadFile = File(...), x_latency_budget_ms: Optional[str] = Header(None)):
     """
     Complete pipeline for image analysis:
     - Extracts text via OCR
@@ -203,17 +296,24 @@ async def process_image(file: UploadFile = File(...)):
     - Gathers web evidence
     - Returns verdict with confidence and explanation
     """
-    try:
+    budget = LatencyBudget.from_header(x_latency_budget_ms)
+    
+    async def analyze():
         # Process input
-        processed_input = await process_image_for_analysis(file)
+        processed_input = await process_image_for_analysis(file, budget)
         
         # Add image_text field to response
-        result = await perform_complete_analysis(processed_input)
+        result = await perform_complete_analysis(processed_input, budget)
         
         # Add OCR extracted text to response
         result.processed_input.image_text = processed_input.body[:200] + "..."
         
         return result
+    
+    try:
+        image_bytes = await file.read()
+        await file.seek(0)
+        return await analyze_once(f"image:{_content_hash(image_bytes)}", analyze)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -0,0 +1,395 @@
+"""Service for crawling RSS/Atom feeds and sitemaps into the analysis pipeline."""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from lxml import etree
+
+from ..config.settings import settings
+from ..core.singleflight import SingleFlight
+from ..models.crawl_models import CrawlJob, CrawlResult
+from .executor import run_cpu_stage
+from .http_client import fetch_prefix, get_async_client
+from .scrape_cache import canonical_url
+
+# Default crawl history database
+CRAWLER_HISTORY_PATH = settings.CRAWLER_HISTORY_PATH or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "crawl_history.sqlite3"
+)
+
+# Namespace-agnostic selectors (RSS 1.0/2.0, Atom and sitemaps all use different namespaces)
+_RSS_LINKS = etree.XPath("//*[local-name()='item']/*[local-name()='link']/text()")
+_ATOM_LINKS = etree.XPath(
+    "//*[local-name()='entry']/*[local-name()='link'][not(@rel) or @rel='alternate']/@href"
+)
+_SITEMAP_PAGES = etree.XPath("//*[local-name()='urlset']/*[local-name()='url']/*[local-name()='loc']/text()")
+_SITEMAP_CHILDREN = etree.XPath(
+    "//*[local-name()='sitemapindex']/*[local-name()='sitemap']/*[local-name()='loc']/text()"
+)
+
+# Root elements of the documents parse_feed understands
+_FEED_ROOTS = {"rss", "RDF", "feed", "urlset", "sitemapindex"}
+
+_ROBOTS_MAX_BYTES = 512 * 1024
+
+
+def parse_feed(content: bytes, base_url: str) -> Tuple[List[str], List[str]]:
+    """
+    Extract article URLs from an RSS/Atom feed or a sitemap.
+
+    Args:
+        content: Raw feed or sitemap bytes (gzip-compressed sitemaps are accepted)
+        base_url: URL the document came from, for resolving relative links
+
+    Returns:
+        Tuple of (article URLs, nested sitemap URLs from a sitemap index)
+
+    Raises:
+        ValueError: If the document is not a feed or sitemap (e.g. an HTML page).
+    """
+    parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+    try:
+        if content[:2] == b"\x1f\x8b":
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            content = decompressor.decompress(content, settings.CRAWLER_MAX_FEED_BYTES)
+        root = etree.fromstring(content, parser=parser)
+    except (etree.XMLSyntaxError, zlib.error):
+        root = None
+    if root is None or etree.QName(root).localname not in _FEED_ROOTS:
+        raise ValueError(f"{base_url} is not an RSS/Atom feed or sitemap")
+
+    def absolute(links: List[str]) -> List[str]:
+        urls = (urljoin(base_url, link.strip()) for link in links if link.strip())
+        return [url for url in urls if url.startswith(('http://', 'https://'))]
+
+    articles = absolute(_RSS_LINKS(root) + _ATOM_LINKS(root) + _SITEMAP_PAGES(root))
+    return articles, absolute(_SITEMAP_CHILDREN(root))
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+def _interleave(urls: List[str]) -> List[str]:
+    """Round-robin the URLs across domains so one large site does not hold up the rest."""
+    by_domain: "OrderedDict[str, List[str]]" = OrderedDict()
+    for url in urls:
+        by_domain.setdefault(urlsplit(url).netloc.lower(), []).append(url)
+    queues = [list(reversed(domain_urls)) for domain_urls in by_domain.values()]
+    ordered = []
+    while queues:
+        for queue in queues:
+            ordered.append(queue.pop())
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+
+class RobotsCache:
+    """
+    Parsed robots.txt per origin, reused for settings.CRAWLER_ROBOTS_TTL_SECONDS.
+
+    Concurrent lookups for the same origin share one fetch. A missing
+    robots.txt (4xx) allows everything; 401/403 and server errors disallow
+    everything, as RFC 9309 recommends. At most settings.CRAWLER_MAX_DOMAINS
+    origins are kept; the least recently used are dropped first.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = settings.CRAWLER_ROBOTS_TTL_SECONDS if ttl is None else ttl
+        self.max_entries = max_entries or settings.CRAWLER_MAX_DOMAINS
+        self._entries: "OrderedDict[str, Tuple[float, RobotFileParser]]" = OrderedDict()
+        self._flights = SingleFlight()
+
+    async def _fetch(self, origin: str) -> RobotFileParser:
+        rules = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            _, body = await fetch_prefix(get_async_client("scraper"), rules.url, _ROBOTS_MAX_BYTES)
+            rules.parse(body.decode('utf-8', errors='replace').splitlines())
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if status in (401, 403) or status >= 500:
+                rules.disallow_all = True
+            else:
+                rules.allow_all = True
+        except httpx.RequestError:
+            rules.allow_all = True  # Unreachable host; the page fetch will fail on its own
+        self._entries[origin] = (time.monotonic() + self.ttl, rules)
+        self._entries.move_to_end(origin)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return rules
+
+    async def rules(self, url: str) -> RobotFileParser:
+        origin = _origin(url)
+        entry = self._entries.get(origin)
+        if entry is not None and time.monotonic() < entry[0]:
+            self._entries.move_to_end(origin)
+            return entry[1]
+        return await self._flights.do(origin, lambda: self._fetch(origin))
+
+    async def allowed(self, url: str) -> bool:
+        return (await self.rules(url)).can_fetch(settings.SCRAPER_USER_AGENT, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        delay = (await self.rules(url)).crawl_delay(settings.SCRAPER_USER_AGENT)
+        return float(delay) if delay is not None else None
+
+
+robots_cache = RobotsCache()
+
+
+class DomainThrottle:
+    """
+    Spaces requests to each domain at least `interval` seconds apart.
+
+    Each caller reserves the next free slot for its domain and sleeps until
+    then, so concurrent workers queue up politely without holding a lock.
+    Beyond settings.CRAWLER_MAX_DOMAINS domains, those whose slot has already
+    passed are forgotten, then the least recently used.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.CRAWLER_MAX_DOMAINS
+        self._next: "OrderedDict[str, float]" = OrderedDict()
+
+    def _evict(self, now: float):
+        for domain in [domain for domain, free_at in self._next.items() if free_at <= now]:
+            del self._next[domain]
+        while len(self._next) > self.max_entries:
+            self._next.popitem(last=False)
+
+    async def wait(self, url: str, interval: float):
+        domain = urlsplit(url).netloc.lower()
+        now = time.monotonic()
+        start = max(now, self._next.get(domain, now))
+        self._next[domain] = start + interval
+        self._next.move_to_end(domain)
+        if len(self._next) > self.max_entries:
+            self._evict(now)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class CrawlHistory:
+    """SQLite record of article URLs the crawler has analyzed, keyed by canonical URL."""
+
+    def __init__(self, path: str = CRAWLER_HISTORY_PATH):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS crawled (url TEXT PRIMARY KEY, verdict TEXT, crawled_at REAL NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _seen(self, urls: List[str]) -> Set[str]:
+        seen = set()
+        with self._lock:
+            db = self._db()
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                rows = db.execute(f"SELECT url FROM crawled WHERE url IN ({placeholders})", batch).fetchall()
+                seen.update(row[0] for row in rows)
+        return seen
+
+    def _add(self, url: str, verdict: Optional[str]):
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO crawled VALUES (?, ?, ?)", (url, verdict, time.time()))
+            db.commit()
+
+    async def seen(self, urls: List[str]) -> Set[str]:
+        """The subset of the (canonical) URLs already analyzed."""
+        return await asyncio.to_thread(self._seen, urls)
+
+    async def add(self, url: str, verdict: Optional[str] = None):
+        await asyncio.to_thread(self._add, url, verdict)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+crawl_history = CrawlHistory()
+
+
+class Crawler:
+    """
+    Discovers articles from feeds and sitemaps and analyzes the new ones.
+
+    Every request (feeds, sitemaps and articles) is checked against the
+    origin's robots.txt and spaced per domain by
+    settings.CRAWLER_DOMAIN_INTERVAL_SECONDS, or the robots.txt Crawl-delay
+    when that is longer. URLs are deduplicated by canonical form within the
+    job and against the crawl history, then interleaved across domains and
+    processed by settings.CRAWLER_CONCURRENCY workers, so the global number
+    of in-flight analyses stays capped while each domain is hit slowly.
+    """
+
+    def __init__(
+        self,
+        analyze: Callable[[str], Awaitable[CrawlResult]],
+        history: Optional[CrawlHistory] = None,
+        robots: Optional[RobotsCache] = None,
+        concurrency: Optional[int] = None,
+        domain_interval: Optional[float] = None,
+    ):
+        self.analyze = analyze
+        self.history = history or crawl_history
+        self.robots = robots or robots_cache
+        self.concurrency = concurrency or settings.CRAWLER_CONCURRENCY
+        self.domain_interval = settings.CRAWLER_DOMAIN_INTERVAL_SECONDS if domain_interval is None else domain_interval
+        self.throttle = DomainThrottle()
+
+    async def _polite(self, url: str):
+        """Wait for the domain's next request slot."""
+        delay = await self.robots.crawl_delay(url)
+        await self.throttle.wait(url, max(self.domain_interval, delay or 0.0))
+
+    async def _read_source(self, url: str, depth: int, job: CrawlJob) -> List[str]:
+        if not await self.robots.allowed(url):
+            job.errors.append(f"{url}: disallowed by robots.txt")
+            return []
+        await self._polite(url)
+        try:
+            _, content = await fetch_prefix(get_async_client("scraper"), url, settings.CRAWLER_MAX_FEED_BYTES)
+            articles, children = await run_cpu_stage("feed_parse", parse_feed, content, url)
+        except (httpx.HTTPError, ValueError) as e:
+            job.errors.append(f"{url}: {e}")
+            return []
+        if children and depth < settings.CRAWLER_MAX_SITEMAP_DEPTH:
+            nested = await asyncio.gather(*(self._read_source(child, depth + 1, job) for child in children))
+            for urls in nested:
+                articles.extend(urls)
+        return articles
+
+    async def discover(self, job: CrawlJob, max_articles: int) -> List[str]:
+        """
+        New, allowed article URLs from the job's sources, interleaved by domain.
+
+        Returns:
+            At most max_articles canonical URLs not in the crawl history
+        """
+        found = await asyncio.gather(*(self._read_source(source, 0, job) for source in job.sources))
+        candidates = list(dict.fromkeys(canonical_url(url) for urls in found for url in urls))
+        job.counts["discovered"] = len(candidates)
+
+        seen = await self.history.seen(candidates) if candidates else set()
+        job.counts["already_seen"] = len(seen)
+        fresh = [url for url in candidates if url not in seen]
+
+        allowed = await asyncio.gather(*(self.robots.allowed(url) for url in fresh))
+        job.counts["disallowed"] = allowed.count(False)
+        selected = _interleave([url for url, ok in zip(fresh, allowed) if ok])[:max_articles]
+        job.counts["queued"] = len(selected)
+        return selected
+
+    async def _crawl_one(self, url: str, job: CrawlJob):
+        await self._polite(url)
+        try:
+            result = await self.analyze(url)
+        except Exception as e:
+            job.counts["failed"] += 1
+            job.results.append(CrawlResult(url=url, error=str(e)))
+            return
+        job.counts["analyzed"] += 1
+        job.results.append(result)
+        await self.history.add(url, result.verdict)
+
+    async def run(self, job: CrawlJob, max_articles: Optional[int] = None) -> CrawlJob:
+        """
+        Discover and analyze the job's articles, updating the job as it goes.
+
+        Args:
+            job: The job to run; its counts and results are filled in
+            max_articles: Cap on new articles (default: settings.CRAWLER_MAX_ARTICLES)
+
+        Returns:
+            The finished job
+        """
+        job.started_at = datetime.now().isoformat()
+        try:
+            job.status = "discovering"
+            queue: asyncio.Queue = asyncio.Queue()
+            for url in await self.discover(job, max_articles or settings.CRAWLER_MAX_ARTICLES):
+                queue.put_nowait(url)
+
+            job.status = "crawling"
+
+            async def worker():
+                while not queue.empty():
+                    await self._crawl_one(queue.get_nowait(), job)
+
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, queue.qsize()))))
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.errors.append(str(e))
+            print(f"Crawl job {job.job_id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now().isoformat()
+        return job
+
+
+# Recent crawl jobs by id, oldest first, and the tasks still running
+crawl_jobs: "OrderedDict[str, CrawlJob]" = OrderedDict()
+_crawl_tasks: Set[asyncio.Task] = set()
+
+
+def start_crawl(
+    sources: List[str], analyze: Callable[[str], Awaitable[CrawlResult]], max_articles: Optional[int] = None
+) -> CrawlJob:
+    """
+    Start a crawl job in the background.
+
+    Args:
+        sources: Feed or sitemap URLs
+        analyze: Coroutine function analyzing one article URL
+        max_articles: Cap on new articles analyzed
+
+    Returns:
+        The job; poll crawl_jobs[job.job_id] for progress
+    """
+    job = CrawlJob(job_id=uuid.uuid4().hex, sources=sources)
+    crawl_jobs[job.job_id] = job
+    finished = [job_id for job_id, old in crawl_jobs.items() if old.finished_at]
+    for job_id in finished[:max(len(crawl_jobs) - settings.CRAWLER_MAX_JOBS, 0)]:
+        del crawl_jobs[job_id]
+
+    task = asyncio.create_task(Crawler(analyze).run(job, max_articles))
+    _crawl_tasks.add(task)
+    task.add_done_callback(_crawl_tasks.discard)
+    return job
+
+
+async def stop_crawls():
+    """Cancel running crawl jobs and close the crawl history."""
+    for task in list(_crawl_tasks):
+        task.cancel()
+    await asyncio.gather(*_crawl_tasks, return_exceptions=True)
+    crawl_history.close()
@@ -0,0 +1,153 @@
+"""Service for running CPU-bound pipeline stages off the event loop."""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Optional
+
+from ..config.settings import settings
+
+# Stages that may run in a process pool (settings.CPU_EXECUTOR_KIND = "process").
+# Their callables are module-level functions of plain, picklable data that
+# keep no state in the worker. All other stages run in the thread pool even
+# in process mode, because they read or update process-wide state that must
+# stay shared: the model registry and its memory-mapped arrays (inference),
+# learned extraction templates (parse), the IDF table (summarize), the
+# fact-check index (factcheck_index) and the per-request Document caches
+# (content_analysis, topics).
+PROCESS_SAFE_STAGES = frozenset({"clean", "ocr", "feed_parse", "evidence_extract", "evidence_similarity"})
+
+
+class CPUStageExecutor:
+    """
+    Dispatches named pipeline stages (cleaning, summarization, inference, OCR...)
+    to a thread or process pool so the event loop keeps serving I/O.
+
+    The pool kind and size come from settings. With a process pool, only the
+    stages in PROCESS_SAFE_STAGES go to worker processes; the rest use a
+    thread pool of the same size. Submissions are bounded by
+    settings.CPU_EXECUTOR_MAX_QUEUE: once that many stages are queued or
+    running, further callers wait for a free slot instead of piling work onto
+    the pool. Per-stage counters and timings are available from `stats()`.
+    """
+
+    def __init__(self, kind: Optional[str] = None, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.kind = (kind or settings.CPU_EXECUTOR_KIND).lower()
+        if self.kind not in ("thread", "process"):
+            raise ValueError(f"Unknown CPU executor kind: {self.kind}")
+        self.max_workers = max_workers or settings.CPU_EXECUTOR_WORKERS or os.cpu_count() or 1
+        self.max_queue = max_queue or settings.CPU_EXECUTOR_MAX_QUEUE
+        self._pool: Optional[Executor] = None
+        self._threads: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        self._stats: Dict[str, Dict] = {}
+
+    def _get_pool(self, stage: str) -> Executor:
+        """Return the pool for the stage, creating it on first use."""
+        if self.kind == "process" and stage in PROCESS_SAFE_STAGES:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cpu-stage")
+        return self._threads
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Return the queue-bounding semaphore for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_queue)
+        return self._slots
+
+    def _stage(self, stage: str) -> Dict:
+        if stage not in self._stats:
+            self._stats[stage] = {
+                "submitted": 0, "completed": 0, "failed": 0,
+                "waiting": 0, "in_flight": 0,
+                "total_ms": 0.0, "max_ms": 0.0,
+            }
+        return self._stats[stage]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of stages currently queued or running in the pool."""
+        return sum(s["in_flight"] for s in self._stats.values())
+
+    async def run(self, stage: str, fn: Callable, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the pool and return its result.
+
+        Args:
+            stage: Stage name used for statistics
+            fn: The callable to run (a picklable module-level function for
+                stages in PROCESS_SAFE_STAGES)
+
+        Raises:
+            Whatever fn raises.
+        """
+        stats = self._stage(stage)
+        stats["submitted"] += 1
+        slots = self._get_slots()
+
+        stats["waiting"] += 1
+        try:
+            await slots.acquire()
+        finally:
+            stats["waiting"] -= 1
+
+        stats["in_flight"] += 1
+        start = time.perf_counter()
+        try:
+            call = partial(fn, *args, **kwargs) if kwargs else partial(fn, *args)
+            result = await asyncio.get_running_loop().run_in_executor(self._get_pool(stage), call)
+        except Exception:
+            stats["failed"] += 1
+            raise
+        else:
+            stats["completed"] += 1
+            return result
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stats["in_flight"] -= 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            slots.release()
+
+    def stats(self) -> Dict:
+        """Pool configuration plus per-stage counters and timings."""
+        stages = {}
+        for name, s in self._stats.items():
+            finished = s["completed"] + s["failed"]
+            stages[name] = {
+                **s,
+                "total_ms": round(s["total_ms"], 2),
+                "max_ms": round(s["max_ms"], 2),
+                "avg_ms": round(s["total_ms"] / finished, 2) if finished else 0.0,
+            }
+        return {
+            "kind": self.kind,
+            "process_stages": sorted(PROCESS_SAFE_STAGES) if self.kind == "process" else [],
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "stages": stages,
+        }
+
+    def shutdown(self):
+        """Stop the pools; new ones are created if the executor is used again."""
+        for pool in (self._pool, self._threads):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = self._threads = None
+
+
+cpu_executor = CPUStageExecutor()
+
+
+async def run_cpu_stage(stage: str, fn: Callable, *args, **kwargs):
+    """Run a CPU-bound stage on the shared executor."""
+    return await cpu_executor.run(stage, fn, *args, **kwargs)
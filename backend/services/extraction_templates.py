@@ -0,0 +1,148 @@
+"""Service for remembering, per domain, which selector yields the article body."""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from ..config.settings import settings
+
+# Default template file
+EXTRACTION_TEMPLATES_PATH = settings.EXTRACTION_TEMPLATES_PATH or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "extraction_templates.json"
+)
+
+# Weight of the newest body length in a template's running average
+_AVERAGE_WEIGHT = 0.2
+
+
+def template_domain(url: str) -> Optional[str]:
+    """Lowercased host without a leading "www.", or None for URLs without a host."""
+    host = (urlsplit(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+class TemplateStore:
+    """
+    Per-domain article body selectors with a running quality record.
+
+    News sites reuse one layout per domain, so once a page has shown which
+    element holds the article, later pages from that domain can go straight
+    to it. Each template keeps the average body length it has produced; a
+    body much shorter than that (or below settings.EXTRACTION_TEMPLATE_MIN_CHARS)
+    counts as a failure, and after settings.EXTRACTION_TEMPLATE_MAX_FAILURES
+    consecutive failures the template is dropped so the next page re-learns it.
+
+    Templates are kept in memory (least recently used domains are dropped
+    beyond settings.EXTRACTION_TEMPLATES_MAX_DOMAINS) and written to a JSON
+    file every settings.EXTRACTION_TEMPLATES_SAVE_EVERY changes and on shutdown.
+    """
+
+    def __init__(self, path: str = EXTRACTION_TEMPLATES_PATH, max_domains: Optional[int] = None):
+        self.path = path
+        self.max_domains = max_domains or settings.EXTRACTION_TEMPLATES_MAX_DOMAINS
+        self._templates: Optional["OrderedDict[str, Dict]"] = None
+        self._lock = threading.Lock()
+        self._changes = 0
+        self.counters = {"hits": 0, "failures": 0, "learned": 0, "relearned": 0}
+
+    def _load(self) -> "OrderedDict[str, Dict]":
+        if self._templates is None:
+            self._templates = OrderedDict()
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._templates.update(json.load(f))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable extraction templates {self.path}: {e}")
+        return self._templates
+
+    def selector(self, domain: str) -> Optional[str]:
+        """The domain's learned selector, if any."""
+        with self._lock:
+            template = self._load().get(domain)
+            if template is None:
+                return None
+            self._templates.move_to_end(domain)
+            return template["selector"]
+
+    def accept(self, domain: str, chars: int) -> bool:
+        """
+        Judge a body extracted with the domain's template and record the outcome.
+
+        Args:
+            domain: The page's domain
+            chars: Length of the extracted body
+
+        Returns:
+            True if the body is good enough to use; otherwise the caller
+            should fall back to generic extraction
+        """
+        with self._lock:
+            template = self._load().get(domain)
+            if template is None:
+                return False
+            good = (
+                chars >= settings.EXTRACTION_TEMPLATE_MIN_CHARS
+                and chars >= settings.EXTRACTION_TEMPLATE_QUALITY_RATIO * template["avg_chars"]
+            )
+            if good:
+                self.counters["hits"] += 1
+                template["hits"] += 1
+                template["failures"] = 0
+                template["avg_chars"] += _AVERAGE_WEIGHT * (chars - template["avg_chars"])
+            else:
+                self.counters["failures"] += 1
+                template["failures"] += 1
+                if template["failures"] >= settings.EXTRACTION_TEMPLATE_MAX_FAILURES:
+                    del self._templates[domain]
+                    self.counters["relearned"] += 1
+            self._changed()
+            return good
+
+    def learn(self, domain: str, selector: str, chars: int):
+        """Store the selector that produced a body of `chars` characters for the domain."""
+        with self._lock:
+            templates = self._load()
+            templates[domain] = {"selector": selector, "avg_chars": float(chars), "hits": 0, "failures": 0}
+            templates.move_to_end(domain)
+            while len(templates) > self.max_domains:
+                templates.popitem(last=False)
+            self.counters["learned"] += 1
+            self._changed()
+
+    def _changed(self):
+        self._changes += 1
+        if self._changes >= settings.EXTRACTION_TEMPLATES_SAVE_EVERY:
+            self._save()
+
+    def _save(self):
+        if self._templates is None or not self._changes:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._templates, f)
+            os.replace(temp_path, self.path)
+            self._changes = 0
+        except OSError as e:
+            print(f"Error saving extraction templates to {self.path}: {e}")
+
+    def save(self):
+        """Write pending changes to disk."""
+        with self._lock:
+            self._save()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            domains = len(self._load())
+        return {"path": self.path, "domains": domains, "max_domains": self.max_domains, **self.counters}
+
+
+template_store = TemplateStore()
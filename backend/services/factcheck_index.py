@@ -0,0 +1,273 @@
+"""Service for a local BM25 index over fact-check and news articles."""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..config.settings import settings
+from .feature_hashing import tokenize
+from .text_processor import STOP_WORDS
+
+# Directory holding the index segments and manifest
+FACTCHECK_INDEX_PATH = settings.FACTCHECK_INDEX_PATH or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "factcheck_index"
+)
+
+MANIFEST_NAME = "manifest.json"
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def index_terms(text: str) -> List[str]:
+    """Lowercased word tokens with stop words removed."""
+    return [token for token in tokenize(text) if token not in STOP_WORDS]
+
+
+class Segment:
+    """
+    One immutable batch of indexed documents.
+
+    On disk a segment is a directory with:
+      - lexicon.json: term -> [offset, length] into the postings arrays
+      - doc_ids.npy / term_freqs.npy: postings, grouped by term (memory-mapped)
+      - doc_lengths.npy: indexed tokens per document
+      - docs.jsonl: url, title and snippet of each document
+    """
+
+    def __init__(self, path: str, lexicon: Dict[str, List[int]], doc_ids: np.ndarray,
+                 term_freqs: np.ndarray, doc_lengths: np.ndarray, docs: List[Dict]):
+        self.path = path
+        self.lexicon = lexicon
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.docs = docs
+
+    @classmethod
+    def write(cls, path: str, documents: List[Dict]) -> "Segment":
+        """Index documents (dicts with url, title, snippet and optional text) into a new segment."""
+        postings: Dict[str, List[tuple]] = {}
+        doc_lengths = []
+        docs = []
+        for doc_id, document in enumerate(documents):
+            terms = index_terms(f"{document.get('title', '')} {document.get('text') or document.get('snippet', '')}")
+            doc_lengths.append(len(terms))
+            for term, freq in Counter(terms).items():
+                postings.setdefault(term, []).append((doc_id, freq))
+            snippet = document.get('snippet') or ' '.join((document.get('text') or '').split())
+            docs.append({
+                "url": document["url"],
+                "title": document.get("title") or document["url"],
+                "snippet": snippet[:settings.EVIDENCE_SNIPPET_CHARS],
+            })
+
+        lexicon, doc_ids, term_freqs = {}, [], []
+        for term in sorted(postings):
+            lexicon[term] = [len(doc_ids), len(postings[term])]
+            doc_ids.extend(doc_id for doc_id, _ in postings[term])
+            term_freqs.extend(freq for _, freq in postings[term])
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "doc_ids.npy"), np.asarray(doc_ids, dtype=np.int32))
+        np.save(os.path.join(path, "term_freqs.npy"), np.asarray(term_freqs, dtype=np.float32))
+        np.save(os.path.join(path, "doc_lengths.npy"), np.asarray(doc_lengths, dtype=np.float32))
+        with open(os.path.join(path, "lexicon.json"), 'w', encoding='utf-8') as f:
+            json.dump(lexicon, f)
+        with open(os.path.join(path, "docs.jsonl"), 'w', encoding='utf-8') as f:
+            for doc in docs:
+                f.write(json.dumps(doc) + "\n")
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str) -> "Segment":
+        """Open a segment with its postings memory-mapped."""
+        with open(os.path.join(path, "lexicon.json"), 'r', encoding='utf-8') as f:
+            lexicon = json.load(f)
+        with open(os.path.join(path, "docs.jsonl"), 'r', encoding='utf-8') as f:
+            docs = [json.loads(line) for line in f if line.strip()]
+        return cls(
+            path,
+            lexicon,
+            np.load(os.path.join(path, "doc_ids.npy"), mmap_mode='r'),
+            np.load(os.path.join(path, "term_freqs.npy"), mmap_mode='r'),
+            np.load(os.path.join(path, "doc_lengths.npy")),
+            docs,
+        )
+
+    def postings(self, term: str):
+        """(doc_ids, term_freqs) for a term, or None if it does not occur."""
+        entry = self.lexicon.get(term)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self.doc_ids[offset:offset + length], self.term_freqs[offset:offset + length]
+
+
+class FactCheckIndex:
+    """
+    Append-only BM25 index made of immutable segments.
+
+    `manifest.json` lists the live segments; appending writes a new segment
+    and then swaps the manifest atomically, so readers never see a partial
+    update. Collection statistics (document count, average length, document
+    frequencies) are combined across segments at query time, so scores match
+    a single index built from all documents.
+    """
+
+    def __init__(self, path: str, segments: List[Segment]):
+        self.path = path
+        self.segments = segments
+        self._update_stats()
+
+    def _update_stats(self):
+        segments = self.segments
+        self.n_docs = sum(len(segment.docs) for segment in segments)
+        total_length = sum(float(segment.doc_lengths.sum()) for segment in segments)
+        self.avg_doc_length = max(total_length / self.n_docs, 1.0) if self.n_docs else 1.0
+        self.urls = {doc["url"] for segment in segments for doc in segment.docs}
+
+    @staticmethod
+    def manifest_path(path: str) -> str:
+        return os.path.join(path, MANIFEST_NAME)
+
+    @classmethod
+    def open(cls, path: str = FACTCHECK_INDEX_PATH) -> "FactCheckIndex":
+        """Open an index directory; a missing index opens empty."""
+        try:
+            with open(cls.manifest_path(path), 'r', encoding='utf-8') as f:
+                names = json.load(f)["segments"]
+        except FileNotFoundError:
+            names = []
+        return cls(path, [Segment.open(os.path.join(path, name)) for name in names])
+
+    def append(self, documents: Iterable[Dict]) -> int:
+        """
+        Index new documents as a new segment, skipping URLs already indexed.
+
+        Returns:
+            Number of documents added
+        """
+        fresh, seen = [], set(self.urls)
+        for document in documents:
+            if document.get("url") and document["url"] not in seen:
+                seen.add(document["url"])
+                fresh.append(document)
+        if not fresh:
+            return 0
+
+        names = [os.path.basename(segment.path) for segment in self.segments]
+        name = f"segment-{len(names) + 1:05d}"
+        segment = Segment.write(os.path.join(self.path, name), fresh)
+
+        tmp_path = f"{self.manifest_path(self.path)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"segments": names + [name]}, f)
+        os.replace(tmp_path, self.manifest_path(self.path))
+
+        self.segments = self.segments + [segment]
+        self._update_stats()
+        return len(fresh)
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.0) -> List[Dict]:
+        """
+        Rank documents against the query with BM25.
+
+        Args:
+            query: Free-text query (typically the article title)
+            limit: Maximum number of results
+            min_score: Results scoring below this are dropped
+
+        Returns:
+            List of evidence dictionaries with url, title, snippet and bm25_score
+        """
+        terms = list(dict.fromkeys(index_terms(query)))
+        if not terms or not self.n_docs:
+            return []
+
+        per_segment = [[segment.postings(term) for term in terms] for segment in self.segments]
+        doc_freqs = np.zeros(len(terms))
+        for postings in per_segment:
+            for i, entry in enumerate(postings):
+                if entry is not None:
+                    doc_freqs[i] += len(entry[0])
+        idf = np.log(1.0 + (self.n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+
+        candidates = []
+        for segment, postings in zip(self.segments, per_segment):
+            scores = np.zeros(len(segment.docs))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * segment.doc_lengths / self.avg_doc_length)
+            for i, entry in enumerate(postings):
+                if entry is None:
+                    continue
+                doc_ids, freqs = entry
+                scores[doc_ids] += idf[i] * freqs * (BM25_K1 + 1.0) / (freqs + norm[doc_ids])
+            top = np.flatnonzero(scores > max(min_score, 0.0))
+            if len(top) > limit:
+                top = top[np.argpartition(-scores[top], limit - 1)[:limit]]
+            candidates.extend((float(scores[doc_id]), segment.docs[doc_id]) for doc_id in top)
+
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return [{**doc, "bm25_score": round(score, 4)} for score, doc in candidates[:limit]]
+
+
+_index: Optional[FactCheckIndex] = None
+_index_mtime: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def get_factcheck_index(path: str = FACTCHECK_INDEX_PATH) -> FactCheckIndex:
+    """Return the process-wide index, reopening it when its manifest changes."""
+    global _index, _index_mtime
+    try:
+        mtime = os.path.getmtime(FactCheckIndex.manifest_path(path))
+    except OSError:
+        mtime = None
+    if _index is None or _index.path != path or mtime != _index_mtime:
+        with _index_lock:
+            if _index is None or _index.path != path or mtime != _index_mtime:
+                _index = FactCheckIndex.open(path)
+                _index_mtime = mtime
+    return _index
+
+
+def _read_documents(paths: List[str]) -> Iterable[Dict]:
+    for corpus_path in paths:
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main():
+    """Command-line entry point for building and extending the fact-check index."""
+    parser = argparse.ArgumentParser(description="Build the local BM25 fact-check index.")
+    parser.add_argument("command", choices=["build", "append"],
+                        help="build: start a new index; append: add a segment to the existing one")
+    parser.add_argument("corpus", nargs="+", help="JSON-lines files of articles (url, title, snippet and/or text)")
+    parser.add_argument("--output", default=FACTCHECK_INDEX_PATH, help="Index directory")
+    args = parser.parse_args()
+
+    if args.command == "build" and os.path.isdir(args.output):
+        # Offline rebuild: drop the manifest and every old segment
+        for name in os.listdir(args.output):
+            path = os.path.join(args.output, name)
+            if name == MANIFEST_NAME:
+                os.remove(path)
+            elif name.startswith("segment-") and os.path.isdir(path):
+                shutil.rmtree(path)
+    index = FactCheckIndex.open(args.output)
+    added = index.append(_read_documents(args.corpus))
+    print(f"Added {added} documents; index at {args.output} has {index.n_docs} documents "
+          f"in {len(index.segments)} segments")
+
+
+if __name__ == "__main__":
+    main()
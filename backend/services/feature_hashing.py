@@ -0,0 +1,51 @@
+"""Service for hashing-trick text featurization shared by models and scorers."""
+
+import re
+import zlib
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+# Same token definition as scikit-learn's default word analyzer
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def tokenize(text: str, lowercase: bool = True) -> List[str]:
+    """Split text into word tokens of two or more characters."""
+    if lowercase:
+        text = text.lower()
+    return TOKEN_PATTERN.findall(text)
+
+
+def word_ngrams(tokens: List[str], ngram_range: Tuple[int, int] = (1, 1)) -> List[str]:
+    """Build space-joined word n-grams the way scikit-learn's vectorizers do."""
+    min_n, max_n = ngram_range
+    if max_n == 1:
+        return list(tokens)
+    grams = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), max_n + 1):
+        grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def hash_term(term: str, n_features: int) -> int:
+    """Map a term to a bucket with a hash that is stable across processes (unlike hash())."""
+    return zlib.crc32(term.encode("utf-8")) % n_features
+
+
+def hash_terms(terms: Iterable[str], n_features: int) -> np.ndarray:
+    """Bucket indices for a sequence of terms."""
+    return np.fromiter((zlib.crc32(t.encode("utf-8")) % n_features for t in terms), dtype=np.int64)
+
+
+def bucket_counts(terms: Iterable[str], n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash terms and count them.
+
+    Returns:
+        Tuple of (unique bucket indices, counts) - a sparse term-frequency vector
+    """
+    buckets = hash_terms(terms, n_features)
+    if buckets.size == 0:
+        return buckets, buckets
+    return np.unique(buckets, return_counts=True)
@@ -0,0 +1,350 @@
+"""Service for shared, pooled asynchronous HTTP clients."""
+
+import asyncio
+import importlib.util
+import ipaddress
+import socket
+import ssl
+import time
+import urllib.request
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from ..config.settings import settings
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_client_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class DNSCache:
+    """
+    Caches getaddrinfo results for settings.DNS_CACHE_TTL_SECONDS.
+
+    Scraping many articles from the same few news sites otherwise repeats a
+    DNS lookup for every new connection. At most settings.DNS_CACHE_MAX_ENTRIES
+    hosts are kept; the least recently used are dropped first.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = settings.DNS_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.max_entries = max_entries or settings.DNS_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, List[str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """IP addresses for host, from the cache when fresh."""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        entry = self._entries.get((host, port))
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end((host, port))
+            return entry[1]
+        self.misses += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        self._entries.move_to_end((host, port))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return addresses
+
+    def forget(self, host: str, port: int):
+        self._entries.pop((host, port), None)
+
+
+dns_cache = DNSCache()
+
+
+class _CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that connects to addresses from the DNS cache (TLS still uses the hostname for SNI)."""
+
+    def __init__(self, cache: DNSCache):
+        self._backend = httpcore.AnyIOBackend()
+        self._cache = cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addresses = await self._cache.resolve(host, port)
+        for i, address in enumerate(addresses):
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                if i == len(addresses) - 1:
+                    # Every cached address failed; resolve afresh next time
+                    self._cache.forget(host, port)
+                    raise
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def _ssl_context() -> ssl.SSLContext:
+    """TLS settings shared by the client and the DNS-caching transport."""
+    context = httpx.create_ssl_context(verify=settings.HTTP_VERIFY_TLS, trust_env=settings.HTTP_TRUST_ENV)
+    if settings.HTTP_CLIENT_CERT:
+        context.load_cert_chain(settings.HTTP_CLIENT_CERT)
+    return context
+
+
+# httpcore errors and their httpx equivalents, most specific first
+_EXCEPTIONS = [
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+]
+
+
+def _httpx_error(exc: Exception, request: httpx.Request) -> Optional[httpx.HTTPError]:
+    """The httpx equivalent of an httpcore error, carrying the request like httpx's own transport errors."""
+    for core_type, httpx_type in _EXCEPTIONS:
+        if isinstance(exc, core_type):
+            return httpx_type(str(exc), request=request)
+    return None
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    """httpcore response body as an httpx stream, with errors translated."""
+
+    def __init__(self, stream, request: httpx.Request):
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except Exception as exc:
+            error = _httpx_error(exc, self._request)
+            if error is None:
+                raise
+            raise error from exc
+
+    async def aclose(self):
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class _CachedDNSTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an httpcore connection pool that resolves hosts
+    through `dns_cache`.
+
+    httpx.AsyncHTTPTransport has no way to pass httpcore a network backend,
+    so this small transport owns the pool itself using only public httpx and
+    httpcore APIs.
+    """
+
+    def __init__(self, http2: bool, limits: httpx.Limits, ssl_context: ssl.SSLContext, cache: DNSCache):
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=ssl_context,
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=_CachedDNSBackend(cache),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self._pool.handle_async_request(core_request)
+        except Exception as exc:
+            error = _httpx_error(exc, request)
+            if error is None:
+                raise
+            raise error from exc
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream, request),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._pool.aclose()
+
+
+def _transport(http2: bool) -> Optional[_CachedDNSTransport]:
+    """
+    Pooled transport resolving through `dns_cache`, or None (httpx default).
+
+    The httpx default is used when the cache is disabled, and when proxies
+    are configured in the environment (with HTTP_TRUST_ENV), since the proxy
+    then does the resolving and httpx applies proxies only to its own
+    transports.
+    """
+    if settings.DNS_CACHE_TTL_SECONDS <= 0:
+        return None
+    if settings.HTTP_TRUST_ENV and urllib.request.getproxies():
+        return None
+    return _CachedDNSTransport(http2, _limits(), _ssl_context(), dns_cache)
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """
+    Build a pooled AsyncClient from settings.
+
+    Connect, read, write and pool-acquire timeouts are set separately, HTTP/2
+    is negotiated when enabled and h2 is installed, TLS verification follows
+    settings.HTTP_VERIFY_TLS / HTTP_CLIENT_CERT, and hostnames resolve
+    through the shared DNS cache.
+    """
+    http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+    return httpx.AsyncClient(
+        headers={"User-Agent": settings.SCRAPER_USER_AGENT},
+        limits=_limits(),
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            read=settings.HTTP_READ_TIMEOUT_SECONDS,
+            pool=settings.HTTP_POOL_TIMEOUT_SECONDS,
+        ),
+        http2=http2,
+        verify=_ssl_context(),
+        trust_env=settings.HTTP_TRUST_ENV,
+        transport=_transport(http2),
+        follow_redirects=True,
+    )
+
+
+def get_async_client(name: str = "default") -> httpx.AsyncClient:
+    """
+    Return the named shared AsyncClient, creating it on first use.
+
+    One client per name is kept for the lifetime of the application so
+    connections are pooled and kept alive between requests. Clients are bound
+    to the event loop that created them; a different loop gets a fresh client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(name)
+    if client is None or client.is_closed or _client_loops.get(name) is not loop:
+        client = create_async_client()
+        _clients[name] = client
+        _client_loops[name] = loop
+    return client
+
+
+async def start_async_clients(*names: str):
+    """Create the named clients up front (at application startup) so the first requests do not pay for it."""
+    for name in names:
+        get_async_client(name)
+
+
+async def close_async_clients():
+    """Close every shared client owned by the running loop."""
+    loop = asyncio.get_running_loop()
+    for name in list(_clients):
+        client = _clients.pop(name)
+        if _client_loops.pop(name, None) is loop and not client.is_closed:
+            await client.aclose()
+
+
+class HostLimiter:
+    """
+    Caps concurrent requests per host (httpx only limits the pool as a whole).
+
+    One semaphore is kept per (event loop, host). Beyond `max_hosts` entries
+    the least recently used idle ones are dropped; semaphores that are held or
+    waited on are kept so the cap still holds for their host.
+    """
+
+    def __init__(self, per_host: Optional[int] = None, max_hosts: Optional[int] = None):
+        self.per_host = per_host or settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        self.max_hosts = max_hosts or settings.HTTP_HOST_LIMITER_MAX_HOSTS
+        # key -> [semaphore, number of holders and waiters]
+        self._semaphores: "OrderedDict[tuple, list]" = OrderedDict()
+
+    def _evict_idle(self):
+        """Make room for one more entry by dropping least recently used idle ones."""
+        excess = len(self._semaphores) + 1 - self.max_hosts
+        for key in [key for key, (_, users) in self._semaphores.items() if not users][:max(excess, 0)]:
+            del self._semaphores[key]
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        """Hold one of the host's slots for the duration of the block."""
+        key = (asyncio.get_running_loop(), urlsplit(url).netloc.lower())
+        entry = self._semaphores.get(key)
+        if entry is None:
+            self._evict_idle()
+            entry = self._semaphores[key] = [asyncio.Semaphore(self.per_host), 0]
+        self._semaphores.move_to_end(key)
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+
+
+host_limiter = HostLimiter()
+
+
+async def fetch_prefix(client: httpx.AsyncClient, url: str, max_bytes: int, **kwargs) -> Tuple[httpx.Response, bytes]:
+    """
+    GET a URL but read at most max_bytes of the body.
+
+    The connection is released as soon as the prefix is read.
+
+    Returns:
+        Tuple of (response with status and headers, body prefix)
+
+    Raises:
+        httpx.HTTPError: If the request fails or returns an error status.
+    """
+    async with host_limiter.limit(url):
+        async with client.stream("GET", url, **kwargs) as response:
+            response.raise_for_status()
+            chunks, size = [], 0
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes:
+                    break
+    return response, b"".join(chunks)[:max_bytes]
@@ -0,0 +1,214 @@
+"""Service for a persistent HTTP cache of scraped pages with conditional revalidation."""
+
+import asyncio
+import email.utils
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from ..config.settings import settings
+
+# Default cache database
+SCRAPE_CACHE_PATH = settings.SCRAPE_CACHE_PATH or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "scrape_cache.sqlite3"
+)
+
+# Query parameters that only track the visitor and never change the page
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref_src)$", re.IGNORECASE)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share a cache entry.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, sorts the remaining query and gives empty paths a "/".
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _TRACKING_PARAMS.match(k))
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def freshness_lifetime(headers: httpx.Headers) -> Optional[float]:
+    """
+    Seconds a response may be served without revalidation.
+
+    Uses Cache-Control max-age, then Expires, then settings.SCRAPE_CACHE_TTL_SECONDS.
+
+    Returns:
+        None when the response must not be stored (no-store)
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        return float(match.group(1))
+    expires = headers.get("expires")
+    if expires:
+        try:
+            return max(email.utils.parsedate_to_datetime(expires).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+    return settings.SCRAPE_CACHE_TTL_SECONDS
+
+
+class CachedPage(NamedTuple):
+    """A stored response body and what is needed to revalidate it."""
+    body: bytes
+    charset: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """
+    SQLite-backed cache of page bodies keyed by canonical URL.
+
+    Bodies are stored zlib-compressed together with their ETag and
+    Last-Modified validators. Fresh pages are served directly; stale pages
+    are revalidated with a conditional GET, and a 304 only extends their
+    lifetime. When the stored bytes exceed settings.SCRAPE_CACHE_MAX_BYTES the
+    least recently used entries are evicted. Blocking SQLite calls run in a
+    worker thread.
+    """
+
+    def __init__(self, path: str = SCRAPE_CACHE_PATH, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes or settings.SCRAPE_CACHE_MAX_BYTES
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " key TEXT PRIMARY KEY, body BLOB NOT NULL, charset TEXT, etag TEXT, last_modified TEXT,"
+                " expires_at REAL NOT NULL, last_access REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+            self._connection = connection
+        return self._connection
+
+    def _get(self, key: str) -> Optional[CachedPage]:
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT body, charset, etag, last_modified, expires_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE pages SET last_access = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+        body, charset, etag, last_modified, expires_at = row
+        return CachedPage(zlib.decompress(body), charset, etag, last_modified, expires_at)
+
+    def _put(self, key: str, body: bytes, charset: Optional[str], headers: httpx.Headers, lifetime: float):
+        compressed = zlib.compress(body, settings.SCRAPE_CACHE_COMPRESSION_LEVEL)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, compressed, charset, headers.get("etag"), headers.get("last-modified"),
+                 now + lifetime, now, len(compressed)),
+            )
+            self.counters["stores"] += 1
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection):
+        """Delete least recently used entries until the stored size fits."""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM pages ORDER BY last_access").fetchall():
+            db.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self.counters["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _touch(self, key: str, lifetime: float, headers: httpx.Headers):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "UPDATE pages SET expires_at = ?, last_access = ?,"
+                " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time() + lifetime, time.time(), headers.get("etag"), headers.get("last-modified"), key),
+            )
+            db.commit()
+
+    async def get(self, key: str) -> Optional[CachedPage]:
+        """Stored page for the key, fresh or not."""
+        return await asyncio.to_thread(self._get, key)
+
+    def record_hit(self):
+        self.counters["hits"] += 1
+
+    def record_miss(self):
+        self.counters["misses"] += 1
+
+    async def store(self, key: str, body: bytes, charset: Optional[str], headers: httpx.Headers):
+        """Store a 200 response body unless its headers forbid it."""
+        lifetime = freshness_lifetime(headers)
+        if lifetime is None or not body:
+            return
+        await asyncio.to_thread(self._put, key, body, charset, headers, lifetime)
+
+    async def revalidated(self, key: str, headers: httpx.Headers):
+        """Record a 304 Not Modified: the stored page gets a new lifetime."""
+        self.counters["revalidated"] += 1
+        lifetime = freshness_lifetime(headers)
+        await asyncio.to_thread(self._touch, key, lifetime or 0.0, headers)
+
+    def stats(self) -> Dict:
+        lookups = self.counters["hits"] + self.counters["revalidated"] + self.counters["misses"]
+        stats = {"path": self.path, "max_bytes": self.max_bytes, **self.counters}
+        stats["hit_ratio"] = round((lookups - self.counters["misses"]) / lookups, 3) if lookups else 0.0
+        with self._lock:
+            entries, size = self._db().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        stats.update(entries=entries, stored_bytes=size)
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+scrape_cache = ScrapeCache()
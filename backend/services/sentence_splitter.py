@@ -0,0 +1,98 @@
+"""Service for fast rule-based sentence segmentation."""
+
+import re
+from typing import Iterator, List, Optional, Tuple
+
+from nltk.tokenize import sent_tokenize
+
+from ..config.settings import settings
+
+# Lowercased tokens that end with a period without ending the sentence
+ABBREVIATIONS = frozenset({
+    # Titles and honorifics
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'rev', 'hon', 'gov', 'sen', 'rep',
+    'gen', 'col', 'lt', 'capt', 'sgt', 'cmdr', 'adm', 'pres', 'supt', 'insp',
+    # Organisations and addresses
+    'inc', 'ltd', 'co', 'corp', 'dept', 'univ', 'assn', 'bros', 'ave', 'blvd', 'rd', 'mt', 'ft',
+    # Months and days
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+    'mon', 'tue', 'tues', 'wed', 'thu', 'thur', 'thurs', 'fri', 'sat', 'sun',
+    # Latin and reference forms
+    'vs', 'etc', 'approx', 'est', 'fig', 'figs', 'no', 'nos', 'vol', 'vols', 'pp', 'ed', 'eds',
+    'al', 'cf', 'ca', 'viz',
+    # Dotted abbreviations, matched on their last segment's prefix
+    'e.g', 'i.e', 'u.s', 'u.k', 'u.n', 'a.m', 'p.m', 'ph.d',
+})
+
+# Sentence-final punctuation, optional closing quotes/brackets, whitespace, and
+# a sentence-initial character (optionally after an opening quote/bracket).
+_BOUNDARY = re.compile(r"([\w.]*?)([.!?]+)([\"'”’)\]]*)\s+(?=[\"'“‘(\[]*[A-Z0-9])")
+
+
+def _is_boundary(match: re.Match) -> bool:
+    """Decide whether a candidate punctuation run really ends the sentence."""
+    word, punctuation = match.group(1), match.group(2)
+    if '!' in punctuation or '?' in punctuation or len(punctuation) > 1:
+        return True
+    token = word.lower().rstrip('.')
+    if token in ABBREVIATIONS:
+        return False
+    # Single-letter initials ("J. Smith") and dotted acronyms ("U.S.") rarely end a sentence
+    if len(token) == 1 and token.isalpha():
+        return False
+    if '.' in token and all(len(part) == 1 for part in token.split('.')):
+        return False
+    return True
+
+
+def iter_sentence_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) character offsets of each sentence, lazily.
+
+    Offsets exclude surrounding whitespace, so text[start:end] is the sentence.
+    """
+    start = 0
+    length = len(text)
+    while start < length and text[start].isspace():
+        start += 1
+    for match in _BOUNDARY.finditer(text):
+        if match.start(2) < start or not _is_boundary(match):
+            continue
+        end = match.end(3)
+        if end > start:
+            yield start, end
+        start = match.end()
+    end = len(text.rstrip())
+    if end > start:
+        yield start, end
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """List of (start, end) offsets of each sentence."""
+    return list(iter_sentence_spans(text))
+
+
+def iter_sentences(text: str) -> Iterator[str]:
+    """Yield sentences one at a time without building the full list."""
+    for start, end in iter_sentence_spans(text):
+        yield text[start:end]
+
+
+def split_sentences(text: str, segmenter: Optional[str] = None) -> List[str]:
+    """
+    Split text into sentences with the configured segmenter.
+
+    Args:
+        text: The text to split
+        segmenter: "regex" (default, see settings.SENTENCE_SEGMENTER) or "punkt"
+
+    Returns:
+        List of sentence strings
+    """
+    segmenter = (segmenter or settings.SENTENCE_SEGMENTER).lower()
+    if segmenter == "punkt":
+        try:
+            return sent_tokenize(text)
+        except LookupError as e:
+            print(f"Punkt sentence tokenizer unavailable: {e}. Falling back to regex segmenter.")
+    return list(iter_sentences(text))
@@ -0,0 +1,52 @@
+"""Service for batched claim-to-evidence similarity over hashed TF-IDF vectors."""
+
+from typing import List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+from .feature_hashing import hash_terms
+from .text_processor import IdfTable, get_idf_table, sentence_terms
+
+
+def hashed_tfidf_matrix(texts: List[str], idf_table: IdfTable) -> csr_matrix:
+    """
+    L2-normalized TF-IDF rows for the texts, in the IDF table's hashed feature space.
+
+    Features are the summarizer's (stop-word-filtered unigrams and bigrams), so
+    nothing is fitted per call. Terms are weighted by corpus IDF once the table
+    is ready, and by raw term frequency before that.
+    """
+    term_buckets = [hash_terms(sentence_terms(text), idf_table.n_features) for text in texts]
+    rows = np.repeat(np.arange(len(texts)), [len(buckets) for buckets in term_buckets])
+    cols = np.concatenate(term_buckets) if term_buckets else np.empty(0, dtype=np.int64)
+    matrix = csr_matrix(
+        (np.ones(len(cols), dtype=np.float64), (rows, cols)),
+        shape=(len(texts), idf_table.n_features),
+    )
+    matrix.sum_duplicates()
+    if idf_table.ready:
+        matrix.data *= idf_table.idf(matrix.indices)
+    return normalize(matrix, norm="l2", copy=False)
+
+
+def claim_evidence_similarity(claim: str, snippets: List[str], idf_table: Optional[IdfTable] = None) -> np.ndarray:
+    """
+    Cosine similarity between a claim and each evidence text.
+
+    All texts are vectorized into one sparse matrix and scored with a single
+    sparse matrix-vector product.
+
+    Args:
+        claim: Claim text (title and summarized body)
+        snippets: Evidence texts (title and snippet of each source)
+        idf_table: IDF weights (default: the process-wide table)
+
+    Returns:
+        Array of similarities in [0, 1], one per snippet
+    """
+    if not snippets:
+        return np.zeros(0)
+    matrix = hashed_tfidf_matrix([claim] + list(snippets), idf_table or get_idf_table())
+    return np.asarray((matrix[1:] @ matrix[0].T).todense()).ravel()
@@ -1,21 +1,276 @@
 """Service for extractive text summarization using TF-IDF."""
 
+import argparse
+import heapq
+import os
 import re
+import threading
+from contextlib import contextmanager
+from itertools import chain
+from typing import Iterable, List, Optional
+
 import nltk
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize
 from ..config.settings import settings
+from .feature_hashing import tokenize, word_ngrams, hash_terms
+from .sentence_splitter import split_sentences, iter_sentences
+from ..core.document import Document
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are only serialized within the process
+    fcntl = None
+
+# Sentences scored per numpy call in streaming mode
+_STREAM_CHUNK_SIZE = 64
+
+# Path to the corpus-level document frequency table
+IDF_TABLE_PATH = settings.IDF_TABLE_PATH or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "idf_table.npz"
+)
+
+
+def _load_stop_words() -> frozenset:
+    """English stop words from NLTK, or scikit-learn's list if the NLTK corpus is missing."""
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        return frozenset(ENGLISH_STOP_WORDS)
+
+
+# Built once at import instead of on every summarization
+STOP_WORDS = _load_stop_words()
+
+
+def sentence_terms(sentence: str) -> List[str]:
+    """Unigrams and bigrams of a sentence after stop word removal (the summarizer's features)."""
+    tokens = [token for token in tokenize(sentence) if token not in STOP_WORDS]
+    return word_ngrams(tokens, (1, 2))
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive inter-process lock held on a side file for the duration of the block."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class IdfTable:
+    """
+    Corpus-level document frequencies over hashed term buckets.
+
+    The table is a single uint32 array of per-bucket document frequencies plus
+    the document count, stored as an .npz file. It is built from a reference
+    corpus (see main()) and loaded once per process. With
+    settings.IDF_UPDATE_FROM_ANALYSES it is also updated incrementally as
+    articles are analysed. IDF uses the same smoothed formula as scikit-learn.
+    """
+
+    def __init__(self, df: np.ndarray, n_docs: int = 0, path: Optional[str] = None):
+        self.df = df
+        self.n_docs = int(n_docs)
+        self.n_features = len(df)
+        self.path = path
+        # Counts added since the last save, merged into the file on save
+        self._pending_df = np.zeros(self.n_features, dtype=np.uint32)
+        self._pending_docs = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def empty(cls, n_features: int = 2 ** 18, path: Optional[str] = None) -> "IdfTable":
+        return cls(np.zeros(n_features, dtype=np.uint32), 0, path)
+
+    @classmethod
+    def load(cls, path: str = IDF_TABLE_PATH) -> "IdfTable":
+        """Load a table from disk, or start an empty one if the file does not exist."""
+        if not os.path.exists(path):
+            return cls.empty(settings.IDF_TABLE_FEATURES, path)
+        with np.load(path) as data:
+            return cls(data["df"].astype(np.uint32), int(data["n_docs"]), path)
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough documents have been seen for the table to be trusted."""
+        return self.n_docs >= settings.IDF_MIN_DOCUMENTS
+
+    def idf(self, buckets: np.ndarray) -> np.ndarray:
+        """Smoothed IDF for the given buckets: ln((1 + N) / (1 + df)) + 1."""
+        return np.log((1.0 + self.n_docs) / (1.0 + self.df[buckets])) + 1.0
+
+    def add_document(self, terms: Iterable[str]):
+        """Count one document's distinct terms; persists every settings.IDF_SAVE_EVERY documents."""
+        self.add_buckets(np.unique(hash_terms(terms, self.n_features)))
+
+    def add_buckets(self, buckets: np.ndarray):
+        """Count one document given its distinct term buckets."""
+        with self._lock:
+            self.df[buckets] += 1
+            self._pending_df[buckets] += 1
+            self.n_docs += 1
+            self._pending_docs += 1
+            should_save = self.path and self._pending_docs >= settings.IDF_SAVE_EVERY
+        if should_save:
+            self.save()
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the table atomically.
+
+        When saving to the file the table was loaded from, the file is re-read
+        under an exclusive file lock and only this table's unsaved counts are
+        added to it, so several processes sharing the file (a process pool or
+        uvicorn workers) do not overwrite each other's updates.
+        """
+        path = path or self.path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock, _file_lock(f"{path}.lock"):
+            if path == self.path and os.path.exists(path):
+                with np.load(path) as data:
+                    disk_df, disk_docs = data["df"].astype(np.uint32), int(data["n_docs"])
+                if len(disk_df) == self.n_features:
+                    self.df = disk_df + self._pending_df
+                    self.n_docs = disk_docs + self._pending_docs
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, df=self.df, n_docs=np.int64(self.n_docs))
+            os.replace(tmp_path, path)
+            self._pending_df[:] = 0
+            self._pending_docs = 0
+
+
+_idf_table: Optional[IdfTable] = None
+_idf_table_lock = threading.Lock()
+
+
+def get_idf_table() -> IdfTable:
+    """Return the process-wide IDF table, loading it on first use."""
+    global _idf_table
+    if _idf_table is None:
+        with _idf_table_lock:
+            if _idf_table is None:
+                _idf_table = IdfTable.load(IDF_TABLE_PATH)
+    return _idf_table
+
+
+def _score_sentence_terms(term_lists: List[List[str]], idf_table: IdfTable, corpus_idf_only: bool = False):
+    """
+    Score pre-extracted sentence terms; see score_sentences().
+
+    Returns:
+        Tuple of (scores, buckets touched by the sentences)
+    """
+    n_features = idf_table.n_features
+    n_sentences = len(term_lists)
+    lengths = np.fromiter((len(terms) for terms in term_lists), dtype=np.int64, count=n_sentences)
+    rows = np.repeat(np.arange(n_sentences), lengths)
+    buckets = hash_terms(chain.from_iterable(term_lists), n_features)
+
+    # Term frequency per (sentence, bucket) pair
+    pairs, tf = np.unique(rows * n_features + buckets, return_counts=True)
+    pair_rows, pair_buckets = pairs // n_features, pairs % n_features
+
+    if idf_table.ready or corpus_idf_only:
+        idf = idf_table.idf(pair_buckets)
+    else:
+        sentence_df = np.bincount(pair_buckets, minlength=n_features)
+        idf = np.log((1.0 + n_sentences) / (1.0 + sentence_df[pair_buckets])) + 1.0
+
+    weights = tf * idf
+    norms = np.sqrt(np.bincount(pair_rows, weights=weights ** 2, minlength=n_sentences))
+    sums = np.bincount(pair_rows, weights=weights, minlength=n_sentences)
+    return np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0), pair_buckets
+
+
+def score_sentences(sentences: List[str], idf_table: Optional[IdfTable] = None) -> np.ndarray:
+    """
+    Score sentences by the sum of their L2-normalized TF-IDF weights.
+
+    All sentences are scored together with numpy: terms are hashed into the
+    table's buckets, IDF is a table lookup, and per-sentence sums and norms are
+    bincounts. When the corpus table is not ready yet, IDF is taken from the
+    document's own sentences instead.
+    """
+    idf_table = idf_table or get_idf_table()
+    scores, _ = _score_sentence_terms([sentence_terms(sentence) for sentence in sentences], idf_table)
+    return scores
+
+
+def summarize_stream(title: str, sentences: Iterable[str], num_sentences: Optional[int] = None,
+                     max_words: Optional[int] = None, idf_table: Optional[IdfTable] = None) -> dict:
+    """
+    Streaming variant of extract_key_sentences_and_truncate for very large bodies.
 
+    Sentences are pulled from any iterable (e.g. a generator over scraped text),
+    scored in small chunks against the corpus IDF table, and only a bounded
+    min-heap of the best `num_sentences` (with their original positions) is
+    kept. Memory stays constant regardless of input size and no TF-IDF matrix
+    is ever built for the whole document. Because a single pass cannot know
+    the document's own sentence frequencies, IDF always comes from the corpus
+    table (uniform while the table is still empty).
 
-def extract_key_sentences_and_truncate(title: str, body: str) -> dict:
+    Returns:
+        The same dictionary shape as extract_key_sentences_and_truncate
+    """
+    num_sentences = num_sentences or settings.NUM_SUMMARY_SENTENCES
+    max_words = max_words or settings.MAX_BODY_WORDS
+    idf_table = idf_table or get_idf_table()
+    cleaned_title = title.strip() or "Untitled"
+
+    heap = []  # (score, -position, position, sentence); the smallest score is evicted first
+    seen_buckets = np.zeros(idf_table.n_features, dtype=bool)
+    position = 0
+
+    def consume(chunk: List[str]):
+        scores, buckets = _score_sentence_terms([sentence_terms(s) for s in chunk], idf_table, corpus_idf_only=True)
+        seen_buckets[buckets] = True
+        for offset, (score, sentence) in enumerate(zip(scores, chunk)):
+            index = position + offset
+            entry = (float(score), -index, index, sentence)
+            if len(heap) < num_sentences:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    chunk = []
+    for sentence in sentences:
+        chunk.append(sentence)
+        if len(chunk) == _STREAM_CHUNK_SIZE:
+            consume(chunk)
+            position += len(chunk)
+            chunk = []
+    if chunk:
+        consume(chunk)
+
+    if settings.IDF_UPDATE_FROM_ANALYSES and seen_buckets.any():
+        idf_table.add_buckets(np.flatnonzero(seen_buckets))
+
+    # Restore original order of the selected sentences
+    summary_body = ' '.join(sentence for _, _, _, sentence in sorted(heap, key=lambda entry: entry[2]))
+    truncated_body = _truncate_to_word_limit(summary_body, max_words)
+    return {
+        "title": cleaned_title,
+        "body": truncated_body,
+        "word_count": len(truncated_body.split())
+    }
+
+
+def extract_key_sentences_and_truncate(title: str, body: str, document: Optional[Document] = None) -> dict:
     """
     Extracts the most important sentences from the body using TF-IDF scoring,
     then truncates the result to fit within the configured word limit.
 
     This is a lightweight, classical NLP approach that:
     1. Tokenizes the body into sentences
-    2. Calculates TF-IDF scores for each sentence
+    2. Calculates TF-IDF scores for each sentence using the corpus IDF table
     3. Selects the top N sentences (based on settings.NUM_SUMMARY_SENTENCES)
     4. Reorders them to maintain original flow
     5. Truncates to settings.MAX_BODY_WORDS if needed
@@ -23,6 +278,7 @@ def extract_key_sentences_and_truncate(title: str, body: str) -> dict:
     Args:
         title: The article title
         body: The cleaned article body text
+        document: Shared Document for title/body; its sentences are reused
 
     Returns:
         A dictionary with:
@@ -43,12 +299,15 @@ def extract_key_sentences_and_truncate(title: str, body: str) -> dict:
             "word_count": len(body.split()) if body else 0
         }
 
-    # Step 1: Tokenize body into sentences
-    try:
-        sentences = sent_tokenize(body)
-    except Exception as e:
-        print(f"Sentence tokenization failed: {e}. Falling back to simple split.")
-        sentences = [s.strip() + '.' for s in body.split('.') if s.strip()]
+    # Very large bodies are summarized in a single streaming pass; the regex
+    # segmenter generates sentences lazily rather than splitting into a list first
+    if len(body) > settings.SUMMARIZER_STREAMING_MIN_CHARS:
+        if settings.SENTENCE_SEGMENTER.lower() == "regex":
+            return summarize_stream(cleaned_title, iter_sentences(body))
+        return summarize_stream(cleaned_title, iter(split_sentences(body)))
+
+    # Step 1: Tokenize body into sentences (already done if a Document was passed)
+    sentences = document.sentences if document is not None else split_sentences(body)
 
     # If there are very few sentences, just truncate by words
     if len(sentences) <= settings.NUM_SUMMARY_SENTENCES:
@@ -59,23 +318,14 @@ def extract_key_sentences_and_truncate(title: str, body: str) -> dict:
             "word_count": len(truncated_body.split())
         }
 
-    # Step 2: Calculate TF-IDF scores for each sentence
+    # Step 2: Calculate TF-IDF scores for each sentence from the corpus IDF table
     try:
-        # Get English stopwords
-        stop_words = set(stopwords.words('english'))
-        
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(
-            stop_words=list(stop_words),
-            max_features=1000,
-            ngram_range=(1, 2)
-        )
-        
-        # Fit and transform sentences
-        tfidf_matrix = vectorizer.fit_transform(sentences)
-        
-        # Calculate sentence scores (sum of TF-IDF values for all words in sentence)
-        sentence_scores = tfidf_matrix.sum(axis=1).A1
+        idf_table = get_idf_table()
+        sentence_scores = score_sentences(sentences, idf_table)
+
+        # Let the corpus statistics follow the articles we actually analyse
+        if settings.IDF_UPDATE_FROM_ANALYSES:
+            idf_table.add_document(chain.from_iterable(sentence_terms(s) for s in sentences))
         
     except Exception as e:
         print(f"TF-IDF calculation failed: {e}. Using simple sentence extraction.")
@@ -141,3 +391,32 @@ def _truncate_to_word_limit(text: str, max_words: int) -> str:
         truncated += '...'
     
     return truncated
+
+
+def main():
+    """Command-line entry point for building the corpus IDF table."""
+    parser = argparse.ArgumentParser(description="Build the summarizer's corpus IDF table.")
+    parser.add_argument("corpus", nargs="+", help="Text files with one document per line")
+    parser.add_argument("--output", default=IDF_TABLE_PATH, help="Where to write the table")
+    parser.add_argument("--append", action="store_true", help="Add to the existing table instead of starting over")
+    parser.add_argument("--n-features", type=int, default=settings.IDF_TABLE_FEATURES, help="Number of hash buckets")
+    args = parser.parse_args()
+
+    if args.append and os.path.exists(args.output):
+        table = IdfTable.load(args.output)
+    else:
+        table = IdfTable.empty(args.n_features)
+    table.path = None  # Save once at the end
+
+    for corpus_path in args.corpus:
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    table.add_document(sentence_terms(line))
+
+    table.save(args.output)
+    print(f"Wrote IDF table with {table.n_docs} documents to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
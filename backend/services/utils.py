@@ -2,17 +2,53 @@
 
 import re
 import logging
-from langdetect import detect, LangDetectException
+from typing import NamedTuple, Optional
+from langdetect import detect, DetectorFactory, LangDetectException
+from ..config.settings import settings
 from ..models.detection_models import ScrapedArticle
 
+# langdetect is randomized; a fixed seed makes results repeatable
+DetectorFactory.seed = settings.LANGDETECT_SEED
+
+# Anything outside this set of characters is treated as noise
+_NOISE_PATTERN = re.compile(r'[^A-Za-z0-9.,;!?\'"()$%\s]+')
+
+
+class NormalizedText(NamedTuple):
+    """Result of normalize_text()."""
+    text: str                # Cleaned text with single spaces
+    word_count: int          # Number of whitespace-separated words in text
+    sample: str              # Leading words used for language detection
+    language: Optional[str]  # Detected language code, or None if it could not be detected
+
+
+def normalize_text(text: str, detect_language: bool = True) -> NormalizedText:
+    """
+    Clean text, count its words and detect its language in one pass.
+
+    Noise characters are removed with one compiled regex and the text is split
+    once; the word list gives the collapsed text, the word count and a bounded
+    sample (settings.LANGDETECT_SAMPLE_WORDS words). Language detection only
+    sees that sample, so its cost does not grow with article length.
+    """
+    words = _NOISE_PATTERN.sub('', text or "").split()
+    sample = ' '.join(words[:settings.LANGDETECT_SAMPLE_WORDS])
+
+    language = None
+    if detect_language and sample:
+        try:
+            language = detect(sample)
+        except LangDetectException:
+            language = None
+
+    return NormalizedText(' '.join(words), len(words), sample, language)
+
 
 def _clean_text(text: str) -> str:
     """A helper function to remove noise from text."""
     if not text:
         return ""
-    text = re.sub(r'\s+', ' ', text)  # Collapse whitespace
-    text = re.sub(r'[^A-Za-z0-9.,;!?\'"()$%\s]+', '', text)  # Remove strange characters
-    return text.strip()
+    return normalize_text(text, detect_language=False).text
 
 
 def clean_and_validate_article(article: ScrapedArticle) -> ScrapedArticle:
@@ -32,26 +68,26 @@ def clean_and_validate_article(article: ScrapedArticle) -> ScrapedArticle:
     Raises:
         ValueError: If the article fails validation checks.
     """
-    # 1. Clean title and body
+    # 1. Clean title and body (the body is also counted and language-detected here)
     cleaned_title = _clean_text(article.title or "")
-    cleaned_body = _clean_text(article.body)
+    normalized = normalize_text(article.body)
 
-    if not cleaned_body:
+    if not normalized.text:
         raise ValueError("Article body is empty after cleaning.")
 
     # 2. Validate language
-    try:
-        if detect(cleaned_body) != "en":
-            raise ValueError("Article is not in English.")
-    except LangDetectException:
+    if normalized.language is None:
         raise ValueError("Language could not be detected for the article.")
+    if normalized.language != "en":
+        raise ValueError("Article is not in English.")
 
     # 3. Validate content length
-    if len(cleaned_body.split()) < 50:  # Minimum 50 words
+    if normalized.word_count < 50:  # Minimum 50 words
         raise ValueError("Article content is too short to be reliable for analysis.")
 
     article.title = cleaned_title
-    article.body = cleaned_body
+    article.body = normalized.text
+    article.word_count = normalized.word_count
     
     return article
 
@@ -76,23 +112,22 @@ def clean_and_validate_text(text: str) -> str:
     if not text:
         raise ValueError("Input text cannot be empty.")
 
-    # 1. Clean text using the existing helper
-    cleaned_text = _clean_text(text)
-    if not cleaned_text:
+    # 1. Clean, count and detect language in one pass
+    normalized = normalize_text(text)
+    if not normalized.text:
         raise ValueError("Text is empty after cleaning.")
 
     # 2. Validate language
-    try:
-        if detect(cleaned_text) != "en":
-            raise ValueError("Text is not in English.")
-    except LangDetectException:
+    if normalized.language is None:
         # This can happen on very short or ambiguous text
         raise ValueError("Language could not be reliably detected.")
+    if normalized.language != "en":
+        raise ValueError("Text is not in English.")
 
     # 3. Validate content length
     MINIMUM_WORD_COUNT = 50
-    if len(cleaned_text.split()) < MINIMUM_WORD_COUNT:
+    if normalized.word_count < MINIMUM_WORD_COUNT:
         raise ValueError(f"Text content is too short. Minimum {MINIMUM_WORD_COUNT} words required.")
 
-    return cleaned_text
+    return normalized.text
 
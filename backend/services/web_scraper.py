@@ -5,12 +5,47 @@ from bs4 import BeautifulSoup
 
 from ..models.detection_models import ScrapedArticle
 from ..config.settings import settings
+from .executor import run_cpu_stage
+from .html_extractor import ParagraphTextCounter, extract_article
+from .http_client import get_async_client, host_limiter
+from .scrape_cache import canonical_url, scrape_cache
 
 
-def scrape_article_content(url: str) -> ScrapedArticle:
+def _check_headers(response: httpx.Response):
+    """Reject non-HTML responses and oversized bodies before reading them."""
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type and content_type not in settings.SCRAPER_ALLOWED_CONTENT_TYPES:
+        raise ValueError(f"URL does not point to an HTML page (Content-Type: {content_type})")
+    content_length = response.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.SCRAPER_MAX_BYTES:
+        raise ValueError(f"Page is too large ({int(content_length)} bytes)")
+
+
+async def _parse_body(body: bytes, charset, url: str) -> ScrapedArticle:
+    """Extract an article from a downloaded or cached body in the CPU stage executor."""
+    if settings.HTML_EXTRACTOR == "bs4":
+        return await run_cpu_stage("parse", parse_article_html, body, url)
+    return await run_cpu_stage("parse", extract_article, body, url, charset)
+
+
+async def scrape_article_content(url: str) -> ScrapedArticle:
     """
     Scrapes article content from a given URL.
     
+    The page is fetched on the application's shared pooled client (see
+    services.http_client) without blocking the event loop. The body is
+    streamed: Content-Type and Content-Length are checked first, at most
+    settings.SCRAPER_MAX_BYTES are read, and with the default lxml extractor
+    (settings.HTML_EXTRACTOR) a cheap paragraph text counter stops the download
+    once settings.SCRAPER_TEXT_TARGET_CHARS of paragraph text have arrived.
+    Memory per request stays bounded. The body is parsed once, in the CPU
+    stage executor, off the event loop.
+    
+    When settings.SCRAPE_CACHE_ENABLED, bodies are kept in the on-disk
+    scrape cache under the canonical URL: fresh pages are parsed without any
+    request, and stale ones are revalidated with a conditional GET. Downloads
+    stopped early by the text target or byte cap are not cached.
+    
     Args:
         url: The URL of the article to scrape.
         
@@ -18,17 +53,69 @@ def scrape_article_content(url: str) -> ScrapedArticle:
         A ScrapedArticle object with the scraped content.
         
     Raises:
-        ValueError: If the URL cannot be accessed or parsed.
+        ValueError: If the URL cannot be accessed or parsed, is not HTML, or is too large.
     """
-    headers = {"User-Agent": settings.SCRAPER_USER_AGENT}
+    client = get_async_client("scraper")
+    use_bs4 = settings.HTML_EXTRACTOR == "bs4"
+    
+    cache_key = canonical_url(url) if settings.SCRAPE_CACHE_ENABLED else None
+    cached = await scrape_cache.get(cache_key) if cache_key else None
+    if cached is not None and cached.fresh:
+        scrape_cache.record_hit()
+        return await _parse_body(cached.body, cached.charset, url)
     
+    chunks, size = [], 0
     try:
-        response = httpx.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        async with host_limiter.limit(url):
+            request_headers = cached.conditional_headers() if cached is not None else {}
+            async with client.stream("GET", url, headers=request_headers) as response:
+                if response.status_code == 304 and cached is not None:
+                    await scrape_cache.revalidated(cache_key, response.headers)
+                    return await _parse_body(cached.body, cached.charset, url)
+                response.raise_for_status()
+                _check_headers(response)
+                counter = None if use_bs4 else ParagraphTextCounter(settings.SCRAPER_TEXT_TARGET_CHARS)
+                complete = False
+                async for chunk in response.aiter_bytes(settings.SCRAPER_CHUNK_BYTES):
+                    chunk = chunk[:settings.SCRAPER_MAX_BYTES - size]
+                    size += len(chunk)
+                    chunks.append(chunk)
+                    if counter is not None and counter.feed(chunk):
+                        break  # Enough article text
+                    if size >= settings.SCRAPER_MAX_BYTES:
+                        break  # Byte budget spent; parse what arrived
+                else:
+                    complete = True
     except httpx.RequestError as e:
         raise ValueError(f"Failed to fetch URL: {e}")
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    if cache_key:
+        scrape_cache.record_miss()
+        if complete:
+            # A truncated body must not be stored under the full page's validators
+            await scrape_cache.store(cache_key, b"".join(chunks), response.charset_encoding, response.headers)
+    
+    return await _parse_body(b"".join(chunks), response.charset_encoding, url)
+
+
+def parse_article_html(content: bytes, url: str) -> ScrapedArticle:
+    """
+    Extract title, body and metadata from an article's HTML with BeautifulSoup.
+    
+    Kept as a reference implementation (settings.HTML_EXTRACTOR = "bs4");
+    html_extractor.extract_article is the faster default.
+    
+    Args:
+        content: Raw HTML of the page
+        url: The page URL
+        
+    Returns:
+        A ScrapedArticle object with the scraped content.
+        
+    Raises:
+        ValueError: If no content can be extracted.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
     
     # Extract title
     title = soup.find('title')
@@ -1,3 +1,83 @@
 """Pytest configuration and fixtures."""
 
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
+
+
+class StubHTTPServer:
+    """
+    Local HTTP server serving canned responses by path.
+
+    Register routes with `add(path, body, ...)`; `url(path)` gives the full URL.
+    Every request path is recorded in `requests`.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests.append(self.path)
+                route = stub.routes.get(self.path) or stub.routes.get(self.path.split("?")[0])
+                if route is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body, status, headers, delay = route
+                if delay:
+                    time.sleep(delay)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if "Content-Length" not in headers and headers.get("Connection") != "close":
+                    self.send_header("Content-Length", str(len(body)))
+                else:
+                    self.close_connection = True  # Body length set by the route or by closing
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 128  # Default backlog of 5 drops bursts of concurrent connects (1 s SYN retry)
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def add(self, path, body, status=200, content_type="text/html; charset=utf-8", headers=None, delay=0.0):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.routes[path] = (body, status, {"Content-Type": content_type, **(headers or {})}, delay)
+
+    def url(self, path="/"):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """A running StubHTTPServer on a free local port."""
+    server = StubHTTPServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,107 @@
+"""Tests for the feed and sitemap crawler."""
+
+import asyncio
+import gzip
+import time
+
+import pytest
+
+from backend.config.settings import settings
+from backend.models.crawl_models import CrawlJob, CrawlResult
+from backend.services.crawler import Crawler, CrawlHistory, DomainThrottle, RobotsCache, parse_feed
+from backend.services.web_scraper import scrape_article_content
+
+
+@pytest.fixture(autouse=True)
+def _no_caches(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EXTRACTION_TEMPLATES_ENABLED", False)
+
+
+def _serve_site(http_server):
+    http_server.add("/robots.txt", "User-agent: *\nDisallow: /private\n", content_type="text/plain")
+    http_server.add("/feed.xml", (
+        "<?xml version='1.0'?><rss version='2.0'><channel><title>Feed</title>"
+        f"<item><link>{http_server.url('/a')}</link></item>"
+        f"<item><link>{http_server.url('/a?utm_source=rss')}</link></item>"
+        f"<item><link>{http_server.url('/private/x')}</link></item>"
+        "</channel></rss>"
+    ), content_type="application/rss+xml")
+    http_server.add("/atom.xml", (
+        "<?xml version='1.0'?><feed xmlns='http://www.w3.org/2005/Atom'>"
+        "<entry><link rel='alternate' href='/c'/></entry></feed>"
+    ), content_type="application/atom+xml")
+    http_server.add("/sitemap_index.xml", (
+        "<sitemapindex xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>"
+        f"<sitemap><loc>{http_server.url('/sitemap.xml')}</loc></sitemap></sitemapindex>"
+    ), content_type="application/xml")
+    http_server.add("/sitemap.xml", (
+        "<urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>"
+        f"<url><loc>{http_server.url('/b')}</loc></url><url><loc>{http_server.url('/a')}</loc></url></urlset>"
+    ), content_type="application/xml")
+    for page in ("a", "b", "c"):
+        http_server.add(f"/{page}", f"<html><head><title>Page {page}</title></head><body><p>Text {page}.</p></body></html>")
+
+
+def test_crawler_discovers_dedupes_obeys_robots_and_rate_limits(http_server, tmp_path):
+    _serve_site(http_server)
+    fetched = []
+
+    async def analyze(url):
+        fetched.append(time.monotonic())
+        article = await scrape_article_content(url)
+        return CrawlResult(url=url, verdict=article.title)
+
+    sources = [http_server.url(path) for path in ("/feed.xml", "/atom.xml", "/sitemap_index.xml", "/missing.xml")]
+    history, robots = CrawlHistory(str(tmp_path / "crawl.sqlite3")), RobotsCache()
+
+    def crawl():
+        crawler = Crawler(analyze, history=history, robots=robots, concurrency=4, domain_interval=0.2)
+        return asyncio.run(crawler.run(CrawlJob(job_id="test", sources=sources)))
+
+    job = crawl()
+    assert job.status == "done"
+    assert sorted(result.verdict for result in job.results) == ["Page a", "Page b", "Page c"]
+    assert {k: job.counts[k] for k in ("discovered", "disallowed", "queued", "analyzed", "failed")} == {
+        "discovered": 4, "disallowed": 1, "queued": 3, "analyzed": 3, "failed": 0,
+    }
+    assert len(job.errors) == 1 and "/missing.xml" in job.errors[0]
+    assert "/private/x" not in http_server.requests
+    gaps = [later - earlier for earlier, later in zip(fetched, fetched[1:])]
+    assert min(gaps) >= 0.18  # One domain: requests spaced by the interval despite 4 workers
+
+    # Already analyzed articles are skipped; robots.txt is fetched once
+    again = crawl()
+    assert again.counts["already_seen"] == 3 and again.counts["queued"] == 0 and len(fetched) == 3
+    assert http_server.requests.count("/robots.txt") == 1
+    history.close()
+
+
+def test_parse_feed_accepts_gzipped_sitemaps_and_rejects_html():
+    sitemap = b"<urlset><url><loc>https://news.example/story</loc></url><url><loc>ftp://x/y</loc></url></urlset>"
+    assert parse_feed(gzip.compress(sitemap), "https://news.example/sitemap.xml.gz") == (["https://news.example/story"], [])
+    with pytest.raises(ValueError):
+        parse_feed(b"", "https://news.example/feed")
+    page = (b"<!DOCTYPE html><html><head><title>News</title></head>"
+            b"<body><a href='/story'>Story</a><p>Not a feed<br></p></body></html>")
+    with pytest.raises(ValueError):
+        parse_feed(page, "https://news.example/")
+
+
+def test_robots_cache_and_domain_throttle_are_bounded(http_server):
+    _serve_site(http_server)
+    robots = RobotsCache(max_entries=2)
+    origins = [http_server.url("/").rstrip("/"), "http://127.0.0.1:9", "http://localhost:9"]
+
+    async def scenario():
+        for origin in origins:
+            await robots.allowed(f"{origin}/page")
+        throttle = DomainThrottle(max_entries=2)
+        for domain in ("a", "b", "c"):
+            await throttle.wait(f"http://{domain}.example/", 0.0)  # Slot already free again
+        await throttle.wait("http://slow.example/", 60.0)
+        return throttle
+
+    throttle = asyncio.run(scenario())
+    assert list(robots._entries) == origins[1:]  # Least recently used origin dropped
+    assert list(throttle._next) == ["slow.example"]  # Passed slots forgotten, pending one kept
@@ -1,3 +1,375 @@
 """Tests for the detection endpoints."""
 
+import asyncio
+import time
 import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+import joblib
+import numpy as np
+
+from backend.core import inference
+from backend.core.inference import ModelRegistry, InferenceBatcher, HashedLinearModel, verify_hashed_model
+
+
+TRAIN_TEXTS = [
+    "shocking miracle cure doctors hate exposed secret",
+    "you won't believe this bombshell leaked conspiracy",
+    "according to a university study published in the journal",
+    "the government agency report analysis shows official data",
+]
+TRAIN_LABELS = [0, 0, 1, 1]
+
+
+def _train_model(labels=TRAIN_LABELS):
+    model = make_pipeline(TfidfVectorizer(), LogisticRegression())
+    model.fit(TRAIN_TEXTS, labels)
+    return model
+
+
+def test_model_registry_loads_once_and_reloads_on_force(tmp_path):
+    path = tmp_path / "model.pkl"
+    joblib.dump(_train_model(), path)
+
+    registry = ModelRegistry(str(path))
+    assert registry.reload() is True
+    first = registry.get()
+    first_version = registry.info()["version"]
+
+    # Unchanged file is not reloaded
+    assert registry.reload() is False
+    assert registry.get() is first
+
+    joblib.dump(_train_model([1, 1, 0, 0]), path)
+    assert registry.reload(force=True) is True
+    assert registry.get() is not first
+    assert registry.info()["version"] != first_version
+
+
+def test_model_registry_prefers_memory_mapped_artifact(tmp_path):
+    path = tmp_path / "model.pkl"
+    artifact = tmp_path / "artifacts" / "model.joblib"
+    joblib.dump(_train_model(), path, compress=3)
+    inference.export_model_artifact(str(path), str(artifact))
+
+    registry = ModelRegistry(str(path), str(artifact), use_mmap=True)
+    registry.reload()
+
+    assert registry.info()["memory_mapped"] is True
+    coef = registry.get().steps[-1][1].coef_
+    assert isinstance(coef, np.memmap)
+    assert not coef.flags.writeable
+    assert registry.get().predict_proba(TRAIN_TEXTS).shape == (4, 2)
+
+
+def test_hashed_linear_model_matches_source_pipeline(tmp_path):
+    source = make_pipeline(TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True), LogisticRegression())
+    source.fit(TRAIN_TEXTS, TRAIN_LABELS)
+    path = tmp_path / "model.fnhm"
+    HashedLinearModel.from_pipeline(source, n_features=2 ** 16).save(str(path))
+
+    hashed = HashedLinearModel.load(str(path))
+    report = verify_hashed_model(source, hashed, TRAIN_TEXTS + ["a study says the miracle was leaked"])
+
+    assert report["label_agreement"] == 1.0
+    assert report["max_proba_diff"] < 1e-4
+    assert path.stat().st_size < 2 ** 16 * 8 + 64
+
+
+def test_hashed_linear_model_rejects_string_labels():
+    source = make_pipeline(TfidfVectorizer(), LogisticRegression())
+    source.fit(TRAIN_TEXTS, ["REAL" if label == 1 else "FAKE" for label in TRAIN_LABELS])
+    with pytest.raises(ValueError, match="integer class labels"):
+        HashedLinearModel.from_pipeline(source, n_features=2 ** 10)
+
+
+def test_model_registry_without_model_file(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "missing.pkl"))
+    assert registry.get() is None
+    assert registry.info()["loaded"] is False
+
+
+def test_inference_batcher_coalesces_concurrent_requests(tmp_path, monkeypatch):
+    path = tmp_path / "model.pkl"
+    model = _train_model()
+    joblib.dump(model, path)
+    registry = ModelRegistry(str(path))
+    registry.reload()
+    monkeypatch.setattr(inference, "model_registry", registry)
+
+    calls = []
+    loaded = registry.get()
+    original = loaded.predict_proba
+    monkeypatch.setattr(loaded, "predict_proba", lambda texts: calls.append(len(texts)) or original(texts))
+
+    batcher = InferenceBatcher(max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*[batcher.predict(text, "") for text in TRAIN_TEXTS * 2])
+
+    results = asyncio.run(run())
+
+    assert sum(calls) == 8
+    assert len(calls) < 8
+    assert [label for _, label in results[:4]] == ["FAKE", "FAKE", "REAL", "REAL"]
+    for (confidence, label), text in zip(results, TRAIN_TEXTS * 2):
+        assert (confidence, label) == inference.predict_fake_news(text, "")
+
+
+def test_inference_batcher_fails_the_batch_but_keeps_running(monkeypatch):
+    monkeypatch.setattr(inference, "load_model", lambda: object())
+    monkeypatch.setattr(inference, "predict_batch", lambda texts: None)  # Falls back to the heuristics
+    broken = [True]
+    original = inference.heuristic_analysis
+
+    def heuristic(title, body, document=None):
+        if broken[0]:
+            raise RuntimeError("heuristics failed")
+        return original(title, body, document)
+
+    monkeypatch.setattr(inference, "heuristic_analysis", heuristic)
+    batcher = InferenceBatcher(max_batch_size=4, max_wait_ms=10)
+
+    async def run():
+        failed = await asyncio.wait_for(
+            asyncio.gather(*[batcher.predict(text, "") for text in TRAIN_TEXTS], return_exceptions=True), 1.0
+        )
+        broken[0] = False
+        return failed, await asyncio.wait_for(batcher.predict(TRAIN_TEXTS[0], ""), 1.0)
+
+    failed, recovered = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in failed)  # Callers fail instead of hanging
+    assert recovered == original(TRAIN_TEXTS[0], "")
+
+
+def test_lexicon_matches_whole_words_and_contained_phrases():
+    from backend.core.lexicon import ANALYSIS_LEXICON
+
+    matches = ANALYSIS_LEXICON.scan("officials said the climate change report was leaked to reuters")
+
+    assert "ai" not in matches.terms
+    assert {"climate", "climate change", "report", "leaked", "reuters"} <= matches.terms
+    assert matches.count("topic:Environment") == 1
+    assert matches.count("topic:Science") == 1
+    assert matches.has("trusted_domain")
+
+
+def test_document_computes_derived_forms_once_and_is_shared_across_stages(monkeypatch):
+    from backend.config.settings import settings
+    from backend.core import document as document_module
+    from backend.core.explainability import analyze_content_features, extract_topics
+    from backend.core.inference import heuristic_analysis
+    from backend.models.detection_models import ModelInput
+
+    calls = {"tokenize": 0, "split_sentences": 0, "scan": 0}
+
+    def counted(name, fn):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(document_module, "tokenize", counted("tokenize", document_module.tokenize))
+    monkeypatch.setattr(document_module, "split_sentences", counted("split_sentences", document_module.split_sentences))
+    lexicon = document_module.ANALYSIS_LEXICON
+    monkeypatch.setattr(lexicon, "scan", counted("scan", lexicon.scan))
+
+    model_input = ModelInput(
+        title="Shocking report exposed", body="Officials confirmed the study. Experts disagree sharply. " * 5, word_count=35
+    )
+    document = model_input.document
+    assert model_input.document is document  # One Document per input
+
+    heuristic_analysis(model_input.title, model_input.body, document)
+    analyze_content_features(model_input.title, model_input.body, document)
+    extract_topics(model_input.title, model_input.body, document)
+    assert calls["scan"] == 1  # Heuristics, content features and topics share one lexicon scan
+    for _ in range(3):
+        document.tokens, document.sentences, document.lexicon, document.word_count
+    assert calls == {"tokenize": 1, "split_sentences": 1, "scan": 1}
+
+    # Sentences handed in upstream are reused without splitting again
+    presplit = document_module.Document("T", "One. Two.", sentences=["One.", "Two."])
+    assert presplit.sentences == ["One.", "Two."] and calls["split_sentences"] == 1
+
+    # The configured segmenter is honoured
+    monkeypatch.setattr(settings, "SENTENCE_SEGMENTER", "punkt")
+    monkeypatch.setattr(document_module, "split_sentences", lambda text, segmenter: [segmenter])
+    assert document_module.Document("T", "One. Two.").sentences == ["punkt"]
+
+    # Changing the input's text gives a fresh Document
+    model_input.body = "Different text."
+    assert model_input.document is not document and model_input.document.body == "Different text."
+
+
+def test_process_executor_keeps_stateful_stages_in_threads():
+    import os
+    from backend.services.executor import CPUStageExecutor
+
+    executor = CPUStageExecutor("process", 1)
+
+    async def pids():
+        return await asyncio.gather(executor.run("clean", os.getpid), executor.run("inference", os.getpid))
+
+    try:
+        clean_pid, inference_pid = asyncio.run(pids())
+    finally:
+        executor.shutdown()
+    assert clean_pid != os.getpid()  # Stateless stage in a worker process
+    assert inference_pid == os.getpid()  # Shares the loaded model with the API process
+    assert "inference" not in executor.stats()["process_stages"]
+
+
+def test_stage_graph_overlaps_independent_stages():
+    from backend.core.pipeline import StageGraph
+
+    async def slow(value):
+        await asyncio.sleep(0.2)
+        return value
+
+    graph = (
+        StageGraph()
+        .add("a", lambda _: slow(1))
+        .add("b", lambda _: slow(2))
+        .add("sum", lambda r: r["a"] + r["b"], deps=["a", "b"])
+    )
+    start = time.perf_counter()
+    results, timings = asyncio.run(graph.run())
+
+    assert results["sum"] == 3
+    assert time.perf_counter() - start < 0.35  # Critical path, not the sum of stages
+    assert set(timings) == {"a", "b", "sum"} and timings["a"] >= 150
+    with pytest.raises(ValueError):
+        StageGraph().add("x", lambda _: None, deps=["missing"])
+
+
+def test_perform_complete_analysis_reports_stage_timings(monkeypatch):
+    from backend.routes import detect
+    from backend.models.detection_models import ModelInput
+
+    async def no_evidence(title, body, max_sources=5, timeout=None):
+        return []
+
+    monkeypatch.setattr(detect, "search_web_evidence", no_evidence)
+    monkeypatch.setattr(detect, "save_analysis_to_history", lambda response: None)
+    model_input = ModelInput(title="Shocking secret cure exposed", body="You won't believe this miracle cure. " * 5, word_count=30)
+
+    response = asyncio.run(detect.perform_complete_analysis(model_input))
+
+    assert response.evidence_analysis.verdict in ("REAL", "FAKE", "UNCERTAIN")
+    assert set(response.stage_timings) >= {"inference", "evidence", "content_analysis", "topics", "explanation"}
+
+
+def test_latency_budget_degrades_evidence_and_inference(monkeypatch):
+    from backend.routes import detect
+    from backend.core.pipeline import LatencyBudget
+    from backend.models.detection_models import ModelInput
+
+    async def slow_evidence(title, body, max_sources=5, timeout=None):
+        await asyncio.sleep(timeout)
+        return [{"url": "u", "title": "t", "snippet": "s"}]
+
+    async def confident(title, body, document=None):
+        return 0.97, "REAL"
+
+    monkeypatch.setattr(detect, "search_web_evidence", slow_evidence)
+    monkeypatch.setattr(detect, "save_analysis_to_history", lambda response: None)
+    monkeypatch.setattr(detect.inference_batcher, "predict", confident)
+    model_input = ModelInput(title="Official report published", body="The agency published its annual report. " * 5, word_count=30)
+
+    start = time.perf_counter()
+    response = asyncio.run(detect.perform_complete_analysis(model_input, LatencyBudget(5000)))
+    assert time.perf_counter() - start < 1.0  # Did not wait for the evidence search
+    assert "model confidence" in response.degraded_stages["evidence"]
+    assert response.evidence_analysis.evidence.sources == []
+
+    # Exhausted budget skips evidence; a saturated queue falls back to heuristics
+    monkeypatch.setattr(detect.settings, "INFERENCE_SATURATION_PENDING", 0)
+    response = asyncio.run(detect.perform_complete_analysis(model_input, LatencyBudget.from_header("100")))
+    assert set(response.degraded_stages) == {"evidence", "inference"}
+    assert LatencyBudget.from_header("not-a-number").total == detect.settings.LATENCY_BUDGET_MS / 1000
+
+
+def test_latency_budget_bounds_the_scrape(http_server, monkeypatch):
+    from backend.config.settings import settings
+    from backend.core.input_handler import process_url_for_analysis
+    from backend.core.pipeline import LatencyBudget
+    from backend.models.detection_models import URLInput
+
+    monkeypatch.setattr(settings, "SCRAPE_CACHE_ENABLED", False)
+    http_server.add("/slow", "<html><body><p>Too late.</p></body></html>", delay=2.0)
+    budget = LatencyBudget(500)
+
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="latency budget"):
+        asyncio.run(process_url_for_analysis(URLInput(url=http_server.url("/slow")), budget))
+    assert time.perf_counter() - start < 1.0
+    assert "scrape" in budget.degraded
+
+
+def test_single_flight_shares_results_errors_and_survives_cancellation():
+    from backend.core.singleflight import SingleFlight
+
+    flights = SingleFlight()
+    runs = []
+
+    async def work(value, fail=False):
+        runs.append(value)
+        await asyncio.sleep(0.1)
+        if fail:
+            raise ValueError("bad input")
+        return {"value": value}
+
+    async def scenario():
+        results = await asyncio.gather(*(flights.do("k", lambda: work(1)) for _ in range(5)))
+        assert runs == [1] and all(r is results[0] for r in results)
+
+        errors = await asyncio.gather(*(flights.do("e", lambda: work(2, fail=True)) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(e, ValueError) for e in errors) and runs == [1, 2]
+
+        # A cancelled caller does not cancel the shared work for the others
+        first = asyncio.ensure_future(flights.do("c", lambda: work(3)))
+        second = asyncio.ensure_future(flights.do("c", lambda: work(3)))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second) == {"value": 3}
+
+        # When every caller leaves, the work is cancelled
+        lone = asyncio.ensure_future(flights.do("d", lambda: work(4)))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        await asyncio.sleep(0.01)
+        assert flights.in_flight == 0
+
+    asyncio.run(scenario())
+    assert flights.stats()["shared"] == 7
+
+
+def test_concurrent_identical_text_requests_run_one_analysis(monkeypatch):
+    from backend.routes import detect
+    from backend.models.detection_models import TextInput
+
+    calls = []
+
+    async def fake_analysis(model_input, budget=None):
+        calls.append(model_input.title)
+        await asyncio.sleep(0.1)
+        return await original(model_input, budget)
+
+    async def no_evidence(title, body, max_sources=5, timeout=None):
+        return []
+
+    original = detect.perform_complete_analysis
+    monkeypatch.setattr(detect, "perform_complete_analysis", fake_analysis)
+    monkeypatch.setattr(detect, "search_web_evidence", no_evidence)
+    monkeypatch.setattr(detect, "save_analysis_to_history", lambda response: None)
+    payload = TextInput(text="Scientists publish a peer reviewed study. " * 10)
+
+    async def burst():
+        return await asyncio.gather(*(detect.process_text(payload, None) for _ in range(4)))
+
+    responses = asyncio.run(burst())
+    assert len(calls) == 1
+    assert len({id(r) for r in responses}) == 4  # Each caller gets its own copy
+    assert all(r == responses[0] for r in responses)
@@ -1,3 +1,271 @@
 """Tests for the evidence agent."""
 
+import asyncio
+import os
+import time
+
 import pytest
+
+from backend.config.settings import settings
+from backend.core import evidence_agent
+from backend.core.evidence_agent import EvidenceCache, evidence_cache_key, search_web_evidence
+from backend.core.evidence_providers import EvidenceFanout
+from backend.services.factcheck_index import FactCheckIndex
+from backend.services.similarity import claim_evidence_similarity
+
+
+@pytest.fixture(autouse=True)
+def _no_evidence_cache(monkeypatch):
+    monkeypatch.setattr(settings, "EVIDENCE_CACHE_ENABLED", False)
+
+
+def _page(title, description):
+    return f"<html><head><title>{title}</title><meta name='description' content='{description}'></head><body></body></html>"
+
+
+def test_search_web_evidence_fetches_pages_concurrently(http_server, monkeypatch):
+    for i in range(3):
+        http_server.add(f"/source{i}", _page(f"Source {i}", "Officials confirm the bridge closure"), delay=0.4)
+    monkeypatch.setattr(settings, "EVIDENCE_SOURCE_URLS", [http_server.url(f"/source{i}?q={{query}}") for i in range(3)])
+
+    start = time.perf_counter()
+    sources = asyncio.run(search_web_evidence("Bridge closure confirmed", "body"))
+    elapsed = time.perf_counter() - start
+
+    assert [s["title"] for s in sources] == ["Source 0", "Source 1", "Source 2"]
+    assert sources[0]["snippet"] == "Officials confirm the bridge closure"
+    assert sources[0]["similarity"] == "High"
+    assert elapsed < 1.0  # Close to one fetch, not the sum of three
+
+
+def test_search_web_evidence_respects_deadline_and_skips_failures(http_server, monkeypatch):
+    http_server.add("/fast", _page("Fast", "Quick answer"))
+    http_server.add("/slow", _page("Slow", "Too late"), delay=1.5)
+    http_server.add("/broken", "oops", status=500)
+    monkeypatch.setattr(settings, "EVIDENCE_SOURCE_URLS", [http_server.url(p) for p in ("/slow", "/broken", "/fast")])
+    monkeypatch.setattr(settings, "EVIDENCE_DEADLINE_SECONDS", 0.5)
+
+    sources = asyncio.run(search_web_evidence("Anything", "body"))
+
+    assert [s["title"] for s in sources] == ["Fast"]
+
+
+def test_search_web_evidence_reads_bounded_prefix(http_server, monkeypatch):
+    http_server.add("/big", "<html><head><title>Big</title></head><body>" + "<p>word</p>" * 200000 + "</body></html>")
+    monkeypatch.setattr(settings, "EVIDENCE_SOURCE_URLS", [http_server.url("/big")])
+    monkeypatch.setattr(settings, "EVIDENCE_MAX_PAGE_BYTES", 4096)
+
+    sources = asyncio.run(search_web_evidence("Big", "body"))
+
+    assert sources[0]["title"] == "Big"
+    assert len(sources[0]["snippet"]) <= settings.EVIDENCE_SNIPPET_CHARS
+
+
+class _FakeProvider:
+    local = False
+
+    def __init__(self, name, results, delay=0.0, fail=False):
+        self.name, self.results, self.delay, self.fail = name, results, delay, fail
+        self.calls = 0
+        self.available = True
+
+    async def search(self, title, body, limit, timeout):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [dict(r) for r in self.results[:limit]]
+
+
+def _hit(url):
+    return {"url": url, "title": url, "snippet": "Officials confirm"}
+
+
+def test_fanout_returns_first_k_hits_without_waiting_for_slow_providers():
+    fast = _FakeProvider("fast", [_hit("a"), _hit("b")])
+    slow = _FakeProvider("slow", [_hit("c")], delay=2.0)
+    fanout = EvidenceFanout([slow, fast])
+
+    start = time.perf_counter()
+    sources = asyncio.run(fanout.search("claim", "body", max_sources=2, timeout=3.0))
+
+    assert [s["url"] for s in sources] == ["a", "b"]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_fanout_hedges_slow_calls_and_opens_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "EVIDENCE_HEDGE_MIN_SAMPLES", 1)
+    monkeypatch.setattr(settings, "EVIDENCE_BREAKER_FAILURES", 2)
+    provider = _FakeProvider("flaky", [_hit("a")], delay=0.01)
+    fanout = EvidenceFanout([provider])
+    asyncio.run(fanout.search("claim", "body", max_sources=1))  # Seeds the latency history
+
+    provider.delay = 0.3  # Slower than p95, so a duplicate request is sent
+    asyncio.run(fanout.search("claim", "body", max_sources=1))
+    assert fanout.health["flaky"].hedges == 1
+
+    provider.fail = True
+    provider.delay = 0.0
+    for _ in range(2):
+        asyncio.run(fanout.search("claim", "body", max_sources=1))
+    calls = provider.calls
+    assert asyncio.run(fanout.search("claim", "body", max_sources=1)) == []
+    assert provider.calls == calls  # Circuit open: provider skipped
+    assert fanout.stats()["flaky"]["circuit_open"]
+
+    # Half-open after the cooldown: one trial call at a time, closing only on success
+    monkeypatch.setattr(settings, "EVIDENCE_HEDGE_ENABLED", False)
+    health = fanout.health["flaky"]
+    health.open_until = time.monotonic() - 1
+    provider.fail, provider.delay = False, 0.05
+
+    async def concurrent_searches():
+        return await asyncio.gather(*[fanout.search("claim", "body", max_sources=1) for _ in range(3)])
+
+    results = asyncio.run(concurrent_searches())
+    assert provider.calls == calls + 1 and sum(1 for r in results if r) == 1
+    assert health.allow() and health.open_until == 0.0
+
+
+def test_evidence_cache_serves_stale_entries_while_refreshing(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    cache = EvidenceCache(max_entries=2, ttl=10, stale=60)
+    searches = []
+
+    async def search():
+        searches.append(clock[0])
+        return [_hit(f"v{len(searches)}")]
+
+    async def scenario():
+        key = evidence_cache_key("Bridge CLOSURE confirmed!", "Officials said on Monday", 5)
+        assert key == evidence_cache_key("bridge closure confirmed", "officials said on monday...", 5)
+        assert (await cache.get_or_search(key, search))[0]["url"] == "v1"
+        assert (await cache.get_or_search(key, search))[0]["url"] == "v1"
+        clock[0] += 30  # Stale: served immediately, refreshed in the background
+        assert (await cache.get_or_search(key, search))[0]["url"] == "v1"
+        await asyncio.sleep(0)
+        assert (await cache.get_or_search(key, search))[0]["url"] == "v2"
+        for other in ("a", "b"):  # LRU eviction past max_entries
+            await cache.get_or_search(other, search)
+        assert len(searches) == 4 and cache.counters["evictions"] == 1
+
+    asyncio.run(scenario())
+    assert cache.stats()["hits"] == 2 and cache.stats()["stale_hits"] == 1 and cache.stats()["misses"] == 3
+
+
+def test_evidence_cache_disk_tier_survives_restart(tmp_path):
+    async def search():
+        return [_hit("persisted")]
+
+    async def failing_search():
+        raise AssertionError("should be served from disk")
+
+    asyncio.run(EvidenceCache(8, 60, 60, str(tmp_path)).get_or_search("claim", search))
+    restarted = EvidenceCache(8, 60, 60, str(tmp_path))
+    assert asyncio.run(restarted.get_or_search("claim", failing_search))[0]["url"] == "persisted"
+    assert restarted.counters["disk_hits"] == 1
+
+
+def test_evidence_cache_prunes_the_disk_tier(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    cache = EvidenceCache(2, 10, 10, str(tmp_path), disk_max_entries=3)
+
+    async def search():
+        return [_hit("x")]
+
+    async def scenario():
+        for i in range(5):
+            await cache.get_or_search(f"claim{i}", search)
+            os.utime(cache._disk_path(f"claim{i}"), (clock[0], clock[0]))
+            clock[0] += 1
+
+    asyncio.run(scenario())
+    assert len(os.listdir(tmp_path)) == 3  # Oldest files beyond disk_max_entries removed
+    assert not os.path.exists(cache._disk_path("claim0"))
+
+    clock[0] += 60  # Everything on disk has expired
+    asyncio.run(cache.get_or_search("fresh", search))
+    assert os.listdir(tmp_path) == [os.path.basename(cache._disk_path("fresh"))]
+    assert cache.counters["disk_evictions"] == 5
+
+
+def test_budget_shortened_searches_are_not_cached_as_fresh(monkeypatch):
+    monkeypatch.setattr(settings, "EVIDENCE_CACHE_ENABLED", True)
+    monkeypatch.setattr(evidence_agent, "evidence_cache", EvidenceCache(8, 60, 60))
+    timeouts = []
+
+    async def fake_search(query, body, max_sources, timeout=None):
+        timeouts.append(timeout)
+        return [_hit("partial" if timeout < settings.EVIDENCE_DEADLINE_SECONDS else "full")]
+
+    monkeypatch.setattr(evidence_agent, "_search_providers", fake_search)
+
+    async def scenario():
+        first = await search_web_evidence("Claim", "Body", timeout=0.5)
+        await asyncio.sleep(0)  # Background fill under the full deadline
+        second = await search_web_evidence("Claim", "Body", timeout=0.5)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first[0]["url"] == "partial" and second[0]["url"] == "full"
+    assert timeouts == [0.5, settings.EVIDENCE_DEADLINE_SECONDS]
+
+
+def test_claim_evidence_similarity_ranks_and_feeds_agreement():
+    from backend.core.evidence_agent import apply_similarity_scores, calculate_evidence_agreement, score_evidence
+    from backend.services.executor import CPUStageExecutor
+    from backend.services.text_processor import IdfTable
+
+    snippets = ["City officials confirm the bridge closure downtown", "Recipe for lemon cake", ""]
+    scores = claim_evidence_similarity("Downtown bridge closure confirmed by city officials", snippets, IdfTable.empty(2 ** 12))
+    assert scores.shape == (3,)
+    assert scores[0] > 0.3 and scores[1] == 0.0 and scores[2] == 0.0
+
+    related = [{"url": "a", "title": "Bridge closure", "snippet": snippets[0]}]
+    unrelated = [{"url": "b", "title": "Cake", "snippet": snippets[1]}]
+    # Scores come back as a value, so a process pool (which works on a pickled copy) loses nothing
+    process_pool = CPUStageExecutor("process", 1)
+    try:
+        scores = asyncio.run(process_pool.run(
+            "evidence_similarity", score_evidence, "Downtown bridge closure", "City officials confirm it", related + unrelated
+        ))
+    finally:
+        process_pool.shutdown()
+    assert "similarity" not in related[0]
+    apply_similarity_scores(related + unrelated, scores)
+    assert related[0]["similarity"] == "High" and unrelated[0]["similarity"] == "Low"
+    assert related[0]["similarity_score"] == scores[0] > 0.3
+    assert calculate_evidence_agreement(related, "REAL") > calculate_evidence_agreement(unrelated, "REAL")
+
+
+def test_factcheck_index_ranks_with_bm25_across_appended_segments(tmp_path):
+    index = FactCheckIndex.open(str(tmp_path))
+    assert index.append([
+        {"url": "u1", "title": "Moon landing hoax claims debunked", "text": "Claims that the moon landing was staged are false."},
+        {"url": "u2", "title": "Vaccine microchip rumor", "text": "Vaccines do not contain microchips."},
+    ]) == 2
+    assert index.append([
+        {"url": "u1", "title": "Duplicate", "text": "skipped"},
+        {"url": "u3", "title": "Moon phases explained", "snippet": "Why the moon changes shape."},
+    ]) == 1
+
+    reopened = FactCheckIndex.open(str(tmp_path))
+    assert len(reopened.segments) == 2 and reopened.n_docs == 3
+    hits = reopened.search("Was the moon landing a hoax?", limit=2)
+    assert [hit["url"] for hit in hits] == ["u1", "u3"]
+    assert hits[0]["bm25_score"] > hits[1]["bm25_score"] > 0
+    assert reopened.search("completely unrelated words") == []
+
+
+def test_local_tier_answers_without_network_providers():
+    class _Local(_FakeProvider):
+        local = True
+
+    local = _Local("index", [_hit("known-factcheck")])
+    remote = _FakeProvider("web", [_hit("web")])
+    sources = asyncio.run(EvidenceFanout([remote, local]).search("claim", "body", max_sources=5))
+
+    assert [s["url"] for s in sources] == ["known-factcheck"]
+    assert remote.calls == 0
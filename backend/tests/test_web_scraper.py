@@ -0,0 +1,228 @@
+"""Tests for the web scraper."""
+
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+
+from backend.config.settings import settings
+from backend.services import html_extractor, http_client, web_scraper
+from backend.services.executor import cpu_executor
+from backend.services.extraction_templates import TemplateStore
+from backend.services.scrape_cache import ScrapeCache, canonical_url
+from backend.services.web_scraper import scrape_article_content
+
+
+@pytest.fixture(autouse=True)
+def _no_scrape_cache(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EXTRACTION_TEMPLATES_ENABLED", False)
+
+
+def _article(title):
+    return f"<html><head><title>{title}</title></head><body><article class='article-content'><p>{title} body text.</p></article></body></html>"
+
+
+def test_scrapes_run_concurrently_on_shared_client(http_server, monkeypatch):
+    for i in range(20):
+        http_server.add(f"/story{i}", _article(f"Story {i}"), delay=0.3)
+    monkeypatch.setattr(http_client.host_limiter, "per_host", 100)
+
+    async def scrape_all():
+        return await asyncio.gather(*(scrape_article_content(http_server.url(f"/story{i}")) for i in range(20)))
+
+    start = time.perf_counter()
+    articles = asyncio.run(scrape_all())
+
+    assert [a.title for a in articles] == [f"Story {i}" for i in range(20)]
+    assert articles[0].body == "Story 0 body text."
+    assert time.perf_counter() - start < 1.5  # Overlapping, not 20 x 0.3 s
+
+
+def test_scraper_resolves_hostnames_through_dns_cache(http_server, monkeypatch):
+    http_server.add("/page", _article("Cached"))
+    cache = http_client.DNSCache(ttl=60)
+    monkeypatch.setattr(http_client, "dns_cache", cache)
+    url = http_server.url("/page").replace("127.0.0.1", "localhost")
+
+    async def scrape_twice():
+        first = await scrape_article_content(url)
+        await http_client.close_async_clients()  # Force a new connection
+        return first, await scrape_article_content(url)
+
+    first, second = asyncio.run(scrape_twice())
+
+    assert first.title == second.title == "Cached"
+    assert cache.misses == 1 and cache.hits >= 1
+
+    bounded = http_client.DNSCache(ttl=60, max_entries=2)
+    for port in (1, 2, 1, 3):
+        asyncio.run(bounded.resolve("localhost", port))
+    assert list(bounded._entries) == [("localhost", 1), ("localhost", 3)]  # Least recently used port 2 dropped
+
+
+def test_host_limiter_drops_only_idle_hosts():
+    limiter = http_client.HostLimiter(per_host=1, max_hosts=2)
+
+    async def scenario():
+        async with limiter.limit("http://busy.example/a"):
+            for host in ("a", "b", "c"):
+                async with limiter.limit(f"http://{host}.example/"):
+                    pass
+            return [host for _, host in limiter._semaphores]
+
+    assert asyncio.run(scenario()) == ["busy.example", "c.example"]  # The held host survives eviction
+
+
+def test_cached_dns_transport_errors_carry_the_request():
+    transport = http_client._CachedDNSTransport(False, http_client._limits(), http_client._ssl_context(),
+                                                http_client.DNSCache(ttl=60))
+    request = httpx.Request("GET", "http://127.0.0.1:9/unreachable")
+    with pytest.raises(httpx.ConnectError) as excinfo:
+        asyncio.run(transport.handle_async_request(request))
+    assert excinfo.value.request is request
+
+
+def test_scraper_reports_unreachable_urls():
+    with pytest.raises(ValueError):
+        asyncio.run(scrape_article_content("http://127.0.0.1:9/unreachable"))
+
+
+def test_lxml_extractor_skips_nested_duplicates_and_uses_header_charset():
+    from backend.services.html_extractor import extract_article
+
+    html = (
+        "<html><head><title>Café report</title><script>tracking()</script></head><body>"
+        "<div class='page-content'><div class='article-body'><p>Naïve claims.</p></div><p>Closing line.</p></div>"
+        "<div class='sidebar'>Unrelated</div></body></html>"
+    ).encode("latin-1")
+
+    article = extract_article(html, "http://example.com/a", encoding="iso-8859-1")
+
+    assert article.title == "Café report"
+    assert article.body == "Naïve claims. Closing line."  # Inner block not repeated, no script text
+    with pytest.raises(ValueError):
+        extract_article(b"<html><body><nav>menu</nav></body></html>", "http://example.com/b")
+
+
+def test_paragraph_text_counter_matches_extracted_text_across_chunk_boundaries():
+    html = (b"<html><body><pre>skip</pre><P class='x'>Breaking  <b>news</b>\n today.</p>"
+            b"<div>menu</div><p>Second paragraph.</p></body></html>")
+    counter = html_extractor.ParagraphTextCounter(text_target=37)
+    reached = [counter.feed(html[i:i + 7]) for i in range(0, len(html), 7)]
+    assert counter.text_chars == len("Breaking news today.") + len("Second paragraph.")
+    assert not reached[0] and reached[-1]
+
+
+def test_scraper_streams_with_caps_and_rejects_non_html(http_server, monkeypatch):
+    paragraphs = "".join(f"<p>Paragraph number {i} of a very long article.</p>" for i in range(80000))
+    http_server.add("/huge", f"<html><head><title>Huge</title></head><body><div class='article-content'>{paragraphs}</div></body></html>")
+    http_server.add("/binary", b"\x00" * 1000, content_type="application/octet-stream")
+    http_server.add("/declared-large", "<html></html>", headers={"Content-Length": str(10 ** 9)})
+    monkeypatch.setattr(settings, "SCRAPER_TEXT_TARGET_CHARS", 5000)
+    parses = cpu_executor.stats()["stages"].get("parse", {}).get("completed", 0)
+
+    article = asyncio.run(scrape_article_content(http_server.url("/huge")))
+    assert article.title == "Huge"
+    assert 5000 <= len(article.body) < 5000 + 2 * settings.SCRAPER_CHUNK_BYTES  # Stopped early
+    assert cpu_executor.stats()["stages"]["parse"]["completed"] == parses + 1  # Extracted off the event loop
+
+    # Undeclared length: reading stops at the byte budget
+    http_server.add("/unsized", http_server.routes["/huge"][0], headers={"Connection": "close"})
+    monkeypatch.setattr(settings, "SCRAPER_TEXT_TARGET_CHARS", 10 ** 9)
+    monkeypatch.setattr(settings, "SCRAPER_MAX_BYTES", 100000)
+    article = asyncio.run(scrape_article_content(http_server.url("/unsized")))
+    assert 0 < len(article.body) < 100000
+
+    with pytest.raises(ValueError):  # Declared length over the budget
+        asyncio.run(scrape_article_content(http_server.url("/huge")))
+
+    for path in ("/binary", "/declared-large"):
+        with pytest.raises(ValueError):
+            asyncio.run(scrape_article_content(http_server.url(path)))
+
+
+def test_scrape_cache_serves_fresh_pages_and_revalidates_stale_ones(http_server, monkeypatch, tmp_path):
+    cache = ScrapeCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(web_scraper, "scrape_cache", cache)
+    monkeypatch.setattr(settings, "SCRAPE_CACHE_ENABLED", True)
+    http_server.add("/story", _article("Cached story"), headers={"Cache-Control": "max-age=60", "ETag": '"v1"'})
+    http_server.add("/stale", _article("Stale story"), headers={"Cache-Control": "no-cache", "ETag": '"v1"'})
+
+    assert canonical_url("HTTP://Example.COM:80/a?utm_source=x&b=2&a=1#top") == "http://example.com/a?a=1&b=2"
+
+    for _ in range(2):
+        assert asyncio.run(scrape_article_content(http_server.url("/story?utm_source=feed"))).title == "Cached story"
+    assert http_server.requests.count("/story?utm_source=feed") == 1  # Second one served from disk
+
+    # no-cache: stored but revalidated; a 304 reuses the stored body
+    asyncio.run(scrape_article_content(http_server.url("/stale")))
+    http_server.add("/stale", b"", status=304, headers={"ETag": '"v1"'})
+    assert asyncio.run(scrape_article_content(http_server.url("/stale"))).title == "Stale story"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["revalidated"], stats["misses"], stats["entries"]) == (1, 1, 2, 2)
+
+    # A download cut short by the text target is not stored
+    paragraphs = "".join(f"<p>Paragraph {i} of a long article.</p>" for i in range(20000))
+    http_server.add("/long", f"<html><body><div class='article-content'>{paragraphs}</div></body></html>",
+                    headers={"Cache-Control": "max-age=60", "ETag": '"v1"'})
+    monkeypatch.setattr(settings, "SCRAPER_TEXT_TARGET_CHARS", 1000)
+    asyncio.run(scrape_article_content(http_server.url("/long")))
+    assert cache.stats()["entries"] == 2
+
+
+def test_scrape_cache_evicts_least_recently_used(tmp_path):
+    import httpx
+
+    cache = ScrapeCache(str(tmp_path / "cache.sqlite3"), max_bytes=3000)
+    pages = {f"k{i}": os.urandom(2000) for i in range(3)}  # Incompressible, ~2 KB each
+
+    async def fill():
+        for key, body in pages.items():
+            await cache.store(key, body, None, httpx.Headers({"Cache-Control": "max-age=60"}))
+        return await cache.get("k0"), await cache.get("k2")
+
+    evicted, kept = asyncio.run(fill())
+    assert evicted is None and kept.body == pages["k2"]
+    assert cache.stats()["evictions"] >= 1
+
+
+def _site_page(story, sidebar_links=10):
+    links = ''.join(f"<li><a href='/s{i}'>Another headline number {i} worth reading</a></li>" for i in range(sidebar_links))
+    return (
+        f"<html><head><title>{story}</title></head><body>"
+        f"<div class='related-content'><ul>{links}</ul><p>Sponsored</p></div>"
+        f"<div id='story-body' class='c1'><p>{story} " + "reported details. " * 20 + "</p><p>More text.</p></div>"
+        "</body></html>"
+    ).encode()
+
+
+def test_extraction_templates_learned_per_domain_and_relearned(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXTRACTION_TEMPLATES_ENABLED", True)
+    store = TemplateStore(path=str(tmp_path / "templates.json"))
+    monkeypatch.setattr(html_extractor, "template_store", store)
+    extract_article = html_extractor.extract_article
+
+    first = extract_article(_site_page("First"), "https://www.news.example/a")
+    assert first.body.startswith("First reported details.") and "headline" not in first.body
+    assert store.selector("news.example") == "//*[@id='story-body']"
+
+    second = extract_article(_site_page("Second"), "https://news.example/b")
+    assert second.body.startswith("Second reported") and store.stats()["hits"] == 1
+
+    # Layout change: the template misses, generic extraction takes over, then it is re-learned
+    redesigned = (
+        "<html><head><title>New</title></head><body><article class='story'>"
+        "<p>" + "Redesigned layout text. " * 20 + "</p></article></body></html>"
+    ).encode()
+    for _ in range(settings.EXTRACTION_TEMPLATE_MAX_FAILURES):
+        assert extract_article(redesigned, "https://news.example/c").body.startswith("Redesigned layout text.")
+    assert store.selector("news.example") is None
+    extract_article(redesigned, "https://news.example/d")
+    assert store.selector("news.example") == "//article[@class='story']"
+
+    store.save()
+    assert TemplateStore(path=store.path).selector("news.example") == "//article[@class='story']"